@@ -0,0 +1,71 @@
+"""Micro-benchmark of the emit stage: formats 100k fields with each language.
+
+Run with `python benchmarks/bench_emit.py`.
+"""
+
+import itertools
+import timeit
+
+from schema_exporter.languages import Rust, Typescript
+from schema_exporter.types import ParsedField, ParsedSchema, PythonDatatypes
+
+N_SCHEMAS = 1000
+N_FIELDS = 100
+REPEAT = 5
+
+DATATYPES = [
+    PythonDatatypes.BOOL,
+    PythonDatatypes.INT,
+    PythonDatatypes.FLOAT,
+    PythonDatatypes.STRING,
+    PythonDatatypes.DATETIME,
+    PythonDatatypes.DECIMAL,
+    PythonDatatypes.UUID,
+]
+
+
+def build_schemas():
+    shapes = itertools.cycle(
+        itertools.product(DATATYPES, [True, False], [True, False], [True, False])
+    )
+    schemas = list()
+    for i in range(N_SCHEMAS):
+        fields = list()
+        for j in range(N_FIELDS):
+            datatype, required, allow_none, many = next(shapes)
+            fields.append(
+                ParsedField(
+                    python_datatype=datatype,
+                    export_name=None,
+                    field_name=f"field_{j}",
+                    required=required,
+                    allow_none=allow_none,
+                    many=many,
+                )
+            )
+
+        schemas.append(
+            ParsedSchema(
+                name=f"Schema{i}", fields=fields, kwargs=Rust.get_default_kwargs()
+            )
+        )
+
+    return schemas
+
+
+def main():
+    schemas = build_schemas()
+    for lng_class in (Typescript, Rust):
+
+        def run():
+            lng_class(schemas=schemas, enums=[]).export(True, True)
+
+        best = min(timeit.repeat(run, number=1, repeat=REPEAT))
+        print(
+            f"{lng_class.__name__}: {N_SCHEMAS * N_FIELDS} fields in {best:.3f}s, "
+            f"{best / (N_SCHEMAS * N_FIELDS) * 1e6:.2f}us per field"
+        )
+
+
+if __name__ == "__main__":
+    main()
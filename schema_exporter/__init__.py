@@ -3,10 +3,12 @@ from __future__ import annotations
 from collections import defaultdict
 from enum import Enum
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Type, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Set, Tuple, Type, Union
 
-from .languages import Rust, Typescript
+from . import dedup
+from .languages import Arrow, JsonSchema, Msgspec, Protobuf, Rust, Typescript
 from .languages.base_language import BaseLanguage
+from .sharding import SHARD_MANIFEST, ShardBy, export_shards
 from .sorting import add_ordering_to_schemas, mark_nested_schemas
 from .types import EnumInfo, SchemaInfo
 
@@ -37,6 +39,10 @@ def _register_language(language: Type[BaseLanguage]):
 # Register languages
 _register_language(Typescript)
 _register_language(Rust)
+_register_language(Protobuf)
+_register_language(Arrow)
+_register_language(JsonSchema)
+_register_language(Msgspec)
 
 
 def _add_marshmallow_schema(
@@ -69,7 +75,7 @@ def _parse_kwargs(kwargs: dict) -> dict:
     for key, value in __kwargs_defaults.items():
         parsed_args[key] = value
 
-    for key, value in kwargs:
+    for key, value in kwargs.items():
         parsed_args[key] = value
 
     return parsed_args
@@ -160,7 +166,46 @@ def _do_parse(
     strip_schema_keyword: bool,
     expand_nested: bool,
     instantiate_schema: bool = False,
+    parse_workers: int = 1,
+    roots: Union[List[str], None] = None,
+    root_classes: Union[Set[Type], None] = None,
+    max_depth: Union[int, None] = None,
 ) -> Tuple[Dict[str, ParsedSchema], Dict[Type[Enum], EnumInfo]]:
+    if roots is not None:
+        from .pruning import parse_reachable
+
+        parser = parser_cls(
+            default_info_kwargs=__kwargs_defaults,
+            strip_schema_from_name=strip_schema_keyword,
+        )
+        parse_reachable(
+            parser,
+            schemas,
+            roots=roots,
+            root_classes=root_classes or set(),
+            max_depth=max_depth,
+            expand_nested=expand_nested,
+            instantiate_schema=instantiate_schema,
+        )
+        return parser.schemas, parser.enums
+
+    if parse_workers > 1 and len(schemas) > 1:
+        from .parsers.parallel import parallel_parse
+
+        parsed = parallel_parse(
+            parser_cls,
+            schemas,
+            default_info_kwargs=__kwargs_defaults,
+            strip_schema_keyword=strip_schema_keyword,
+            expand_nested=expand_nested,
+            instantiate_schema=instantiate_schema,
+            workers=parse_workers,
+        )
+        if parsed is not None:
+            return parsed
+
+        print("Warning: fork is not available, falling back to serial parsing")
+
     parser = parser_cls(
         default_info_kwargs=__kwargs_defaults,
         strip_schema_from_name=strip_schema_keyword,
@@ -178,26 +223,47 @@ def _do_parse(
     return parser.schemas, parser.enums
 
 
-def _get_export(
-    language: str,
+def _parse_namespace(
     namespace: str,
-    include_dump_only: bool,
-    include_load_only: bool,
     strip_schema_keyword: bool,
     expand_nested: bool,
-    ordered_output: bool,
-) -> str:
-    schemas = []
-    enums = {}
+    parse_workers: int = 1,
+    roots: Union[List[str], None] = None,
+    root_namespace: Union[str, None] = None,
+    max_depth: Union[int, None] = None,
+) -> Tuple[List[ParsedSchema], List[Tuple[Type[Enum], EnumInfo]]]:
+    schemas: List[ParsedSchema] = []
+    enums: Dict[Type[Enum], EnumInfo] = {}
     if namespace in __enums:
-        enums = __enums[namespace]
+        enums.update(__enums[namespace])
+
+    # Prune to schemas reachable from the roots. Without explicit roots all
+    # registered schemas are roots, and only max_depth limits the export.
+    root_classes: Union[Set[Type], None] = None
+    if roots is not None or root_namespace is not None or max_depth is not None:
+        if roots is None and root_namespace is None:
+            root_namespace = namespace
+
+        roots = list(roots or [])
+        root_classes = set()
+        if root_namespace is not None:
+            root_classes.update(__schemas.get(root_namespace, {}).keys())
+            root_classes.update(__serializers.get(root_namespace, {}).keys())
+            root_classes.update(__enums.get(root_namespace, {}).keys())
 
     # Parse schemas
     if namespace in __schemas and len(__schemas[namespace].keys()):
         from .parsers.marshmallow_parser import MarshmallowParser
 
         new_schemas, new_enums = _do_parse(
-            MarshmallowParser, __schemas[namespace], strip_schema_keyword, expand_nested
+            MarshmallowParser,
+            __schemas[namespace],
+            strip_schema_keyword,
+            expand_nested,
+            parse_workers=parse_workers,
+            roots=roots,
+            root_classes=root_classes,
+            max_depth=max_depth,
         )
         schemas += list(new_schemas.values())
         enums.update(new_enums)
@@ -212,12 +278,40 @@ def _get_export(
             strip_schema_keyword,
             expand_nested,
             instantiate_schema=True,
+            parse_workers=parse_workers,
+            roots=roots,
+            root_classes=root_classes,
+            max_depth=max_depth,
         )
         schemas += list(new_schemas.values())
         enums.update(new_enums)
 
+    # Registered enums are kept if they are roots or used by a kept schema
+    if roots is not None and root_classes is not None:
+        from .pruning import matches_roots
+
+        used_names = {
+            name for s in schemas for f in s.fields for name in f.get_references()
+        }
+        enums = {
+            en: enum_info
+            for en, enum_info in enums.items()
+            if en in root_classes
+            or en.__name__ in used_names
+            or matches_roots(en.__name__, roots)
+        }
+
     # Convert enums to list:
-    enums_list = list(enums.items())
+    return schemas, list(enums.items())
+
+
+def _order_export(
+    schemas: List[ParsedSchema],
+    enums_list: List[Tuple[Type[Enum], EnumInfo]],
+    ordered_output: bool,
+) -> Tuple[List[ParsedSchema], List[Tuple[Type[Enum], EnumInfo]]]:
+    schemas = list(schemas)
+    enums_list = list(enums_list)
 
     if ordered_output:
         mark_nested_schemas(schemas)
@@ -226,25 +320,92 @@ def _get_export(
         schemas.sort(key=lambda e: e.ordering)
         enums_list.sort(key=lambda e: e[0].__name__.lower())
 
+    return schemas, enums_list
+
+
+def _render_export(
+    language: str,
+    schemas: List[ParsedSchema],
+    enums_list: List[Tuple[Type[Enum], EnumInfo]],
+    include_dump_only: bool,
+    include_load_only: bool,
+    ordered_output: bool,
+    emit_workers: int = 1,
+    deduplicate: bool = False,
+    extract_bases: Union[int, None] = None,
+    language_options: Union[Dict[str, Any], None] = None,
+    extra_files: Union[Dict[str, str], None] = None,
+) -> str:
+    """Renders the export. Files written next to it, such as the values of
+    enum tables, are added to extra_files when it is given."""
+    schemas, enums_list = _order_export(schemas, enums_list, ordered_output)
+
     lng_class = __languages[language]
-    exporter = lng_class(schemas=schemas, enums=enums_list)
+    if deduplicate:
+        schemas, _ = dedup.deduplicate(
+            schemas,
+            lng_class.get_field_shape,
+            include_dump_only,
+            include_load_only,
+            min_base_fields=extract_bases,
+        )
+
+    exporter = lng_class(schemas=schemas, enums=enums_list, options=language_options)
+    if extra_files is not None:
+        extra_files.update(exporter.format_extra_files())
 
     # Export schemas
     return exporter.export(
-        include_dump_only=include_dump_only, include_load_only=include_load_only
+        include_dump_only=include_dump_only,
+        include_load_only=include_load_only,
+        workers=emit_workers,
     )
 
 
-def export_mappings(
-    export_to: Path,
+def _get_export(
     language: str,
-    namespace: str = "default",
-    include_dump_only: bool = True,
-    include_load_only: bool = True,
-    strip_schema_keyword: bool = True,
-    expand_nested: bool = True,
-    ordered_output: bool = True,
-):
+    namespace: str,
+    include_dump_only: bool,
+    include_load_only: bool,
+    strip_schema_keyword: bool,
+    expand_nested: bool,
+    ordered_output: bool,
+    parse_workers: int = 1,
+    emit_workers: int = 1,
+    roots: Union[List[str], None] = None,
+    root_namespace: Union[str, None] = None,
+    max_depth: Union[int, None] = None,
+    deduplicate: bool = False,
+    extract_bases: Union[int, None] = None,
+    language_options: Union[Dict[str, Any], None] = None,
+    extra_files: Union[Dict[str, str], None] = None,
+) -> str:
+    schemas, enums_list = _parse_namespace(
+        namespace=namespace,
+        strip_schema_keyword=strip_schema_keyword,
+        expand_nested=expand_nested,
+        parse_workers=parse_workers,
+        roots=roots,
+        root_namespace=root_namespace,
+        max_depth=max_depth,
+    )
+
+    return _render_export(
+        language=language,
+        schemas=schemas,
+        enums_list=enums_list,
+        include_dump_only=include_dump_only,
+        include_load_only=include_load_only,
+        ordered_output=ordered_output,
+        emit_workers=emit_workers,
+        deduplicate=deduplicate,
+        extract_bases=extract_bases,
+        language_options=language_options,
+        extra_files=extra_files,
+    )
+
+
+def _validate_export_args(export_to: Path, language: str, namespace: str) -> None:
     if language not in __languages:
         raise NotImplementedError(
             f'Language {language} not implemented, supported are: {", ".join([l for l in __languages.keys()])}'
@@ -258,9 +419,28 @@ def export_mappings(
             f"export_to must be a Path instance, {type(export_to)} provided"
         )
 
-    if not isinstance(export_to, Path):
-        raise ValueError(f"Export to should be string or path, was: {type(export_to)}")
 
+def export_mappings(
+    export_to: Path,
+    language: str,
+    namespace: str = "default",
+    include_dump_only: bool = True,
+    include_load_only: bool = True,
+    strip_schema_keyword: bool = True,
+    expand_nested: bool = True,
+    ordered_output: bool = True,
+    parse_workers: int = 1,
+    emit_workers: int = 1,
+    roots: Union[List[str], None] = None,
+    root_namespace: Union[str, None] = None,
+    max_depth: Union[int, None] = None,
+    deduplicate: bool = False,
+    extract_bases: Union[int, None] = None,
+    language_options: Union[Dict[str, Any], None] = None,
+):
+    _validate_export_args(export_to, language, namespace)
+
+    extra_files: Dict[str, str] = dict()
     exp = _get_export(
         language=language,
         namespace=namespace,
@@ -269,7 +449,143 @@ def export_mappings(
         strip_schema_keyword=strip_schema_keyword,
         expand_nested=expand_nested,
         ordered_output=ordered_output,
+        parse_workers=parse_workers,
+        emit_workers=emit_workers,
+        roots=roots,
+        root_namespace=root_namespace,
+        max_depth=max_depth,
+        deduplicate=deduplicate,
+        extract_bases=extract_bases,
+        language_options=language_options,
+        extra_files=extra_files,
     )
 
     with open(export_to, "w") as f:
         f.write(exp)
+
+    for file_name, content in extra_files.items():
+        with open(export_to.parent / file_name, "w") as f:
+            f.write(content)
+
+
+def get_dedup_report(
+    language: str,
+    namespace: str = "default",
+    include_dump_only: bool = True,
+    include_load_only: bool = True,
+    strip_schema_keyword: bool = True,
+    expand_nested: bool = True,
+    ordered_output: bool = True,
+    extract_bases: Union[int, None] = None,
+) -> dedup.DedupReport:
+    """Reports the schemas deduplicate would alias or extend, and the bytes
+    saved compared to the export without deduplication."""
+    if language not in __languages:
+        raise NotImplementedError(
+            f'Language {language} not implemented, supported are: {", ".join([l for l in __languages.keys()])}'
+        )
+
+    schemas, enums_list = _parse_namespace(
+        namespace=namespace,
+        strip_schema_keyword=strip_schema_keyword,
+        expand_nested=expand_nested,
+    )
+    schemas, enums_list = _order_export(schemas, enums_list, ordered_output)
+
+    lng_class = __languages[language]
+    deduplicated, report = dedup.deduplicate(
+        schemas,
+        lng_class.get_field_shape,
+        include_dump_only,
+        include_load_only,
+        min_base_fields=extract_bases,
+    )
+
+    for exported_schemas, attr in [
+        (schemas, "bytes_before"),
+        (deduplicated, "bytes_after"),
+    ]:
+        exp = lng_class(schemas=exported_schemas, enums=enums_list).export(
+            include_dump_only=include_dump_only, include_load_only=include_load_only
+        )
+        setattr(report, attr, len(exp.encode()))
+
+    return report
+
+
+def export_sharded(
+    export_dir: Path,
+    language: str,
+    namespace: str = "default",
+    shard_by: ShardBy = "module",
+    include_dump_only: bool = True,
+    include_load_only: bool = True,
+    strip_schema_keyword: bool = True,
+    expand_nested: bool = True,
+    ordered_output: bool = True,
+    parse_workers: int = 1,
+    roots: Union[List[str], None] = None,
+    root_namespace: Union[str, None] = None,
+    max_depth: Union[int, None] = None,
+    language_options: Union[Dict[str, Any], None] = None,
+) -> List[Path]:
+    """Exports a namespace into one file per shard in export_dir, with an
+    index file re-exporting all shards. Only files whose content changed
+    are written, the written paths are returned. Files written by a previous
+    export which are no longer generated are removed."""
+    _validate_export_args(export_dir, language, namespace)
+    if not __languages[language].supports_sharding():
+        raise NotImplementedError(f"Language {language} cannot be exported sharded")
+
+    schemas, enums_list = _parse_namespace(
+        namespace=namespace,
+        strip_schema_keyword=strip_schema_keyword,
+        expand_nested=expand_nested,
+        parse_workers=parse_workers,
+        roots=roots,
+        root_namespace=root_namespace,
+        max_depth=max_depth,
+    )
+    schemas, enums_list = _order_export(schemas, enums_list, ordered_output)
+
+    files = export_shards(
+        lng_class=__languages[language],
+        schemas=schemas,
+        enums_list=enums_list,
+        shard_by=shard_by,
+        include_dump_only=include_dump_only,
+        include_load_only=include_load_only,
+        language_options=language_options,
+    )
+
+    export_dir.mkdir(parents=True, exist_ok=True)
+    written = list()
+    for file_name, content in files.items():
+        export_to = export_dir / file_name
+        if export_to.exists():
+            with open(export_to) as f:
+                if f.read() == content:
+                    continue
+
+        with open(export_to, "w") as f:
+            f.write(content)
+
+        written.append(export_to)
+
+    # Shards which no longer have any types would stay importable otherwise
+    manifest = export_dir / SHARD_MANIFEST
+    if manifest.exists():
+        export_root = export_dir.resolve()
+        for file_name in manifest.read_text().splitlines():
+            if not file_name or file_name in files:
+                continue
+
+            # Only files directly in the directory are removed, whatever the
+            # manifest says
+            stale = (export_dir / file_name).resolve()
+            if stale.parent == export_root:
+                stale.unlink(missing_ok=True)
+
+    manifest.write_text("".join(f"{file_name}\n" for file_name in sorted(files)))
+
+    return written
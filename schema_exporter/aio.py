@@ -0,0 +1,267 @@
+import asyncio
+import functools
+import os
+import stat
+import tempfile
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from . import _get_export, _validate_export_args
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+_ExportKey = Hashable
+
+# The export with the files written next to it, by file name
+_ExportFiles = Tuple[str, Dict[str, str]]
+
+
+def _get_umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Read once, as the umask can only be read by setting it, which would race
+# with files created by other threads
+_UMASK = _get_umask()
+
+
+def _write_file(export_to: Path, content: str) -> None:
+    # Write to a temporary file first, so readers never see a partial export
+    fd, tmp_path = tempfile.mkstemp(dir=export_to.parent, prefix=f".{export_to.name}")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+
+        # Temporary files are only readable by their owner, the export gets
+        # the mode of the file it replaces or of a newly created file
+        if export_to.exists():
+            mode = stat.S_IMODE(export_to.stat().st_mode)
+        else:
+            mode = 0o666 & ~_UMASK
+
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, export_to)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _get_export_key(value: Any) -> _ExportKey:
+    """Hashable key of export arguments, equal for equal arguments"""
+    if isinstance(value, dict):
+        return tuple(
+            sorted([(key, _get_export_key(v)) for key, v in value.items()], key=repr)
+        )
+
+    if isinstance(value, (list, tuple)):
+        return tuple([_get_export_key(v) for v in value])
+
+    if isinstance(value, (set, frozenset)):
+        return frozenset([_get_export_key(v) for v in value])
+
+    try:
+        hash(value)
+    except TypeError:
+        return ("id", id(value))
+
+    return value
+
+
+def _get_export_files(**kwargs) -> _ExportFiles:
+    extra_files: Dict[str, str] = dict()
+    exp = _get_export(extra_files=extra_files, **kwargs)
+    return exp, extra_files
+
+
+class _LoopState:
+    def __init__(self, max_concurrency: int) -> None:
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight: Dict[_ExportKey, "asyncio.Future[_ExportFiles]"] = dict()
+
+
+class AsyncExporter:
+    """Runs exports in an executor, so that the event loop stays responsive
+    while exports are computed.
+
+    At most max_concurrency exports are computed at once, and concurrent
+    requests for the same export are coalesced into one computation. By
+    default exports run on a thread pool, a process pool may be provided
+    with the executor argument.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be at least 1, {max_concurrency} provided"
+            )
+
+        self.max_concurrency = max_concurrency
+        self._executor = executor
+        self._loop_states: (
+            "WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]"
+        ) = WeakKeyDictionary()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="schema_exporter"
+            )
+
+        return self._executor
+
+    def _get_loop_state(self, loop: asyncio.AbstractEventLoop) -> _LoopState:
+        if loop not in self._loop_states:
+            self._loop_states[loop] = _LoopState(self.max_concurrency)
+
+        return self._loop_states[loop]
+
+    async def _compute(
+        self, export_kwargs: Dict[str, Any], state: _LoopState
+    ) -> _ExportFiles:
+        loop = asyncio.get_running_loop()
+        # A partial of a module level function can be pickled, so that the
+        # export may also run on a process pool
+        export = functools.partial(_get_export_files, **export_kwargs)
+        async with state.semaphore:
+            return await loop.run_in_executor(self._get_executor(), export)
+
+    async def _get_files(self, export_kwargs: Dict[str, Any]) -> _ExportFiles:
+        state = self._get_loop_state(asyncio.get_running_loop())
+
+        key = _get_export_key(export_kwargs)
+        future = state.in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._compute(export_kwargs, state))
+            state.in_flight[key] = future
+
+            def _done(f: "asyncio.Future[_ExportFiles]") -> None:
+                if state.in_flight.get(key) is f:
+                    del state.in_flight[key]
+
+            future.add_done_callback(_done)
+
+        # Shield, so that a cancelled request does not cancel the computation
+        # other requests are waiting for
+        return await asyncio.shield(future)
+
+    async def get_export(
+        self,
+        language: str,
+        namespace: str = "default",
+        include_dump_only: bool = True,
+        include_load_only: bool = True,
+        strip_schema_keyword: bool = True,
+        expand_nested: bool = True,
+        ordered_output: bool = True,
+        **kwargs: Any,
+    ) -> str:
+        """Other keyword arguments, such as deduplicate or language_options,
+        are passed to the export as in export_mappings"""
+        exp, _ = await self._get_files(
+            dict(
+                language=language,
+                namespace=namespace,
+                include_dump_only=include_dump_only,
+                include_load_only=include_load_only,
+                strip_schema_keyword=strip_schema_keyword,
+                expand_nested=expand_nested,
+                ordered_output=ordered_output,
+                **kwargs,
+            )
+        )
+        return exp
+
+    async def export_mappings(
+        self,
+        export_to: Path,
+        language: str,
+        namespace: str = "default",
+        include_dump_only: bool = True,
+        include_load_only: bool = True,
+        strip_schema_keyword: bool = True,
+        expand_nested: bool = True,
+        ordered_output: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        _validate_export_args(export_to, language, namespace)
+
+        exp, extra_files = await self._get_files(
+            dict(
+                language=language,
+                namespace=namespace,
+                include_dump_only=include_dump_only,
+                include_load_only=include_load_only,
+                strip_schema_keyword=strip_schema_keyword,
+                expand_nested=expand_nested,
+                ordered_output=ordered_output,
+                **kwargs,
+            )
+        )
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, _write_file, export_to, exp)
+        for file_name, content in extra_files.items():
+            await loop.run_in_executor(
+                None, _write_file, export_to.parent / file_name, content
+            )
+
+
+_default_exporter = AsyncExporter()
+
+
+async def get_export_async(
+    language: str,
+    namespace: str = "default",
+    include_dump_only: bool = True,
+    include_load_only: bool = True,
+    strip_schema_keyword: bool = True,
+    expand_nested: bool = True,
+    ordered_output: bool = True,
+    **kwargs: Any,
+) -> str:
+    """Async counterpart of export_mappings, which returns the export instead
+    of writing it to a file."""
+    return await _default_exporter.get_export(
+        language=language,
+        namespace=namespace,
+        include_dump_only=include_dump_only,
+        include_load_only=include_load_only,
+        strip_schema_keyword=strip_schema_keyword,
+        expand_nested=expand_nested,
+        ordered_output=ordered_output,
+        **kwargs,
+    )
+
+
+async def export_mappings_async(
+    export_to: Path,
+    language: str,
+    namespace: str = "default",
+    include_dump_only: bool = True,
+    include_load_only: bool = True,
+    strip_schema_keyword: bool = True,
+    expand_nested: bool = True,
+    ordered_output: bool = True,
+    **kwargs: Any,
+) -> None:
+    """Async counterpart of export_mappings. Parsing and formatting run in
+    an executor and the file is written without blocking the event loop."""
+    await _default_exporter.export_mappings(
+        export_to=export_to,
+        language=language,
+        namespace=namespace,
+        include_dump_only=include_dump_only,
+        include_load_only=include_load_only,
+        strip_schema_keyword=strip_schema_keyword,
+        expand_nested=expand_nested,
+        ordered_output=ordered_output,
+        **kwargs,
+    )
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.utils.module_loading import autodiscover_modules
+
+DEFAULT_AUTODISCOVER_MODULES = ("serializers", "schemas")
+
+
+def autodiscover() -> None:
+    """Imports the serializer and schema modules of every installed app, so
+    that the classes decorated for export get registered. Works the same way
+    as `django.contrib.admin.autodiscover`.
+
+    The modules looked up may be changed with the
+    SCHEMA_EXPORTER_AUTODISCOVER_MODULES setting.
+    """
+    modules = getattr(
+        settings, "SCHEMA_EXPORTER_AUTODISCOVER_MODULES", DEFAULT_AUTODISCOVER_MODULES
+    )
+    autodiscover_modules(*modules)
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class SchemaExporterConfig(AppConfig):
+    name = "schema_exporter.contrib.django"
+    label = "schema_exporter"
+    verbose_name = "Schema exporter"
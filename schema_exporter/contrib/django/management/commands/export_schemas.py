@@ -0,0 +1,88 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from schema_exporter.contrib.django import autodiscover
+from schema_exporter.contrib.django.targets import (
+    load_targets,
+    run_targets,
+    run_targets_parallel,
+)
+
+
+class Command(BaseCommand):
+    help = "Exports registered schemas and serializers to the targets configured in SCHEMA_EXPORTER_TARGETS"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--parallel",
+            nargs="?",
+            type=int,
+            const=0,
+            default=None,
+            metavar="N",
+            help="Export targets in N parallel workers, defaults to the number of CPUs.",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Do not write files, exit with an error if any target is out of date.",
+        )
+
+    def handle(self, *args, **options):
+        autodiscover()
+        targets = load_targets()
+        if len(targets) == 0:
+            raise CommandError(
+                "No export targets configured, add them to SCHEMA_EXPORTER_TARGETS"
+            )
+
+        if options["parallel"] is not None:
+            results = run_targets_parallel(targets, workers=options["parallel"])
+        else:
+            results = run_targets(targets)
+
+        stale = list()
+        for result in results:
+            export_to = result.target.export_to
+            files = {export_to: result.output}
+            for file_name, content in result.extra_files.items():
+                files[export_to.parent / file_name] = content
+
+            outdated = list()
+            for path, content in files.items():
+                current = None
+                if path.exists():
+                    with open(path) as f:
+                        current = f.read()
+
+                if current != content:
+                    outdated.append(path)
+
+            if len(outdated) == 0:
+                status = "up to date"
+            elif options["check"]:
+                status = "out of date"
+                stale += outdated
+            else:
+                status = "written"
+                for path in outdated:
+                    with open(path, "w") as f:
+                        f.write(files[path])
+
+            cached = " (cached)" if result.cache_hit else ""
+            self.stdout.write(
+                f"{export_to} [{result.target.language}]: {status}, "
+                f"parse {result.parse_time:.3f}s{cached}, "
+                f"render {result.render_time:.3f}s"
+            )
+
+        cache_hits = len([r for r in results if r.cache_hit])
+        total_time = sum([r.parse_time + r.render_time for r in results])
+        self.stdout.write(
+            f"Exported {len(results)} targets in {total_time:.3f}s, "
+            f"parse cache hits: {cache_hits}/{len(results)}"
+        )
+
+        if len(stale):
+            raise CommandError(
+                f'Exports out of date: {", ".join([str(p) for p in stale])}'
+            )
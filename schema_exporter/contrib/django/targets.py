@@ -0,0 +1,189 @@
+import dataclasses
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Type, Union
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from schema_exporter import _parse_namespace, _render_export, _validate_export_args
+from schema_exporter.types import EnumInfo, ParsedSchema
+
+
+@dataclass
+class ExportTarget:
+    export_to: Path
+    language: str
+    namespace: str = "default"
+    include_dump_only: bool = True
+    include_load_only: bool = True
+    strip_schema_keyword: bool = True
+    expand_nested: bool = True
+    ordered_output: bool = True
+    parse_workers: int = 1
+    emit_workers: int = 1
+    roots: Union[List[str], None] = None
+    root_namespace: Union[str, None] = None
+    max_depth: Union[int, None] = None
+    deduplicate: bool = False
+    extract_bases: Union[int, None] = None
+    language_options: Union[Dict[str, Any], None] = None
+
+    @property
+    def parse_key(self) -> Tuple[Any, ...]:
+        return (
+            self.namespace,
+            self.strip_schema_keyword,
+            self.expand_nested,
+            tuple(self.roots) if self.roots is not None else None,
+            self.root_namespace,
+            self.max_depth,
+        )
+
+
+@dataclass
+class TargetResult:
+    target: ExportTarget
+    output: str
+    parse_time: float
+    render_time: float
+    cache_hit: bool
+    # Files written next to the output, by file name
+    extra_files: Dict[str, str] = dataclasses.field(default_factory=dict)
+
+
+def load_targets() -> List[ExportTarget]:
+    """Reads export targets from the SCHEMA_EXPORTER_TARGETS setting. Each
+    target is a dict taking the same arguments as `export_mappings`. Relative
+    export_to paths are resolved against BASE_DIR when it is set.
+    """
+    target_settings = getattr(settings, "SCHEMA_EXPORTER_TARGETS", [])
+    base_dir = Path(getattr(settings, "BASE_DIR", Path.cwd()))
+    allowed_keys = {f.name for f in dataclasses.fields(ExportTarget)}
+
+    targets = list()
+    for target_kwargs in target_settings:
+        unknown_keys = set(target_kwargs.keys()) - allowed_keys
+        if len(unknown_keys):
+            raise ImproperlyConfigured(
+                f'Unknown keys in SCHEMA_EXPORTER_TARGETS: {", ".join(sorted(unknown_keys))}'
+            )
+
+        if "export_to" not in target_kwargs or "language" not in target_kwargs:
+            raise ImproperlyConfigured(
+                "Each target in SCHEMA_EXPORTER_TARGETS must define export_to and language"
+            )
+
+        target = ExportTarget(**target_kwargs)
+        target.export_to = base_dir / Path(target.export_to)
+
+        try:
+            _validate_export_args(target.export_to, target.language, target.namespace)
+        except (NotImplementedError, ValueError) as e:
+            raise ImproperlyConfigured(str(e)) from e
+
+        targets.append(target)
+
+    return targets
+
+
+def run_targets(targets: List[ExportTarget]) -> List[TargetResult]:
+    """Exports targets one after another. Targets sharing the same namespace
+    and parse options reuse the parsed schemas.
+    """
+    parsed: Dict[
+        Tuple[Any, ...],
+        Tuple[List[ParsedSchema], List[Tuple[Type[Enum], EnumInfo]]],
+    ] = dict()
+    results = list()
+
+    for target in targets:
+        cache_hit = target.parse_key in parsed
+        start = time.perf_counter()
+        if not cache_hit:
+            parsed[target.parse_key] = _parse_namespace(
+                namespace=target.namespace,
+                strip_schema_keyword=target.strip_schema_keyword,
+                expand_nested=target.expand_nested,
+                parse_workers=target.parse_workers,
+                roots=target.roots,
+                root_namespace=target.root_namespace,
+                max_depth=target.max_depth,
+            )
+        parse_time = time.perf_counter() - start
+
+        schemas, enums_list = parsed[target.parse_key]
+        start = time.perf_counter()
+        extra_files: Dict[str, str] = dict()
+        output = _render_export(
+            language=target.language,
+            schemas=schemas,
+            enums_list=enums_list,
+            include_dump_only=target.include_dump_only,
+            include_load_only=target.include_load_only,
+            ordered_output=target.ordered_output,
+            emit_workers=target.emit_workers,
+            deduplicate=target.deduplicate,
+            extract_bases=target.extract_bases,
+            language_options=target.language_options,
+            extra_files=extra_files,
+        )
+        render_time = time.perf_counter() - start
+
+        results.append(
+            TargetResult(
+                target=target,
+                output=output,
+                parse_time=parse_time,
+                render_time=render_time,
+                cache_hit=cache_hit,
+                extra_files=extra_files,
+            )
+        )
+
+    return results
+
+
+def _get_executor(workers: int) -> Executor:
+    # Forked workers inherit the populated app registry and export registry,
+    # fall back to threads where fork is not available.
+    if "fork" in multiprocessing.get_all_start_methods():
+        return ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("fork")
+        )
+
+    return ThreadPoolExecutor(max_workers=workers)
+
+
+def run_targets_parallel(
+    targets: List[ExportTarget], workers: int = 0
+) -> List[TargetResult]:
+    """Exports targets in parallel. Targets sharing a parse are grouped to the
+    same worker so they still share the parsed schemas.
+    """
+    groups: Dict[Tuple[Any, ...], List[int]] = dict()
+    for i, target in enumerate(targets):
+        groups.setdefault(target.parse_key, []).append(i)
+
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(groups))
+
+    if workers <= 1:
+        return run_targets(targets)
+
+    results: List[Any] = [None] * len(targets)
+    with _get_executor(workers) as executor:
+        group_results = executor.map(
+            run_targets, [[targets[i] for i in indices] for indices in groups.values()]
+        )
+        for indices, group_result in zip(groups.values(), group_results):
+            for i, result in zip(indices, group_result):
+                results[i] = result
+
+    return results
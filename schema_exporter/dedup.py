@@ -0,0 +1,299 @@
+import dataclasses
+import heapq
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Set, Tuple, Union
+
+from .types import ParsedField, ParsedSchema
+
+FieldShape = Callable[[ParsedField], Tuple[Any, ...]]
+
+# Identifies a field by name and everything that affects how it is formatted
+_FieldKey = Tuple[str, Tuple[Any, ...]]
+
+
+@dataclass
+class DedupReport:
+    # Aliased schema names with the schema they are an alias of
+    aliases: Dict[str, str] = dataclasses.field(default_factory=dict)
+    # Base names with the schemas extending them
+    bases: Dict[str, List[str]] = dataclasses.field(default_factory=dict)
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    def format(self) -> str:
+        lines = [
+            f"{len(self.aliases)} schemas aliased, {len(self.bases)} bases extracted, "
+            f"{self.bytes_saved} bytes saved ({self.bytes_before} -> {self.bytes_after})"
+        ]
+        lines += [f"  {alias} = {name}" for alias, name in self.aliases.items()]
+        lines += [
+            f'  {", ".join(names)} extend {base}' for base, names in self.bases.items()
+        ]
+        return "\n".join(lines)
+
+
+def _kwargs_key(schema: ParsedSchema) -> str:
+    # Kwargs such as derives change the output, only schemas with equal
+    # kwargs are merged
+    return repr(sorted(schema.kwargs.items(), key=lambda e: e[0]))
+
+
+def _included_fields(
+    schema: ParsedSchema, include_dump_only: bool, include_load_only: bool
+) -> List[ParsedField]:
+    return [
+        field
+        for field in schema.fields
+        if (include_dump_only or not field.dump_only)
+        and (include_load_only or not field.load_only)
+    ]
+
+
+def _canonicalize(field: ParsedField, canonical: Dict[str, str]) -> ParsedField:
+    if field.export_name is not None and field.export_name in canonical:
+        field = dataclasses.replace(field, export_name=canonical[field.export_name])
+
+    if field.value_field is not None:
+        value_field = _canonicalize(field.value_field, canonical)
+        field = dataclasses.replace(field, value_field=value_field)
+
+    return field
+
+
+def _field_key(
+    field: ParsedField, get_field_shape: FieldShape, canonical: Dict[str, str]
+) -> _FieldKey:
+    # Nested schemas are compared by their canonical name
+    field = _canonicalize(field, canonical)
+    return field.field_name, get_field_shape(field)
+
+
+def find_aliases(
+    schemas: List[ParsedSchema],
+    get_field_shape: FieldShape,
+    include_dump_only: bool,
+    include_load_only: bool,
+) -> Dict[str, str]:
+    """Maps the names of schemas structurally identical to an earlier schema
+    to the name of that schema. Nested schemas are compared by their
+    canonical name, so repeating until nothing changes also merges schemas
+    which only differ by nesting identical schemas."""
+    fields = {
+        schema.name: _included_fields(schema, include_dump_only, include_load_only)
+        for schema in schemas
+    }
+
+    canonical: Dict[str, str] = dict()
+    changed = True
+    while changed:
+        changed = False
+        representatives: Dict[Tuple[Any, ...], str] = dict()
+        for schema in schemas:
+            if schema.opaque:
+                continue
+
+            key = (
+                _kwargs_key(schema),
+                tuple(
+                    [
+                        _field_key(field, get_field_shape, canonical)
+                        for field in fields[schema.name]
+                    ]
+                ),
+            )
+            representative = representatives.setdefault(key, schema.name)
+            if (
+                representative != schema.name
+                and canonical.get(schema.name) != representative
+            ):
+                canonical[schema.name] = representative
+                changed = True
+
+    return canonical
+
+
+def _get_base_name(name: str, taken: Set[str]) -> str:
+    base_name = f"{name}Base"
+    i = 2
+    while base_name in taken:
+        base_name = f"{name}Base{i}"
+        i += 1
+
+    return base_name
+
+
+def extract_bases(
+    schemas: List[ParsedSchema],
+    get_field_shape: FieldShape,
+    include_dump_only: bool,
+    include_load_only: bool,
+    min_fields: int,
+    report: DedupReport,
+) -> List[ParsedSchema]:
+    """Greedily moves field subsets of at least min_fields fields shared by
+    several schemas into base schemas, largest savings first. A schema
+    extends at most one base. If a schema has exactly the shared fields, it
+    is used as the base itself."""
+    candidates = [
+        schema
+        for schema in schemas
+        if not schema.opaque and schema.alias_of is None and schema.base is None
+    ]
+    field_keys: Dict[str, Dict[_FieldKey, ParsedField]] = {
+        schema.name: {
+            _field_key(field, get_field_shape, dict()): field
+            for field in _included_fields(schema, include_dump_only, include_load_only)
+        }
+        for schema in candidates
+    }
+
+    kwargs_keys = [_kwargs_key(schema) for schema in candidates]
+
+    # Schemas containing each field, to find the schemas sharing a subset
+    # without comparing every schema against it
+    containing: Dict[_FieldKey, Set[int]] = dict()
+    for i, schema in enumerate(candidates):
+        for key in field_keys[schema.name].keys():
+            containing.setdefault(key, set()).add(i)
+
+    # Subsets shared by at least two schemas with equal kwargs, with all the
+    # schemas containing them, in the order they are found
+    shared: Dict[Tuple[str, FrozenSet[_FieldKey]], List[int]] = dict()
+    for i, schema in enumerate(candidates):
+        keys = set(field_keys[schema.name].keys())
+        if len(keys) < min_fields:
+            continue
+
+        # Only later schemas sharing enough fields are paired with the schema
+        overlaps: Dict[int, int] = dict()
+        for key in keys:
+            for j in containing[key]:
+                if j > i and kwargs_keys[j] == kwargs_keys[i]:
+                    overlaps[j] = overlaps.get(j, 0) + 1
+
+        for j in sorted(overlaps):
+            if overlaps[j] < min_fields:
+                continue
+
+            common = frozenset(keys.intersection(field_keys[candidates[j].name]))
+            if (kwargs_keys[i], common) in shared:
+                continue
+
+            containing_sets = sorted([containing[key] for key in common], key=len)
+            containing_all = set.intersection(*containing_sets)
+            shared[(kwargs_keys[i], common)] = [
+                m for m in sorted(containing_all) if kwargs_keys[m] == kwargs_keys[i]
+            ]
+
+    def get_score(subset: FrozenSet[_FieldKey], members: List[int]) -> Tuple[int, int]:
+        return (len(members) - 1) * len(subset), len(subset)
+
+    # Scores only decrease as schemas get assigned to a base, so a popped
+    # subset whose score is out of date is pushed back with its new score
+    # instead of rescoring every subset after each assignment
+    heap: List[Tuple[int, int, int, FrozenSet[_FieldKey], List[int]]] = list()
+    for order, ((_, subset), members) in enumerate(shared.items()):
+        savings, size = get_score(subset, members)
+        heap.append((-savings, -size, order, subset, members))
+
+    heapq.heapify(heap)
+
+    assigned: Set[int] = set()
+    taken = {schema.name for schema in schemas}
+    replacements: Dict[str, ParsedSchema] = dict()
+    new_bases: Dict[str, ParsedSchema] = dict()
+    while len(heap):
+        savings, size, order, best, members = heapq.heappop(heap)
+        members = [i for i in members if i not in assigned]
+        if len(members) < 2:
+            continue
+
+        if get_score(best, members) != (-savings, -size):
+            savings, size = get_score(best, members)
+            heapq.heappush(heap, (-savings, -size, order, best, members))
+            continue
+
+        exact = [i for i in members if len(field_keys[candidates[i].name]) == len(best)]
+        first = candidates[members[0]]
+        if len(exact):
+            base_name = candidates[exact[0]].name
+            assigned.add(exact[0])
+            members.remove(exact[0])
+        else:
+            base_name = _get_base_name(first.name, taken)
+            taken.add(base_name)
+            new_bases[first.name] = ParsedSchema(
+                name=base_name,
+                fields=[
+                    field
+                    for key, field in field_keys[first.name].items()
+                    if key in best
+                ],
+                kwargs=first.kwargs,
+                module=first.module,
+            )
+
+        report.bases[base_name] = list()
+        for i in members:
+            schema = candidates[i]
+            assigned.add(i)
+            report.bases[base_name].append(schema.name)
+            replacements[schema.name] = dataclasses.replace(
+                schema,
+                fields=[
+                    field
+                    for key, field in field_keys[schema.name].items()
+                    if key not in best
+                ],
+                base=base_name,
+            )
+
+    output = list()
+    for schema in schemas:
+        if schema.name in new_bases:
+            output.append(new_bases[schema.name])
+
+        output.append(replacements.get(schema.name, schema))
+
+    return output
+
+
+def deduplicate(
+    schemas: List[ParsedSchema],
+    get_field_shape: FieldShape,
+    include_dump_only: bool,
+    include_load_only: bool,
+    min_base_fields: Union[int, None] = None,
+) -> Tuple[List[ParsedSchema], DedupReport]:
+    """Collapses structurally identical schemas into aliases of the first
+    one, and optionally extracts shared fields into base schemas. The
+    schemas passed in are not modified."""
+    report = DedupReport()
+    report.aliases = find_aliases(
+        schemas, get_field_shape, include_dump_only, include_load_only
+    )
+
+    output = [
+        (
+            dataclasses.replace(schema, fields=[], alias_of=report.aliases[schema.name])
+            if schema.name in report.aliases
+            else schema
+        )
+        for schema in schemas
+    ]
+
+    if min_base_fields is not None:
+        output = extract_bases(
+            output,
+            get_field_shape,
+            include_dump_only,
+            include_load_only,
+            min_base_fields,
+            report,
+        )
+
+    return output, report
@@ -1,2 +1,6 @@
+from .arrow import Arrow  # noqa
+from .json_schema import JsonSchema  # noqa
+from .msgspec import Msgspec  # noqa
+from .protobuf import Protobuf  # noqa
 from .rust import Rust  # noqa
 from .typescript import Typescript  # noqa
@@ -0,0 +1,170 @@
+from enum import Enum
+from typing import Any, Dict, List, Set, Tuple, Type
+
+from schema_exporter.types import (
+    EnumInfo,
+    Mapping,
+    ParsedField,
+    ParsedSchema,
+    PythonDatatypes,
+)
+
+from .base_language import BaseLanguage
+
+
+class Types(Enum):
+    BOOL = Mapping(mapping="pa.bool_()")
+    INT64 = Mapping(mapping="pa.int64()")
+    FLOAT64 = Mapping(mapping="pa.float64()")
+    STRING = Mapping(mapping="pa.string()")
+    TIMESTAMP = Mapping(mapping='pa.timestamp("us", tz="UTC")')
+    DATE = Mapping(mapping="pa.date32()")
+    TIME = Mapping(mapping='pa.time64("us")')
+    DURATION = Mapping(mapping='pa.duration("us")')
+
+
+type_mappings: Dict[PythonDatatypes, Mapping] = {
+    # Values of unknown or nested JSON types are loaded as JSON text
+    PythonDatatypes.ANY: Types.STRING.value,
+    PythonDatatypes.BOOL: Types.BOOL.value,
+    PythonDatatypes.CONSTANT: Types.STRING.value,
+    PythonDatatypes.DATETIME: Types.TIMESTAMP.value,
+    PythonDatatypes.DATE: Types.DATE.value,
+    PythonDatatypes.TIME: Types.TIME.value,
+    # The precision is not known, decimals are kept as text
+    PythonDatatypes.DECIMAL: Types.STRING.value,
+    PythonDatatypes.DICT: Types.STRING.value,
+    PythonDatatypes.EMAIL: Types.STRING.value,
+    PythonDatatypes.FIELD: Types.STRING.value,
+    PythonDatatypes.FLOAT: Types.FLOAT64.value,
+    PythonDatatypes.INT: Types.INT64.value,
+    PythonDatatypes.MAPPING: Types.STRING.value,
+    PythonDatatypes.STRING: Types.STRING.value,
+    PythonDatatypes.TIMEDELTA: Types.DURATION.value,
+    PythonDatatypes.URL: Types.STRING.value,
+    PythonDatatypes.UUID: Types.STRING.value,
+    PythonDatatypes.IP_ADDRESS: Types.STRING.value,
+    PythonDatatypes.IP_INTERFACE: Types.STRING.value,
+    PythonDatatypes.IPv4_ADDRESS: Types.STRING.value,
+    PythonDatatypes.IPv4_INTERFACE: Types.STRING.value,
+    PythonDatatypes.IPv6_ADDRESS: Types.STRING.value,
+    PythonDatatypes.IPv6_INTERFACE: Types.STRING.value,
+    PythonDatatypes.DURATION: Types.DURATION.value,
+    PythonDatatypes.JSON_FIELD: Types.STRING.value,
+}
+
+# Signed dictionary index types from the narrowest, with the number of
+# values they can index
+_INDEX_TYPES = [
+    ("pa.int8()", 2**7),
+    ("pa.int16()", 2**15),
+    ("pa.int32()", 2**31),
+]
+
+
+def _get_index_type(n_values: int) -> str:
+    for index_type, max_values in _INDEX_TYPES:
+        if n_values <= max_values:
+            return index_type
+
+    return "pa.int64()"
+
+
+class Arrow(BaseLanguage):
+    """Exports schemas as pyarrow struct types and enums as dictionary types,
+    in a Python module. pa.schema(Foo) is the schema of a table of Foos."""
+
+    @property
+    def type_mappings(self) -> Dict[PythonDatatypes, Mapping]:
+        if self._mappings_override is not None:
+            return self._mappings_override
+
+        return type_mappings
+
+    @property
+    def file_extension(self) -> str:
+        return "py"
+
+    @staticmethod
+    def get_default_kwargs() -> Dict[str, Any]:
+        return {"type_mapping_profile": None}
+
+    @staticmethod
+    def _format_enum_field(field_name: str, value: Enum) -> str:
+        return field_name
+
+    @staticmethod
+    def _format_enum(e: Type[Enum], enum_fields: List[str], enum_info: EnumInfo) -> str:
+        # Columns store an index into the values, which are kept once per chunk
+        values = [value.value for value in e._member_map_.values()]
+        value_type = "pa.string()"
+        if all([isinstance(v, int) and not isinstance(v, bool) for v in values]):
+            value_type = "pa.int64()"
+
+        index_type = _get_index_type(len(values))
+        return f"{e.__name__} = pa.dictionary({index_type}, {value_type})\n"
+
+    def _format_enum_table(self, e: Type[Enum], enum_info: EnumInfo) -> str:
+        # Dictionary types do not list the values, large enums are no larger
+        return self._format_enum(e, list(), enum_info)
+
+    def _format_type(self, field: ParsedField) -> str:
+        if field.value_field is None:
+            export_type = self.map_schema_field(field)
+            if isinstance(export_type, Mapping):
+                export_type = export_type.mapping
+        else:
+            # Keys are kept as the strings of the JSON objects
+            value_type = self._format_type(field.value_field)
+            export_type = f"pa.map_({Types.STRING.value.mapping}, {value_type})"
+
+        if field.many:
+            export_type = f"pa.list_({export_type})"
+
+        return export_type
+
+    def _compile_schema_field(self, field: ParsedField) -> Tuple[str, str]:
+        export_type = self._format_type(field)
+
+        nullable = ""
+        if field.required and not field.allow_none:
+            nullable = ", nullable=False"
+
+        return '        pa.field("', f'", {export_type}{nullable}),'
+
+    def _format_schema(
+        self, schema: ParsedSchema, schema_fields: List[ParsedField]
+    ) -> str:
+        formatted_fields = [self._format_schema_field(fld) for fld in schema_fields]
+        if schema.base is not None:
+            # Structs do not extend each other, the fields of the base are
+            # spread into the struct
+            formatted_fields.insert(0, f"        *{schema.base},")
+
+        if len(formatted_fields) == 0:
+            return f"{schema.name} = pa.struct([])\n"
+
+        schema_fields_formatted = "\n".join(formatted_fields)
+        return (
+            f"{schema.name} = pa.struct(\n    [\n{schema_fields_formatted}\n    ]\n)\n"
+        )
+
+    def _format_opaque_schema(self, schema: ParsedSchema) -> str:
+        return f"{schema.name} = {Types.STRING.value.mapping}  # JSON text\n"
+
+    def _format_schema_alias(self, schema: ParsedSchema) -> str:
+        return f"{schema.name} = {schema.alias_of}\n"
+
+    def format_imports(self, imports: Dict[str, Set[str]]) -> str:
+        return "import pyarrow as pa\n"
+
+    def format_shard_imports(self, shard_imports: Dict[str, Set[str]]) -> str:
+        formatted = [
+            f'from .{shard} import {", ".join(sorted(names))}'
+            for shard, names in sorted(shard_imports.items())
+        ]
+        return "\n".join(formatted) + "\n"
+
+    def format_shard_index(self, shards: Dict[str, List[str]]) -> Tuple[str, str]:
+        imports = [f"from .{shard} import *  # noqa" for shard in shards]
+        return "__init__.py", "\n".join(imports) + "\n"
@@ -1,6 +1,12 @@
+import copy
+import math
+import multiprocessing
+import sys
+import typing
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from enum import Enum
-from typing import Any, Dict, List, Tuple, Type, Union
+from typing import Any, Dict, Iterable, List, Set, Tuple, Type, Union
 
 from schema_exporter.types import (
     EnumInfo,
@@ -10,21 +16,76 @@ from schema_exporter.types import (
     PythonDatatypes,
 )
 
+# Set in the parent right before forking, so that workers inherit the
+# exporter instead of receiving the whole schema graph pickled
+_fork_exporter: Union["BaseLanguage", None] = None
+
+# Number of chunks per worker, smaller chunks balance the load better
+CHUNKS_PER_WORKER = 4
+
+# Name of the profile using the default type mappings
+DEFAULT_PROFILE = "default"
+
+
+def update_imports(
+    imports: Dict[str, Set[str]], new_imports: typing.Mapping[str, Iterable[str]]
+) -> None:
+    for lib, imp in new_imports.items():
+        if lib not in imports:
+            imports[lib] = set()
+
+        imports[lib].update(imp)
+
+
+def _is_free_threaded() -> bool:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def _format_range_in_fork(
+    start: int, end: int, include_dump_only: bool, include_load_only: bool
+) -> Tuple[List[str], Dict[str, Set[str]]]:
+    assert _fork_exporter is not None
+    return _fork_exporter._format_range(
+        start, end, include_dump_only, include_load_only
+    )
+
 
 class BaseLanguage(metaclass=ABCMeta):
     def __init__(
         self,
         schemas: List[ParsedSchema],
         enums: List[Tuple[Type[Enum], EnumInfo]],
+        options: Union[Dict[str, Any], None] = None,
     ) -> None:
         self.schemas = schemas
         self.enums = enums
+        self.options = options or dict()
+        self._field_formatters: Dict[Tuple[Any, ...], Tuple[str, str]] = dict()
+        # Type mappings of the profile this exporter was copied for, and the
+        # exporter of each profile shared by the copies, None for the defaults
+        self._mappings_override: Union[Dict[PythonDatatypes, Mapping], None] = None
+        self._profile_exporters: Dict[Any, "BaseLanguage"] = {None: self}
+
+        for option in self.options:
+            if (
+                option not in self.get_default_kwargs()
+                and option not in self.get_export_options()
+            ):
+                raise ValueError(
+                    f"Provided unknown option for {type(self).__name__}: {option}"
+                )
 
     @property
     @abstractmethod
     def type_mappings(self) -> Dict[PythonDatatypes, Mapping]:
         pass
 
+    @property
+    @abstractmethod
+    def file_extension(self) -> str:
+        pass
+
     def map_schema_field(self, field: ParsedField) -> Union[str, Mapping]:
         if field.export_name is not None:
             return field.export_name
@@ -44,6 +105,58 @@ class BaseLanguage(metaclass=ABCMeta):
     def get_default_kwargs() -> Dict[str, Any]:
         pass
 
+    @staticmethod
+    def get_export_options() -> Dict[str, Any]:
+        """Options which apply to a whole export and cannot be given to the
+        decorators, with their defaults"""
+        return dict()
+
+    @staticmethod
+    def get_mapping_profiles() -> Dict[str, Dict[PythonDatatypes, Mapping]]:
+        """Named type mapping profiles, selected with the type_mapping_profile
+        kwarg, overriding the default mappings of some datatypes"""
+        return dict()
+
+    def with_profile(self, kwargs: Dict[str, Any]) -> "BaseLanguage":
+        """Exporter using the type mappings of the profile selected by the
+        kwargs of a type. The profile is a name or a dict of mappings, the
+        "default" profile opts out of a profile selected for the export."""
+        profile = self.get_kwarg(kwargs, "type_mapping_profile")
+        if profile == DEFAULT_PROFILE:
+            profile = None
+
+        key = profile if profile is None or isinstance(profile, str) else id(profile)
+        exporter = self._profile_exporters.get(key)
+        if exporter is not None:
+            return exporter
+
+        if isinstance(profile, str):
+            profiles = self.get_mapping_profiles()
+            if profile not in profiles:
+                raise ValueError(
+                    f'Unknown type_mapping_profile for {type(self).__name__}: {profile}, supported are: {", ".join([DEFAULT_PROFILE] + list(profiles))}'
+                )
+
+            profile = profiles[profile]
+
+        # Field formatters are cached per exporter, so each profile has its
+        # own copy sharing everything else
+        default = self._profile_exporters[None]
+        exporter = copy.copy(default)
+        exporter._mappings_override = {**default.type_mappings, **profile}
+        exporter._field_formatters = dict()
+        self._profile_exporters[key] = exporter
+        return exporter
+
+    def get_kwarg(self, kwargs: Dict[str, Any], key: str) -> Any:
+        """Keyword argument given to the decorator of a type. Arguments left
+        unset, with a default of None, fall back to the export options."""
+        value = kwargs.get(key)
+        if value is None:
+            value = self.options.get(key)
+
+        return value
+
     @staticmethod
     @abstractmethod
     def _format_enum_field(field_name: str, value: Enum) -> str:
@@ -54,7 +167,20 @@ class BaseLanguage(metaclass=ABCMeta):
     def _format_enum(e: Type[Enum], enum_fields: List[str], enum_info: EnumInfo) -> str:
         pass
 
+    def use_enum_table(self, e: Type[Enum], enum_info: EnumInfo) -> bool:
+        """Whether the enum has more members than the enum_table_threshold and
+        is exported as a lookup table instead of one member per line"""
+        threshold = self.get_kwarg(enum_info.kwargs, "enum_table_threshold")
+        return threshold is not None and len(e._member_map_) > threshold
+
+    @abstractmethod
+    def _format_enum_table(self, e: Type[Enum], enum_info: EnumInfo) -> str:
+        pass
+
     def format_enum(self, e: Type[Enum], enum_info: EnumInfo) -> str:
+        if self.use_enum_table(e, enum_info):
+            return self._format_enum_table(e, enum_info)
+
         enum_fields = [
             self._format_enum_field(field_name, value)
             for field_name, value in e._member_map_.items()
@@ -68,13 +194,64 @@ class BaseLanguage(metaclass=ABCMeta):
     ) -> str:
         pass
 
+    @staticmethod
+    def get_field_shape(field: ParsedField) -> Tuple[Any, ...]:
+        """Everything apart from the field name that affects how a field is
+        formatted. Fields of the same shape share a compiled formatter."""
+        flags = (
+            field.required
+            | field.allow_none << 1
+            | field.many << 2
+            | field.dump_only << 3
+            | field.load_only << 4
+            | field.unique << 5
+        )
+        entry_shapes = tuple(
+            BaseLanguage.get_field_shape(f) if f is not None else None
+            for f in (field.key_field, field.value_field)
+        )
+        return (field.python_datatype, field.export_name, flags, entry_shapes)
+
     @abstractmethod
+    def _compile_schema_field(self, field: ParsedField) -> Tuple[str, str]:
+        """Returns the formatted field before and after the field name"""
+        pass
+
     def _format_schema_field(self, field: ParsedField) -> str:
+        shape = self.get_field_shape(field)
+        formatter = self._field_formatters.get(shape)
+        if formatter is None:
+            formatter = self._compile_schema_field(field)
+            self._field_formatters[shape] = formatter
+
+        return formatter[0] + field.field_name + formatter[1]
+
+    @abstractmethod
+    def _format_opaque_schema(self, schema: ParsedSchema) -> str:
+        pass
+
+    @abstractmethod
+    def _format_schema_alias(self, schema: ParsedSchema) -> str:
         pass
 
     def format_schema(
         self, schema: ParsedSchema, include_dump_only: bool, include_load_only: bool
     ) -> str:
+        if schema.opaque:
+            return self._format_opaque_schema(schema)
+
+        if schema.alias_of is not None:
+            return self._format_schema_alias(schema)
+
+        schema_fields = self.get_included_fields(
+            schema, include_dump_only, include_load_only
+        )
+        return self._format_schema(schema, schema_fields)
+
+    @staticmethod
+    def get_included_fields(
+        schema: ParsedSchema, include_dump_only: bool, include_load_only: bool
+    ) -> List[ParsedField]:
         schema_fields = list()
 
         for field in schema.fields:
@@ -86,20 +263,169 @@ class BaseLanguage(metaclass=ABCMeta):
 
             schema_fields.append(field)
 
-        return self._format_schema(schema, schema_fields)
+        return schema_fields
+
+    def collect_imports(
+        self,
+        enums: List[Tuple[Type[Enum], EnumInfo]],
+        schemas: List[ParsedSchema],
+        include_dump_only: bool,
+        include_load_only: bool,
+    ) -> Dict[str, Set[str]]:
+        return dict()
+
+    def format_imports(self, imports: Dict[str, Set[str]]) -> str:
+        return ""
+
+    @staticmethod
+    def supports_sharding() -> bool:
+        """Whether the export can be split into shards importing each other"""
+        return True
+
+    def get_shard_helpers(
+        self, include_dump_only: bool, include_load_only: bool
+    ) -> Dict[str, List[str]]:
+        """Names of the helper types generated next to the types of the
+        export, such as borrowed variants, by the name of the type"""
+        return dict()
+
+    def set_shard_helpers(self, helpers: Dict[str, List[str]]) -> None:
+        """Uses the helper types of the whole sharded export instead of the
+        ones of this shard, so that types of other shards are referenced
+        through their helpers as well"""
+        pass
+
+    def get_field_imports(
+        self, field: ParsedField, include_dump_only: bool, include_load_only: bool
+    ) -> List[str]:
+        """Names of the types the formatted field uses, which a shard imports
+        from the shards declaring them"""
+        return field.get_references()
 
     @abstractmethod
-    def format_header(self, include_dump_only: bool, include_load_only: bool) -> str:
+    def format_shard_imports(self, shard_imports: Dict[str, Set[str]]) -> str:
+        """Imports the given type names from the other shards"""
+        pass
+
+    @abstractmethod
+    def format_shard_index(self, shards: Dict[str, List[str]]) -> Tuple[str, str]:
+        """Returns the name and content of the file tying the shards together,
+        given the names of the types declared in each shard"""
         pass
 
-    def export(self, include_dump_only: bool, include_load_only: bool) -> str:
+    def format_extra_files(self) -> Dict[str, str]:
+        """Returns the content of files written next to the export by file
+        name, such as data the export loads lazily"""
+        return dict()
+
+    def format_header(self, include_dump_only: bool, include_load_only: bool) -> str:
+        imports = self.collect_imports(
+            self.enums, self.schemas, include_dump_only, include_load_only
+        )
+        return self.format_imports(imports)
+
+    def _format_range(
+        self, start: int, end: int, include_dump_only: bool, include_load_only: bool
+    ) -> Tuple[List[str], Dict[str, Set[str]]]:
+        """Formats enums and schemas between start and end, indexed as if
+        schemas followed the enums in one list"""
+        n_enums = len(self.enums)
+        enums = self.enums[start : min(end, n_enums)]
+        schemas = self.schemas[max(start - n_enums, 0) : max(end - n_enums, 0)]
+
+        output = [self.format_enum(e, enum_info) for e, enum_info in enums]
+        output += [
+            self.with_profile(schema.kwargs).format_schema(
+                schema=schema,
+                include_dump_only=include_dump_only,
+                include_load_only=include_load_only,
+            )
+            for schema in schemas
+        ]
+        imports = self.collect_imports(
+            enums, schemas, include_dump_only, include_load_only
+        )
+
+        return output, imports
+
+    def _join_output(self, header: str, output: List[str]) -> str:
+        """Joins the header and the formatted enums and schemas into the
+        exported file"""
+        return "\n".join(([header] if len(header) > 0 else list()) + output)
+
+    def _get_executor(self, workers: int) -> Union[Executor, None]:
+        # Threads only run in parallel on free-threaded builds, elsewhere
+        # fork processes which inherit the exporter
+        if _is_free_threaded():
+            return ThreadPoolExecutor(max_workers=workers)
+
+        if "fork" in multiprocessing.get_all_start_methods():
+            return ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("fork")
+            )
+
+        return None
+
+    def _export_parallel(
+        self, include_dump_only: bool, include_load_only: bool, workers: int
+    ) -> Union[str, None]:
+        global _fork_exporter
+
+        executor = self._get_executor(workers)
+        if executor is None:
+            return None
+
+        n_items = len(self.enums) + len(self.schemas)
+        chunk_size = max(math.ceil(n_items / (workers * CHUNKS_PER_WORKER)), 1)
+        starts = list(range(0, n_items, chunk_size))
+        ends = [start + chunk_size for start in starts]
+
+        _fork_exporter = self
+        try:
+            with executor:
+                if isinstance(executor, ThreadPoolExecutor):
+                    results = executor.map(
+                        self._format_range,
+                        starts,
+                        ends,
+                        [include_dump_only] * len(starts),
+                        [include_load_only] * len(starts),
+                    )
+                else:
+                    results = executor.map(
+                        _format_range_in_fork,
+                        starts,
+                        ends,
+                        [include_dump_only] * len(starts),
+                        [include_load_only] * len(starts),
+                    )
+
+                output: List[str] = list()
+                imports: Dict[str, Set[str]] = dict()
+                for chunk_output, chunk_imports in results:
+                    output += chunk_output
+                    update_imports(imports, chunk_imports)
+        finally:
+            _fork_exporter = None
+
+        return self._join_output(self.format_imports(imports), output)
+
+    def export(
+        self, include_dump_only: bool, include_load_only: bool, workers: int = 1
+    ) -> str:
+        if workers > 1:
+            exp = self._export_parallel(include_dump_only, include_load_only, workers)
+            if exp is not None:
+                return exp
+
+            print("Warning: fork is not available, falling back to serial export")
+
         header = self.format_header(
             include_dump_only=include_dump_only, include_load_only=include_load_only
         )
-        output = [header] if len(header) > 0 else list()
-        output += [self.format_enum(e, enum_info) for e, enum_info in self.enums]
+        output = [self.format_enum(e, enum_info) for e, enum_info in self.enums]
         output += [
-            self.format_schema(
+            self.with_profile(schema.kwargs).format_schema(
                 schema=schema,
                 include_dump_only=include_dump_only,
                 include_load_only=include_load_only,
@@ -107,4 +433,4 @@ class BaseLanguage(metaclass=ABCMeta):
             for schema in self.schemas
         ]
 
-        return "\n".join(output)
+        return self._join_output(header, output)
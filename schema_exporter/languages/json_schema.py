@@ -0,0 +1,319 @@
+import json
+from enum import Enum
+from typing import Any, Dict, List, Set, Tuple, Type, Union
+
+from schema_exporter.types import (
+    EnumInfo,
+    Mapping,
+    ParsedField,
+    ParsedSchema,
+    PythonDatatypes,
+)
+
+from .base_language import BaseLanguage
+
+DIALECT = "https://json-schema.org/draft/2020-12/schema"
+
+
+class Types(Enum):
+    # Mappings are the JSON text of the subschema of a value
+    ANY = Mapping(mapping="{}")
+    BOOL = Mapping(mapping='{"type": "boolean"}')
+    INTEGER = Mapping(mapping='{"type": "integer"}')
+    NUMBER = Mapping(mapping='{"type": "number"}')
+    # Decimals are strings in DRF and may be either in marshmallow
+    DECIMAL = Mapping(mapping='{"type": ["number", "string"]}')
+    STRING = Mapping(mapping='{"type": "string"}')
+    OBJECT = Mapping(mapping='{"type": "object"}')
+    DATE_TIME = Mapping(mapping='{"type": "string", "format": "date-time"}')
+    DATE = Mapping(mapping='{"type": "string", "format": "date"}')
+    TIME = Mapping(mapping='{"type": "string", "format": "time"}')
+    EMAIL = Mapping(mapping='{"type": "string", "format": "email"}')
+    URI = Mapping(mapping='{"type": "string", "format": "uri"}')
+    UUID = Mapping(mapping='{"type": "string", "format": "uuid"}')
+    IPV4 = Mapping(mapping='{"type": "string", "format": "ipv4"}')
+    IPV6 = Mapping(mapping='{"type": "string", "format": "ipv6"}')
+
+
+type_mappings: Dict[PythonDatatypes, Mapping] = {
+    PythonDatatypes.ANY: Types.ANY.value,
+    PythonDatatypes.BOOL: Types.BOOL.value,
+    PythonDatatypes.CONSTANT: Types.STRING.value,
+    PythonDatatypes.DATETIME: Types.DATE_TIME.value,
+    PythonDatatypes.DATE: Types.DATE.value,
+    PythonDatatypes.TIME: Types.TIME.value,
+    PythonDatatypes.DECIMAL: Types.DECIMAL.value,
+    PythonDatatypes.DICT: Types.OBJECT.value,
+    PythonDatatypes.EMAIL: Types.EMAIL.value,
+    PythonDatatypes.FIELD: Types.ANY.value,
+    PythonDatatypes.FLOAT: Types.NUMBER.value,
+    PythonDatatypes.FUNCTION: Types.ANY.value,
+    PythonDatatypes.INT: Types.INTEGER.value,
+    PythonDatatypes.MAPPING: Types.OBJECT.value,
+    PythonDatatypes.METHOD: Types.ANY.value,
+    PythonDatatypes.STRING: Types.STRING.value,
+    PythonDatatypes.TIMEDELTA: Types.NUMBER.value,
+    PythonDatatypes.URL: Types.URI.value,
+    PythonDatatypes.UUID: Types.UUID.value,
+    PythonDatatypes.IP_ADDRESS: Types.STRING.value,
+    PythonDatatypes.IP_INTERFACE: Types.STRING.value,
+    PythonDatatypes.IPv4_ADDRESS: Types.IPV4.value,
+    PythonDatatypes.IPv4_INTERFACE: Types.STRING.value,
+    PythonDatatypes.IPv6_ADDRESS: Types.IPV6.value,
+    PythonDatatypes.IPv6_INTERFACE: Types.STRING.value,
+    PythonDatatypes.DURATION: Types.STRING.value,
+    PythonDatatypes.JSON_FIELD: Types.ANY.value,
+}
+
+# Names of the variants of schemas, without dump only and load only fields
+INPUT_SUFFIX = "Input"
+OUTPUT_SUFFIX = "Output"
+
+
+def _allow_null(subschema: Dict[str, Any]) -> Dict[str, Any]:
+    """Adds null to the subschema, as a type where possible so that
+    validators need not try several subschemas"""
+    if len(subschema) == 0:
+        return subschema
+
+    types = subschema.get("type")
+    if isinstance(types, str):
+        return {**subschema, "type": [types, "null"]}
+
+    if isinstance(types, list):
+        return {**subschema, "type": types + ["null"]}
+
+    return {"anyOf": [subschema, {"type": "null"}]}
+
+
+class JsonSchema(BaseLanguage):
+    """Exports one JSON Schema document with every enum and schema in its
+    $defs. Objects do not allow other properties than their fields."""
+
+    def __init__(
+        self,
+        schemas: List[ParsedSchema],
+        enums: List[Tuple[Type[Enum], EnumInfo]],
+        options: Union[Dict[str, Any], None] = None,
+    ) -> None:
+        super().__init__(schemas, enums, options)
+        self.variants = bool(self.options.get("json_schema_variants", True))
+        self._enum_names = {e.__name__ for e, _ in enums}
+        # Bases are needed to inline their fields into the schemas extending
+        # them, closed objects cannot be combined with allOf
+        self._schemas_by_name = {schema.name: schema for schema in schemas}
+
+    @property
+    def type_mappings(self) -> Dict[PythonDatatypes, Mapping]:
+        if self._mappings_override is not None:
+            return self._mappings_override
+
+        return type_mappings
+
+    @property
+    def file_extension(self) -> str:
+        return "json"
+
+    @staticmethod
+    def get_default_kwargs() -> Dict[str, Any]:
+        return {"type_mapping_profile": None}
+
+    @staticmethod
+    def get_export_options() -> Dict[str, Any]:
+        # References between schemas point to the same variant, so variants
+        # are generated for the whole export
+        return {"json_schema_variants": True}
+
+    @staticmethod
+    def get_field_shape(field: ParsedField) -> Tuple[Any, ...]:
+        return BaseLanguage.get_field_shape(field) + tuple(
+            (
+                f.min_value,
+                f.max_value,
+                f.min_length,
+                f.max_length,
+                f.min_items,
+                f.max_items,
+            )
+            for f in field.walk()
+        )
+
+    @staticmethod
+    def _format_enum_field(field_name: str, value: Enum) -> str:
+        return json.dumps(value.value, default=str)
+
+    @staticmethod
+    def _format_enum(e: Type[Enum], enum_fields: List[str], enum_info: EnumInfo) -> str:
+        return f'    "{e.__name__}": {{"enum": [{", ".join(enum_fields)}]}}'
+
+    def _format_enum_table(self, e: Type[Enum], enum_info: EnumInfo) -> str:
+        # Validators compile enum arrays into lookups, however large
+        enum_fields = [
+            self._format_enum_field(field_name, value)
+            for field_name, value in e._member_map_.items()
+        ]
+        return self._format_enum(e, enum_fields, enum_info)
+
+    def _get_ref(self, name: str, suffix: str) -> Dict[str, Any]:
+        if name in self._enum_names:
+            return {"$ref": f"#/$defs/{name}"}
+
+        return {"$ref": f"#/$defs/{name}{suffix}"}
+
+    def _get_value_schema(self, field: ParsedField, suffix: str) -> Dict[str, Any]:
+        if field.value_field is not None:
+            # Keys are strings in JSON whatever they are parsed into
+            return {
+                "type": "object",
+                "additionalProperties": self._get_field_schema(
+                    field.value_field, suffix
+                ),
+            }
+
+        export_type = self.map_schema_field(field)
+        if not isinstance(export_type, Mapping):
+            return self._get_ref(export_type, suffix)
+
+        subschema = json.loads(export_type.mapping)
+        if field.min_value is not None:
+            subschema["minimum"] = field.min_value
+
+        if field.max_value is not None:
+            subschema["maximum"] = field.max_value
+
+        if field.min_length is not None and field.min_length > 0:
+            subschema["minLength"] = field.min_length
+
+        if field.max_length is not None:
+            subschema["maxLength"] = field.max_length
+
+        return subschema
+
+    def _get_field_schema(self, field: ParsedField, suffix: str) -> Dict[str, Any]:
+        subschema = self._get_value_schema(field, suffix)
+        if field.many:
+            subschema = {"type": "array", "items": subschema}
+            if field.min_items is not None and field.min_items > 0:
+                subschema["minItems"] = field.min_items
+
+            if field.max_items is not None:
+                subschema["maxItems"] = field.max_items
+
+            if field.unique:
+                subschema["uniqueItems"] = True
+
+        if field.allow_none:
+            subschema = _allow_null(subschema)
+
+        return subschema
+
+    def _compile_schema_field(self, field: ParsedField) -> Tuple[str, str]:
+        subschema = self._get_field_schema(field, "")
+        return '        "', f'": {json.dumps(subschema)}'
+
+    def _format_property(self, field: ParsedField, suffix: str) -> str:
+        # Compiled formatters reference schemas without a suffix
+        if suffix == "":
+            return self._format_schema_field(field)
+
+        subschema = self._get_field_schema(field, suffix)
+        return f'        "{field.field_name}": {json.dumps(subschema)}'
+
+    def _format_object(
+        self, name: str, schema_fields: List[ParsedField], suffix: str
+    ) -> str:
+        if len(schema_fields) == 0:
+            return f'    "{name}": {{"type": "object", "additionalProperties": false}}'
+
+        properties = ",\n".join(
+            [self._format_property(field, suffix) for field in schema_fields]
+        )
+        lines = [
+            f'    "{name}": {{',
+            '      "type": "object",',
+            f'      "properties": {{\n{properties}\n      }},',
+        ]
+        required = [field.field_name for field in schema_fields if field.required]
+        if len(required):
+            lines.append(f'      "required": {json.dumps(required)},')
+
+        lines += ['      "additionalProperties": false', "    }"]
+        return "\n".join(lines)
+
+    def _format_schema(
+        self, schema: ParsedSchema, schema_fields: List[ParsedField]
+    ) -> str:
+        return self._format_object(schema.name, schema_fields, "")
+
+    def _format_opaque_schema(self, schema: ParsedSchema) -> str:
+        return f'    "{schema.name}": {{"type": "object"}}'
+
+    def _format_schema_alias(self, schema: ParsedSchema) -> str:
+        assert schema.alias_of is not None
+        return f'    "{schema.name}": {json.dumps(self._get_ref(schema.alias_of, ""))}'
+
+    def _get_schema_fields(
+        self, schema: ParsedSchema, include_dump_only: bool, include_load_only: bool
+    ) -> List[ParsedField]:
+        """Fields of the schema, preceded by the fields of its base. Closed
+        objects cannot extend each other with allOf, so bases are inlined."""
+        schema_fields = self.get_included_fields(
+            schema, include_dump_only, include_load_only
+        )
+        base = self._schemas_by_name.get(schema.base or "")
+        if base is None:
+            return schema_fields
+
+        return (
+            self.get_included_fields(base, include_dump_only, include_load_only)
+            + schema_fields
+        )
+
+    def format_schema(
+        self, schema: ParsedSchema, include_dump_only: bool, include_load_only: bool
+    ) -> str:
+        # Inputs are loaded and have no dump only fields, outputs are dumped
+        # and have no load only fields
+        variants = [("", include_dump_only, include_load_only)]
+        if self.variants:
+            variants = [
+                (INPUT_SUFFIX, False, include_load_only),
+                (OUTPUT_SUFFIX, include_dump_only, False),
+            ]
+
+        formatted = list()
+        for suffix, variant_dump_only, variant_load_only in variants:
+            name = f"{schema.name}{suffix}"
+            if schema.opaque:
+                formatted.append(f'    "{name}": {{"type": "object"}}')
+            elif schema.alias_of is not None:
+                ref = json.dumps(self._get_ref(schema.alias_of, suffix))
+                formatted.append(f'    "{name}": {ref}')
+            else:
+                schema_fields = self._get_schema_fields(
+                    schema, variant_dump_only, variant_load_only
+                )
+                formatted.append(self._format_object(name, schema_fields, suffix))
+
+        return ",\n".join(formatted)
+
+    def _join_output(self, header: str, output: List[str]) -> str:
+        if len(output) == 0:
+            return f'{{\n  "$schema": "{DIALECT}",\n  "$defs": {{}}\n}}\n'
+
+        defs = ",\n".join(output)
+        return f'{{\n  "$schema": "{DIALECT}",\n  "$defs": {{\n{defs}\n  }}\n}}\n'
+
+    @staticmethod
+    def supports_sharding() -> bool:
+        return False
+
+    def format_shard_imports(self, shard_imports: Dict[str, Set[str]]) -> str:
+        raise NotImplementedError(
+            "JSON Schema exports are a single document and cannot be sharded"
+        )
+
+    def format_shard_index(self, shards: Dict[str, List[str]]) -> Tuple[str, str]:
+        raise NotImplementedError(
+            "JSON Schema exports are a single document and cannot be sharded"
+        )
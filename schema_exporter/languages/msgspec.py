@@ -0,0 +1,283 @@
+import json
+import keyword
+import re
+from enum import Enum
+from typing import Any, Dict, List, Set, Tuple, Type, Union
+
+from schema_exporter.types import (
+    EnumInfo,
+    Mapping,
+    ParsedField,
+    ParsedSchema,
+    PythonDatatypes,
+)
+
+from .base_language import BaseLanguage, update_imports
+
+_DICT_IMPORTS: Dict[str, List[str]] = {"typing": ["Any", "Dict"]}
+
+
+class Types(Enum):
+    ANY = Mapping(mapping="Any", imports={"typing": ["Any"]})
+    BOOL = Mapping(mapping="bool")
+    INT = Mapping(mapping="int")
+    FLOAT = Mapping(mapping="float")
+    STRING = Mapping(mapping="str")
+    DECIMAL = Mapping(mapping="Decimal", imports={"decimal": ["Decimal"]})
+    DATETIME = Mapping(mapping="datetime", imports={"datetime": ["datetime"]})
+    DATE = Mapping(mapping="date", imports={"datetime": ["date"]})
+    TIME = Mapping(mapping="time", imports={"datetime": ["time"]})
+    UUID = Mapping(mapping="UUID", imports={"uuid": ["UUID"]})
+    DICT = Mapping(mapping="Dict[str, Any]", imports=_DICT_IMPORTS)
+
+
+type_mappings: Dict[PythonDatatypes, Mapping] = {
+    PythonDatatypes.ANY: Types.ANY.value,
+    PythonDatatypes.BOOL: Types.BOOL.value,
+    PythonDatatypes.CONSTANT: Types.STRING.value,
+    PythonDatatypes.DATETIME: Types.DATETIME.value,
+    PythonDatatypes.DATE: Types.DATE.value,
+    PythonDatatypes.TIME: Types.TIME.value,
+    PythonDatatypes.DECIMAL: Types.DECIMAL.value,
+    PythonDatatypes.DICT: Types.DICT.value,
+    PythonDatatypes.EMAIL: Types.STRING.value,
+    PythonDatatypes.FIELD: Types.ANY.value,
+    PythonDatatypes.FLOAT: Types.FLOAT.value,
+    PythonDatatypes.FUNCTION: Types.ANY.value,
+    PythonDatatypes.INT: Types.INT.value,
+    PythonDatatypes.MAPPING: Types.DICT.value,
+    PythonDatatypes.METHOD: Types.ANY.value,
+    PythonDatatypes.STRING: Types.STRING.value,
+    # Marshmallow serializes timedeltas as numbers of seconds
+    PythonDatatypes.TIMEDELTA: Types.FLOAT.value,
+    PythonDatatypes.URL: Types.STRING.value,
+    PythonDatatypes.UUID: Types.UUID.value,
+    PythonDatatypes.IP_ADDRESS: Types.STRING.value,
+    PythonDatatypes.IP_INTERFACE: Types.STRING.value,
+    PythonDatatypes.IPv4_ADDRESS: Types.STRING.value,
+    PythonDatatypes.IPv4_INTERFACE: Types.STRING.value,
+    PythonDatatypes.IPv6_ADDRESS: Types.STRING.value,
+    PythonDatatypes.IPv6_INTERFACE: Types.STRING.value,
+    # DRF durations are not in the ISO 8601 format msgspec decodes
+    PythonDatatypes.DURATION: Types.STRING.value,
+    PythonDatatypes.JSON_FIELD: Types.ANY.value,
+}
+
+
+def _to_attribute_name(name: str) -> str:
+    name = re.sub(r"\W", "_", name)
+    if name[:1].isdigit():
+        name = "_" + name
+
+    if keyword.iskeyword(name):
+        name += "_"
+
+    return name
+
+
+_KEY_DATATYPES = [PythonDatatypes.INT, PythonDatatypes.UUID]
+
+_FUTURE_IMPORT = "from __future__ import annotations"
+
+
+def _is_optional(field: ParsedField) -> bool:
+    return field.allow_none or not field.required
+
+
+class Msgspec(BaseLanguage):
+    """Exports schemas as msgspec Structs and enums as Python enums, in a
+    Python module. Annotations are postponed, so schemas may reference each
+    other in any order."""
+
+    def __init__(
+        self,
+        schemas: List[ParsedSchema],
+        enums: List[Tuple[Type[Enum], EnumInfo]],
+        options: Union[Dict[str, Any], None] = None,
+    ) -> None:
+        super().__init__(schemas, enums, options)
+        # The future import must come first, before the imports of a shard
+        self._future_imported = False
+
+    @property
+    def type_mappings(self) -> Dict[PythonDatatypes, Mapping]:
+        if self._mappings_override is not None:
+            return self._mappings_override
+
+        return type_mappings
+
+    @property
+    def file_extension(self) -> str:
+        return "py"
+
+    @staticmethod
+    def get_default_kwargs() -> Dict[str, Any]:
+        return {
+            "msgspec_array_like": None,
+            "msgspec_frozen": None,
+            "type_mapping_profile": None,
+        }
+
+    @staticmethod
+    def _format_enum_field(field_name: str, value: Enum) -> str:
+        return f"    {field_name} = {value.value!r}"
+
+    @staticmethod
+    def _format_enum(e: Type[Enum], enum_fields: List[str], enum_info: EnumInfo) -> str:
+        enum_fields_formatted = "\n".join(enum_fields)
+        return f"class {e.__name__}(Enum):\n{enum_fields_formatted}\n"
+
+    def _format_enum_table(self, e: Type[Enum], enum_info: EnumInfo) -> str:
+        # Python enums look members up by value however large they are
+        enum_fields = [
+            self._format_enum_field(field_name, value)
+            for field_name, value in e._member_map_.items()
+        ]
+        return self._format_enum(e, enum_fields, enum_info)
+
+    def _format_type(self, field: ParsedField) -> str:
+        """Type of the field without None, dicts with typed entries are Dicts"""
+        if field.value_field is None:
+            export_type = self.map_schema_field(field)
+            if isinstance(export_type, Mapping):
+                export_type = export_type.mapping
+        else:
+            value_type = self._format_type(field.value_field)
+            if field.value_field.allow_none:
+                value_type = f"Optional[{value_type}]"
+
+            # msgspec decodes the keys of JSON objects into enums, integers
+            # and UUIDs as well as strings
+            key_type = Types.STRING.value.mapping
+            key_field = field.key_field
+            if key_field is not None and (
+                key_field.export_name is not None
+                or key_field.python_datatype in _KEY_DATATYPES
+            ):
+                key_type = self._format_type(key_field)
+
+            export_type = f"Dict[{key_type}, {value_type}]"
+
+        if field.many:
+            export_type = f"List[{export_type}]"
+
+        return export_type
+
+    def _compile_schema_field(self, field: ParsedField) -> Tuple[str, str]:
+        export_type = self._format_type(field)
+        default = ""
+        if _is_optional(field):
+            export_type = f"Optional[{export_type}]"
+
+        # Fields which may be left out default to None
+        if not field.required:
+            default = " = None"
+
+        return "    ", f": {export_type}{default}"
+
+    def _format_struct_field(self, field: ParsedField) -> str:
+        name = _to_attribute_name(field.field_name)
+        if name == field.field_name:
+            return self._format_schema_field(field)
+
+        # The attribute is renamed, the encoded name stays the field name
+        prefix, suffix = self._compile_schema_field(field)
+        suffix = suffix.split(" = ")[0]
+        default = "default=None, " if not field.required else ""
+        return f"{prefix}{name}{suffix} = msgspec.field({default}name={json.dumps(field.field_name)})"
+
+    def _format_schema(
+        self, schema: ParsedSchema, schema_fields: List[ParsedField]
+    ) -> str:
+        bases = [schema.base or "msgspec.Struct", "kw_only=True"]
+        if self.get_kwarg(schema.kwargs, "msgspec_frozen"):
+            bases.append("frozen=True")
+
+        if self.get_kwarg(schema.kwargs, "msgspec_array_like"):
+            bases.append("array_like=True")
+
+        formatted_fields = [self._format_struct_field(fld) for fld in schema_fields]
+        if len(formatted_fields) == 0:
+            formatted_fields = ["    pass"]
+
+        schema_fields_formatted = "\n".join(formatted_fields)
+        return f'class {schema.name}({", ".join(bases)}):\n{schema_fields_formatted}\n'
+
+    def _format_opaque_schema(self, schema: ParsedSchema) -> str:
+        return f"{schema.name} = {Types.DICT.value.mapping}\n"
+
+    def _format_schema_alias(self, schema: ParsedSchema) -> str:
+        return f"{schema.name} = {schema.alias_of}\n"
+
+    def collect_imports(
+        self,
+        enums: List[Tuple[Type[Enum], EnumInfo]],
+        schemas: List[ParsedSchema],
+        include_dump_only: bool,
+        include_load_only: bool,
+    ) -> Dict[str, Set[str]]:
+        imports: Dict[str, Set[str]] = dict()
+        if len(enums):
+            update_imports(imports, {"enum": ["Enum"]})
+
+        for schema in schemas:
+            if schema.alias_of is not None:
+                continue
+
+            if schema.opaque:
+                update_imports(imports, _DICT_IMPORTS)
+                continue
+
+            exporter = self.with_profile(schema.kwargs)
+            for datatype in schema.get_field_datatypes(
+                include_dump_only, include_load_only
+            ):
+                export_type = exporter.type_mappings.get(datatype)
+                if export_type is not None and isinstance(export_type.imports, dict):
+                    update_imports(imports, export_type.imports)
+
+            for field in self.get_included_fields(
+                schema, include_dump_only, include_load_only
+            ):
+                if _is_optional(field):
+                    update_imports(imports, {"typing": ["Optional"]})
+
+                for f in field.walk():
+                    if f.many:
+                        update_imports(imports, {"typing": ["List"]})
+
+                    if f.value_field is not None:
+                        update_imports(imports, {"typing": ["Dict"]})
+                        if f.value_field.allow_none:
+                            update_imports(imports, {"typing": ["Optional"]})
+
+        return imports
+
+    def format_imports(self, imports: Dict[str, Set[str]]) -> str:
+        formatted = [
+            f'from {lib} import {", ".join(sorted(names))}'
+            for lib, names in sorted(imports.items())
+        ]
+        # Annotations are evaluated when msgspec first decodes a type, so
+        # they may reference types defined later
+        lines = list()
+        if not self._future_imported:
+            lines += [_FUTURE_IMPORT, ""]
+
+        lines += formatted
+        if len(formatted):
+            lines.append("")
+
+        return "\n".join(lines + ["import msgspec"]) + "\n"
+
+    def format_shard_imports(self, shard_imports: Dict[str, Set[str]]) -> str:
+        formatted = [
+            f'from .{shard} import {", ".join(sorted(names))}'
+            for shard, names in sorted(shard_imports.items())
+        ]
+        self._future_imported = True
+        return "\n".join([_FUTURE_IMPORT, ""] + formatted) + "\n"
+
+    def format_shard_index(self, shards: Dict[str, List[str]]) -> Tuple[str, str]:
+        imports = [f"from .{shard} import *  # noqa" for shard in shards]
+        return "__init__.py", "\n".join(imports) + "\n"
@@ -0,0 +1,430 @@
+import dataclasses
+import json
+import os
+import re
+from enum import Enum
+from typing import Any, Dict, List, Set, Tuple, Type, Union
+
+from schema_exporter.types import (
+    EnumInfo,
+    Mapping,
+    ParsedField,
+    ParsedSchema,
+    PythonDatatypes,
+)
+
+from .base_language import BaseLanguage, update_imports
+
+
+class Types(Enum):
+    BOOL = Mapping(mapping="bool")
+    INT64 = Mapping(mapping="int64")
+    DOUBLE = Mapping(mapping="double")
+    STRING = Mapping(mapping="string")
+    TIMESTAMP = Mapping(
+        mapping="google.protobuf.Timestamp",
+        imports=["google/protobuf/timestamp.proto"],
+    )
+    DURATION = Mapping(
+        mapping="google.protobuf.Duration",
+        imports=["google/protobuf/duration.proto"],
+    )
+    STRUCT = Mapping(
+        mapping="google.protobuf.Struct", imports=["google/protobuf/struct.proto"]
+    )
+    VALUE = Mapping(
+        mapping="google.protobuf.Value", imports=["google/protobuf/struct.proto"]
+    )
+
+
+type_mappings: Dict[PythonDatatypes, Mapping] = {
+    PythonDatatypes.ANY: Types.VALUE.value,
+    PythonDatatypes.BOOL: Types.BOOL.value,
+    PythonDatatypes.CONSTANT: Types.STRING.value,
+    PythonDatatypes.DATETIME: Types.TIMESTAMP.value,
+    PythonDatatypes.DATE: Types.STRING.value,
+    PythonDatatypes.TIME: Types.STRING.value,
+    # Kept as text, doubles would lose precision
+    PythonDatatypes.DECIMAL: Types.STRING.value,
+    PythonDatatypes.DICT: Types.STRUCT.value,
+    PythonDatatypes.EMAIL: Types.STRING.value,
+    PythonDatatypes.FIELD: Types.VALUE.value,
+    PythonDatatypes.FLOAT: Types.DOUBLE.value,
+    PythonDatatypes.INT: Types.INT64.value,
+    PythonDatatypes.MAPPING: Types.STRUCT.value,
+    PythonDatatypes.STRING: Types.STRING.value,
+    PythonDatatypes.TIMEDELTA: Types.DURATION.value,
+    PythonDatatypes.URL: Types.STRING.value,
+    PythonDatatypes.UUID: Types.STRING.value,
+    PythonDatatypes.IP_ADDRESS: Types.STRING.value,
+    PythonDatatypes.IP_INTERFACE: Types.STRING.value,
+    PythonDatatypes.IPv4_ADDRESS: Types.STRING.value,
+    PythonDatatypes.IPv4_INTERFACE: Types.STRING.value,
+    PythonDatatypes.IPv6_ADDRESS: Types.STRING.value,
+    PythonDatatypes.IPv6_INTERFACE: Types.STRING.value,
+    PythonDatatypes.DURATION: Types.DURATION.value,
+    PythonDatatypes.JSON_FIELD: Types.VALUE.value,
+}
+
+# Field numbers reserved for the protobuf implementation
+_RESERVED_NUMBERS = range(19000, 20000)
+
+
+def _is_map(field: ParsedField) -> bool:
+    """Whether a dict with typed values is a map field. Map fields cannot be
+    repeated and their values cannot be lists, maps or null, other dicts are
+    Structs."""
+    value_field = field.value_field
+    return (
+        value_field is not None
+        and not field.many
+        and not value_field.many
+        and not value_field.allow_none
+        and value_field.value_field is None
+    )
+
+
+def _to_upper_snake(name: str) -> str:
+    name = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", name)
+    return re.sub(r"\W", "_", name).upper()
+
+
+def _to_field_name(name: str) -> str:
+    name = re.sub(r"\W", "_", name)
+    if name[:1].isdigit():
+        name = "_" + name
+
+    return name
+
+
+def _get_base_field_name(schema_fields: List[ParsedField]) -> str:
+    base_field = "base"
+    while base_field in [fld.field_name for fld in schema_fields]:
+        base_field += "_"
+
+    return base_field
+
+
+def _get_next_number(numbers: Dict[str, int]) -> int:
+    number = max(numbers.values(), default=0) + 1
+    if number in _RESERVED_NUMBERS:
+        number = _RESERVED_NUMBERS.stop
+
+    return number
+
+
+def _format_reserved(
+    numbers: Dict[str, int], names: List[str], prefix: str = ""
+) -> List[str]:
+    """Reserves the numbers and names of fields or values which were removed,
+    so that they are never reused with another meaning. prefix is prepended
+    to the reserved names, as it is to the names of enum values."""
+    removed = sorted(
+        [(number, name) for name, number in numbers.items() if name not in names]
+    )
+    if len(removed) == 0:
+        return list()
+
+    reserved_numbers = ", ".join([str(number) for number, _ in removed])
+    reserved_names = ", ".join([f'"{prefix}{name}"' for _, name in removed])
+    return [f"  reserved {reserved_numbers};", f"  reserved {reserved_names};"]
+
+
+class Protobuf(BaseLanguage):
+    def __init__(
+        self,
+        schemas: List[ParsedSchema],
+        enums: List[Tuple[Type[Enum], EnumInfo]],
+        options: Union[Dict[str, Any], None] = None,
+    ) -> None:
+        super().__init__(schemas, enums, options)
+
+        self.package: Union[str, None] = self.options.get("proto_package")
+        self.lock_file: Union[str, None] = self.options.get("proto_lock_file")
+        # Field numbers of messages and value numbers of enums by name,
+        # including the removed ones, which stay reserved
+        self._lock: Dict[str, Dict[str, Dict[str, int]]] = {
+            "messages": dict(),
+            "enums": dict(),
+        }
+        if self.lock_file is not None and os.path.exists(self.lock_file):
+            with open(self.lock_file) as f:
+                self._lock.update(json.load(f))
+        self._lock_changed = False
+
+        # Protobuf has no aliases nor untyped messages, fields referencing
+        # them use the type they stand for
+        self._references: Dict[str, str] = dict()
+        for schema in schemas:
+            if schema.opaque:
+                self._references[schema.name] = Types.STRUCT.value.mapping
+            elif schema.alias_of is not None:
+                self._references[schema.name] = schema.alias_of
+
+        # Set once the syntax has been written with the imports of other shards
+        self._preamble_written = False
+
+    @property
+    def type_mappings(self) -> Dict[PythonDatatypes, Mapping]:
+        if self._mappings_override is not None:
+            return self._mappings_override
+
+        return type_mappings
+
+    @property
+    def file_extension(self) -> str:
+        return "proto"
+
+    @staticmethod
+    def get_default_kwargs() -> Dict[str, Any]:
+        return {"type_mapping_profile": None}
+
+    @staticmethod
+    def get_export_options() -> Dict[str, Any]:
+        return {"proto_package": None, "proto_lock_file": None}
+
+    def map_schema_field(self, field: ParsedField) -> Union[str, Mapping]:
+        if field.export_name in self._references:
+            return self._references[field.export_name]
+
+        return super().map_schema_field(field)
+
+    def _get_numbers(self, kind: str, name: str, keys: List[str]) -> Dict[str, int]:
+        """Numbers of the keys of a message or an enum, assigning the next free
+        numbers to keys which have none yet"""
+        numbers = self._lock[kind].setdefault(name, dict())
+        for key in keys:
+            if key not in numbers:
+                numbers[key] = _get_next_number(numbers)
+                self._lock_changed = True
+
+        return numbers
+
+    def _get_enum_numbers(self, e: Type[Enum]) -> Dict[str, int]:
+        # Zero is the default value of proto3 enums, which stays unspecified
+        return self._get_numbers("enums", e.__name__, list(e._member_map_))
+
+    def _get_field_names(
+        self, schema: ParsedSchema, schema_fields: List[ParsedField]
+    ) -> List[str]:
+        names = [field.field_name for field in schema_fields]
+        if schema.base is not None:
+            names.insert(0, _get_base_field_name(schema_fields))
+
+        return names
+
+    @staticmethod
+    def _format_enum_field(field_name: str, value: Enum) -> str:
+        # Enum values are scoped to the package, so they are prefixed
+        return (
+            f"  {_to_upper_snake(type(value).__name__)}_{_to_upper_snake(field_name)}"
+        )
+
+    @staticmethod
+    def _format_enum(e: Type[Enum], enum_fields: List[str], enum_info: EnumInfo) -> str:
+        enum_fields_formatted = "\n".join(enum_fields)
+        return f"enum {e.__name__} {{\n{enum_fields_formatted}\n}}\n"
+
+    def format_enum(self, e: Type[Enum], enum_info: EnumInfo) -> str:
+        numbers = self._get_enum_numbers(e)
+        prefix = _to_upper_snake(e.__name__)
+        enum_fields = [f"  {prefix}_UNSPECIFIED = 0;"]
+        enum_fields += [
+            f"{self._format_enum_field(name, value)} = {numbers[name]};"
+            for name, value in e._member_map_.items()
+        ]
+        # The lock file keeps the member names, the values are prefixed
+        value_numbers = {
+            _to_upper_snake(name): number for name, number in numbers.items()
+        }
+        enum_fields += _format_reserved(
+            value_numbers,
+            [_to_upper_snake(name) for name in e._member_map_],
+            prefix=f"{prefix}_",
+        )
+        return self._format_enum(e, enum_fields, enum_info)
+
+    def _format_enum_table(self, e: Type[Enum], enum_info: EnumInfo) -> str:
+        # Enums are numbered on the wire, large ones cost no more than others
+        return self.format_enum(e, enum_info)
+
+    def _compile_schema_field(self, field: ParsedField) -> Tuple[str, str]:
+        if _is_map(field):
+            assert field.value_field is not None
+            value_type = self.map_schema_field(field.value_field)
+            if isinstance(value_type, Mapping):
+                value_type = value_type.mapping
+
+            key_type = Types.STRING.value.mapping
+            if (
+                field.key_field is not None
+                and field.key_field.python_datatype == PythonDatatypes.INT
+            ):
+                key_type = Types.INT64.value.mapping
+
+            # Maps cannot be optional, a missing map is empty
+            return f"  map<{key_type}, {value_type}> ", ""
+
+        export_type = self.map_schema_field(field)
+        if field.value_field is not None:
+            export_type = Types.STRUCT.value
+
+        if isinstance(export_type, Mapping):
+            export_type = export_type.mapping
+
+        if field.many:
+            label = "repeated "
+        elif field.allow_none or not field.required:
+            label = "optional "
+        else:
+            label = ""
+
+        return f"  {label}{export_type} ", ""
+
+    def _format_message_field(self, field: ParsedField, number: int) -> str:
+        name = _to_field_name(field.field_name)
+        if name == field.field_name:
+            return f"{self._format_schema_field(field)} = {number};"
+
+        # The JSON name keeps the name of the serialized field
+        formatted = self._format_schema_field(
+            dataclasses.replace(field, field_name=name)
+        )
+        return f'{formatted} = {number} [json_name = "{field.field_name}"];'
+
+    def _format_schema(
+        self, schema: ParsedSchema, schema_fields: List[ParsedField]
+    ) -> str:
+        names = self._get_field_names(schema, schema_fields)
+        numbers = self._get_numbers("messages", schema.name, names)
+
+        formatted_fields = [
+            self._format_message_field(field, numbers[field.field_name])
+            for field in schema_fields
+        ]
+        if schema.base is not None:
+            # Messages do not extend each other, the base is embedded
+            base_field = names[0]
+            formatted_fields.insert(
+                0, f"  {schema.base} {base_field} = {numbers[base_field]};"
+            )
+
+        formatted_fields += _format_reserved(numbers, names)
+        if len(formatted_fields) == 0:
+            return f"message {schema.name} {{}}\n"
+
+        schema_fields_formatted = "\n".join(formatted_fields)
+        return f"message {schema.name} {{\n{schema_fields_formatted}\n}}\n"
+
+    def _format_opaque_schema(self, schema: ParsedSchema) -> str:
+        return f"// {schema.name} is exported as {Types.STRUCT.value.mapping}\n"
+
+    def _format_schema_alias(self, schema: ParsedSchema) -> str:
+        return f"// {schema.name} is exported as {schema.alias_of}\n"
+
+    def collect_imports(
+        self,
+        enums: List[Tuple[Type[Enum], EnumInfo]],
+        schemas: List[ParsedSchema],
+        include_dump_only: bool,
+        include_load_only: bool,
+    ) -> Dict[str, Set[str]]:
+        # Imported files are the keys, protobuf imports whole files
+        imports: Dict[str, Set[str]] = dict()
+        for schema in schemas:
+            if schema.opaque or schema.alias_of is not None:
+                continue
+
+            exporter = self.with_profile(schema.kwargs)
+            for datatype in schema.get_field_datatypes(
+                include_dump_only, include_load_only
+            ):
+                export_type = exporter.type_mappings.get(datatype)
+                if export_type is not None and isinstance(export_type.imports, list):
+                    update_imports(imports, {imp: [] for imp in export_type.imports})
+
+            for field in self.get_included_fields(
+                schema, include_dump_only, include_load_only
+            ):
+                is_struct = field.value_field is not None and not _is_map(field)
+                if is_struct or any(
+                    [
+                        self._references.get(name) == Types.STRUCT.value.mapping
+                        for name in field.get_references()
+                    ]
+                ):
+                    assert isinstance(Types.STRUCT.value.imports, list)
+                    update_imports(
+                        imports, {imp: [] for imp in Types.STRUCT.value.imports}
+                    )
+
+        return imports
+
+    def _format_preamble(self, files: List[str]) -> str:
+        lines = list()
+        if not self._preamble_written:
+            lines.append('syntax = "proto3";')
+            if self.package is not None:
+                lines += ["", f"package {self.package};"]
+
+        if len(files):
+            if len(lines):
+                lines.append("")
+
+            lines += files
+
+        return "\n".join(lines) + "\n" if len(lines) else ""
+
+    def format_imports(self, imports: Dict[str, Set[str]]) -> str:
+        return self._format_preamble([f'import "{imp}";' for imp in sorted(imports)])
+
+    def format_shard_imports(self, shard_imports: Dict[str, Set[str]]) -> str:
+        # The syntax must come first, before the imports of the other shards
+        formatted = self._format_preamble(
+            [f'import "{shard}.proto";' for shard in sorted(shard_imports)]
+        )
+        self._preamble_written = True
+        return formatted
+
+    def format_shard_index(self, shards: Dict[str, List[str]]) -> Tuple[str, str]:
+        return "index.proto", self._format_preamble(
+            [f'import public "{shard}.proto";' for shard in shards]
+        )
+
+    def _assign_numbers(self, include_dump_only: bool, include_load_only: bool) -> None:
+        for e, _ in self.enums:
+            self._get_enum_numbers(e)
+
+        for schema in self.schemas:
+            if schema.opaque or schema.alias_of is not None:
+                continue
+
+            schema_fields = self.get_included_fields(
+                schema, include_dump_only, include_load_only
+            )
+            self._get_numbers(
+                "messages",
+                schema.name,
+                self._get_field_names(schema, schema_fields),
+            )
+
+    def save_lock(self) -> None:
+        """Writes the field numbers to the lock file, if they changed"""
+        if self.lock_file is None or not self._lock_changed:
+            return
+
+        with open(self.lock_file, "w") as f:
+            json.dump(self._lock, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+        self._lock_changed = False
+
+    def export(
+        self, include_dump_only: bool, include_load_only: bool, workers: int = 1
+    ) -> str:
+        # Numbers are assigned up front, forked workers would not pass new
+        # numbers back to be saved
+        self._assign_numbers(include_dump_only, include_load_only)
+        exp = super().export(include_dump_only, include_load_only, workers)
+        self.save_lock()
+        return exp
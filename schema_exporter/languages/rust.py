@@ -1,5 +1,8 @@
+import dataclasses
+import json
 from enum import Enum
-from typing import Any, Dict, List, Set, Type
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple, Type, Union
 
 from schema_exporter.types import (
     EnumInfo,
@@ -9,7 +12,7 @@ from schema_exporter.types import (
     PythonDatatypes,
 )
 
-from .base_language import BaseLanguage
+from .base_language import BaseLanguage, update_imports
 
 DEFAULT_ENUM_DERIVES = [
     Mapping(mapping="Debug"),
@@ -40,6 +43,26 @@ class Types(Enum):
         mapping="DateTime<Utc>", imports={"chrono": ["DateTime", "Utc"]}
     )
     UUID = Mapping(mapping="Uuid", imports={"uuid": ["Uuid"]})
+    # Kept as the raw JSON text, which is validated but neither parsed into
+    # values nor allocated per value
+    RAW_VALUE = Mapping(
+        mapping="Box<RawValue>", imports={"serde_json::value": ["RawValue"]}
+    )
+    VALUE = Mapping(mapping="Value", imports={"serde_json": ["Value"]})
+    # Serialized through the adapters below in the compact profile
+    DATE_TIME_EPOCH_MILLIS = Mapping(
+        mapping="DateTime<Utc>",
+        imports={"chrono": ["DateTime", "Utc"]},
+        serde_with="epoch_millis",
+    )
+    UUID_U128 = Mapping(
+        mapping="Uuid", imports={"uuid": ["Uuid"]}, serde_with="uuid_u128"
+    )
+    DECIMAL_MICROS = Mapping(
+        mapping="Decimal",
+        imports={"rust_decimal": ["Decimal"]},
+        serde_with="decimal_micros",
+    )
 
 
 type_mappings: Dict[PythonDatatypes, Mapping] = {
@@ -47,13 +70,13 @@ type_mappings: Dict[PythonDatatypes, Mapping] = {
     PythonDatatypes.CONSTANT: Types.STRING.value,
     PythonDatatypes.DATETIME: Types.DATE_TIME_AWARE.value,
     PythonDatatypes.DECIMAL: Types.DECIMAL.value,
-    # PythonDatatypes.DICT: None,
+    PythonDatatypes.DICT: Types.RAW_VALUE.value,
     PythonDatatypes.EMAIL: Types.STRING.value,
     # PythonDatatypes.FIELD: None,
     PythonDatatypes.FLOAT: Types.FLOAT.value,
     # PythonDatatypes.FUNCTION: None,
     PythonDatatypes.INT: Types.INTEGER.value,
-    # PythonDatatypes.MAPPING: None,
+    PythonDatatypes.MAPPING: Types.RAW_VALUE.value,
     # PythonDatatypes.METHOD: None,
     PythonDatatypes.STRING: Types.STRING.value,
     # PythonDatatypes.TIMEDELTA: None,
@@ -65,134 +88,1319 @@ type_mappings: Dict[PythonDatatypes, Mapping] = {
     PythonDatatypes.IPv4_INTERFACE: Types.STRING.value,
     PythonDatatypes.IPv6_ADDRESS: Types.STRING.value,
     PythonDatatypes.IPv6_INTERFACE: Types.STRING.value,
-    # PythonDatatypes.JSON_FIELD: None,
+    PythonDatatypes.JSON_FIELD: Types.RAW_VALUE.value,
+}
+
+mapping_profiles: Dict[str, Dict[PythonDatatypes, Mapping]] = {
+    # Datetimes as i64 epoch milliseconds, UUIDs as u128 and decimals as i64
+    # millionths
+    "compact": {
+        PythonDatatypes.DATETIME: Types.DATE_TIME_EPOCH_MILLIS.value,
+        PythonDatatypes.UUID: Types.UUID_U128.value,
+        PythonDatatypes.DECIMAL: Types.DECIMAL_MICROS.value,
+    },
+}
+
+# Adapters generated into the export when a mapping serializes through them,
+# with the type, its wire type and the fallible conversions between them.
+# Paths are absolute, as the adapters do not see the imports of the export.
+_SERDE_ADAPTERS: Dict[str, Tuple[str, str, str, str]] = {
+    "epoch_millis": (
+        "chrono::DateTime<chrono::Utc>",
+        "i64",
+        "|value: &chrono::DateTime<chrono::Utc>| Ok::<i64, &'static str>(value.timestamp_millis())",
+        '|wire: i64| chrono::TimeZone::timestamp_millis_opt(&chrono::Utc, wire).single().ok_or("timestamp out of range")',
+    ),
+    "uuid_u128": (
+        "uuid::Uuid",
+        "u128",
+        "|value: &uuid::Uuid| Ok::<u128, &'static str>(value.as_u128())",
+        "|wire: u128| Ok::<uuid::Uuid, &'static str>(uuid::Uuid::from_u128(wire))",
+    ),
+    "decimal_micros": (
+        "rust_decimal::Decimal",
+        "i64",
+        "|value: &rust_decimal::Decimal| value.checked_mul(rust_decimal::Decimal::from(1_000_000))"
+        '.and_then(|micros| rust_decimal::prelude::ToPrimitive::to_i64(&micros.round())).ok_or("decimal out of range")',
+        "|wire: i64| Ok::<rust_decimal::Decimal, &'static str>(rust_decimal::Decimal::new(wire, 6))",
+    ),
+}
+
+# Adapters are tracked with the imports, under a name which is not a path
+_ADAPTERS_KEY = "<serde adapters>"
+
+# Generates an adapter module for serde's with attribute, with submodules for
+# the type wrapped in an Option, a Vec or both
+_SERDE_ADAPTER_MACRO = """macro_rules! serde_adapter {
+    ($name:ident, $type:ty, $wire:ty, $to_wire:expr, $from_wire:expr $(,)?) => {
+        pub mod $name {
+            pub fn serialize<S: serde::Serializer>(value: &$type, serializer: S) -> Result<S::Ok, S::Error> {
+                let wire: $wire = ($to_wire)(value).map_err(serde::ser::Error::custom)?;
+                serde::Serialize::serialize(&wire, serializer)
+            }
+
+            pub fn deserialize<'de, D: serde::Deserializer<'de>>(deserializer: D) -> Result<$type, D::Error> {
+                let wire = <$wire as serde::Deserialize>::deserialize(deserializer)?;
+                ($from_wire)(wire).map_err(serde::de::Error::custom)
+            }
+
+            pub mod option {
+                pub fn serialize<S: serde::Serializer>(value: &Option<$type>, serializer: S) -> Result<S::Ok, S::Error> {
+                    let wire: Option<$wire> = value.as_ref().map($to_wire).transpose().map_err(serde::ser::Error::custom)?;
+                    serde::Serialize::serialize(&wire, serializer)
+                }
+
+                pub fn deserialize<'de, D: serde::Deserializer<'de>>(deserializer: D) -> Result<Option<$type>, D::Error> {
+                    let wire = <Option<$wire> as serde::Deserialize>::deserialize(deserializer)?;
+                    wire.map($from_wire).transpose().map_err(serde::de::Error::custom)
+                }
+            }
+
+            pub mod vec {
+                pub fn serialize<S: serde::Serializer>(value: &Vec<$type>, serializer: S) -> Result<S::Ok, S::Error> {
+                    let wire: Vec<$wire> = value.iter().map($to_wire).collect::<Result<_, _>>().map_err(serde::ser::Error::custom)?;
+                    serde::Serialize::serialize(&wire, serializer)
+                }
+
+                pub fn deserialize<'de, D: serde::Deserializer<'de>>(deserializer: D) -> Result<Vec<$type>, D::Error> {
+                    let wire = <Vec<$wire> as serde::Deserialize>::deserialize(deserializer)?;
+                    wire.into_iter().map($from_wire).collect::<Result<_, _>>().map_err(serde::de::Error::custom)
+                }
+            }
+
+            pub mod option_vec {
+                pub fn serialize<S: serde::Serializer>(value: &Option<Vec<$type>>, serializer: S) -> Result<S::Ok, S::Error> {
+                    let wire: Option<Vec<$wire>> = value
+                        .as_ref()
+                        .map(|items| items.iter().map($to_wire).collect::<Result<_, _>>())
+                        .transpose()
+                        .map_err(serde::ser::Error::custom)?;
+                    serde::Serialize::serialize(&wire, serializer)
+                }
+
+                pub fn deserialize<'de, D: serde::Deserializer<'de>>(deserializer: D) -> Result<Option<Vec<$type>>, D::Error> {
+                    let wire = <Option<Vec<$wire>> as serde::Deserialize>::deserialize(deserializer)?;
+                    wire.map(|items| items.into_iter().map($from_wire).collect::<Result<_, _>>())
+                        .transpose()
+                        .map_err(serde::de::Error::custom)
+                }
+            }
+        }
+    };
 }
+"""
+
+
+def _format_serde_adapters(names: Set[str]) -> str:
+    adapters = [
+        f"serde_adapter!(\n    {name},\n"
+        + "".join([f"    {e},\n" for e in _SERDE_ADAPTERS[name]])
+        + ");\n"
+        for name in sorted(names)
+    ]
+    return "\n".join([_SERDE_ADAPTER_MACRO] + adapters)
+
+
+# Tracked with the imports like the adapters, set when the borrow_cow
+# module is needed
+_BORROW_COW_KEY = "<borrow cow>"
+
+# serde only borrows a Cow which is the whole field, a Cow in an Option or a
+# Vec is always owned. Deserializing the elements as a newtype borrowing the
+# Cow makes them borrowed as well.
+_BORROW_COW_MODULE = """pub mod borrow_cow {
+    use std::borrow::Cow;
+
+    #[derive(serde::Deserialize)]
+    struct Borrowed<'a>(#[serde(borrow)] Cow<'a, str>);
+
+    pub fn option<'de: 'a, 'a, D: serde::Deserializer<'de>>(deserializer: D) -> Result<Option<Cow<'a, str>>, D::Error> {
+        let value = <Option<Borrowed<'a>> as serde::Deserialize>::deserialize(deserializer)?;
+        Ok(value.map(|e| e.0))
+    }
+
+    pub fn vec<'de: 'a, 'a, D: serde::Deserializer<'de>>(deserializer: D) -> Result<Vec<Cow<'a, str>>, D::Error> {
+        let value = <Vec<Borrowed<'a>> as serde::Deserialize>::deserialize(deserializer)?;
+        Ok(value.into_iter().map(|e| e.0).collect())
+    }
+
+    pub fn option_vec<'de: 'a, 'a, D: serde::Deserializer<'de>>(deserializer: D) -> Result<Option<Vec<Cow<'a, str>>>, D::Error> {
+        let value = <Option<Vec<Borrowed<'a>>> as serde::Deserialize>::deserialize(deserializer)?;
+        Ok(value.map(|items| items.into_iter().map(|e| e.0).collect()))
+    }
+}
+"""
+
+
+def _get_borrow_cow_helper(field: ParsedField) -> Union[str, None]:
+    """Function of the borrow_cow module deserializing a Cow field wrapped in
+    an Option, a Vec or both, None for a bare Cow"""
+    is_option = field.allow_none or not field.required
+    if is_option and field.many:
+        return "option_vec"
+
+    if is_option:
+        return "option"
+
+    if field.many:
+        return "vec"
+
+    return None
+
+
+def _format_derives(derives: List[Mapping]) -> Tuple[str, Dict[str, Set[str]]]:
+    derives_formatted = ""
+    if len(derives) > 0:
+        derive_str = sorted([m.mapping for m in derives], key=lambda e: e.lower())
+        derives_formatted = f'#[derive({", ".join(derive_str)})]\n'
+
+    imports: Dict[str, Set[str]] = dict()
+    for derive in derives:
+        if isinstance(derive.imports, dict):
+            update_imports(imports, derive.imports)
+
+    return derives_formatted, imports
+
+
+# Integer types from the narrowest, with their inclusive ranges
+_INT_TYPES = [
+    ("u8", 0, 2**8 - 1),
+    ("i8", -(2**7), 2**7 - 1),
+    ("u16", 0, 2**16 - 1),
+    ("i16", -(2**15), 2**15 - 1),
+    ("u32", 0, 2**32 - 1),
+    ("i32", -(2**31), 2**31 - 1),
+    ("u64", 0, 2**64 - 1),
+    ("i64", -(2**63), 2**63 - 1),
+]
+
+
+def _get_compact_int(
+    min_value: Union[int, None], max_value: Union[int, None]
+) -> Union[str, None]:
+    """Narrowest integer type holding the bounds. Fields without a lower
+    bound may be any i64, fields with only a lower bound of at least 0 any
+    u64."""
+    if min_value is None:
+        return None
+
+    if max_value is None:
+        return "u64" if min_value >= 0 else None
+
+    for int_type, low, high in _INT_TYPES:
+        if low <= min_value and max_value <= high:
+            return int_type
+
+    return None
+
+
+class Borrowed(str, Enum):
+    COW = "cow"  # Cow<'a, str>, borrowed unless the string has escapes
+    STR = "str"  # &'a str, fails on strings with escapes
+
+
+class InlineStrings(str, Enum):
+    ARRAYVEC = "arrayvec"  # ArrayString<N>, with a capacity of N bytes
+    HEAPLESS = "heapless"  # heapless::String<N>, with a capacity of N bytes
+    COMPACT_STR = "compact_str"  # CompactString, inline up to 24 bytes
+
+
+class MapType(str, Enum):
+    HASHMAP = "hashmap"  # HashMap, hashed with the DoS resistant SipHash
+    BTREEMAP = "btreemap"  # BTreeMap, iterated and serialized in key order
+    FXHASHMAP = "fxhashmap"  # FxHashMap, hashed faster but not DoS resistant
+
+
+# Types of dicts with typed values, with the path checking if they are empty
+_MAP_TYPES: Dict[MapType, Tuple[Mapping, str]] = {
+    MapType.HASHMAP: (
+        Mapping(mapping="HashMap", imports={"std::collections": ["HashMap"]}),
+        "std::collections::HashMap::is_empty",
+    ),
+    MapType.BTREEMAP: (
+        Mapping(mapping="BTreeMap", imports={"std::collections": ["BTreeMap"]}),
+        "std::collections::BTreeMap::is_empty",
+    ),
+    MapType.FXHASHMAP: (
+        Mapping(mapping="FxHashMap", imports={"rustc_hash": ["FxHashMap"]}),
+        "std::collections::HashMap::is_empty",
+    ),
+}
+
+# Largest max_length of strings and max_items of lists stored inline
+DEFAULT_INLINE_MAX = 32
+
+# Crate features needed by imports, noted in the header
+_IMPORT_FEATURES = {
+    ("serde_json::value", "RawValue"): "the raw_value feature of serde_json",
+    ("arrayvec", "ArrayString"): "the serde feature of arrayvec",
+    ("heapless", "String as HeaplessString"): "the serde feature of heapless",
+    ("compact_str", "CompactString"): "the serde feature of compact_str",
+    ("smallvec", "SmallVec"): "the serde feature of smallvec",
+}
+
+
+def _get_inline_string(inline_strings: InlineStrings, max_length: int) -> Mapping:
+    # Lengths are in characters, which take up to 4 bytes in UTF-8
+    capacity = 4 * max_length
+    if inline_strings == InlineStrings.ARRAYVEC:
+        return Mapping(
+            mapping=f"ArrayString<{capacity}>", imports={"arrayvec": ["ArrayString"]}
+        )
+
+    if inline_strings == InlineStrings.HEAPLESS:
+        return Mapping(
+            mapping=f"HeaplessString<{capacity}>",
+            imports={"heapless": ["String as HeaplessString"]},
+        )
+
+    return Mapping(mapping="CompactString", imports={"compact_str": ["CompactString"]})
+
+
+def _get_enum_option(
+    options: Dict[str, Any], key: str, enum_cls: Type[Enum]
+) -> Union[Any, None]:
+    value = options.get(key)
+    if value is None:
+        return None
+
+    values = [e.value for e in enum_cls._member_map_.values()]
+    if value not in values:
+        raise ValueError(f'Unknown {key}: {value}, supported are: {", ".join(values)}')
+
+    return enum_cls(value)
+
+
+def _format_field_prefix(attributes: List[str]) -> str:
+    if len(attributes) == 0:
+        return "    pub "
+
+    return f'    #[serde({", ".join(attributes)})]\n    pub '
+
+
+def _get_base_field_name(schema_fields: List[ParsedField]) -> str:
+    base_field = "base"
+    while base_field in [fld.field_name for fld in schema_fields]:
+        base_field += "_"
+
+    return base_field
+
+
+def _wrap_field_type(
+    field: ParsedField, export_type: str, inline_items: Union[int, None] = None
+) -> str:
+    if field.many and inline_items is not None:
+        export_type = f"SmallVec<[{export_type}; {inline_items}]>"
+    elif field.many:
+        export_type = f"Vec<{export_type}>"
+
+    if field.allow_none or not field.required:
+        export_type = f"Option<{export_type}>"
+
+    return export_type
+
+
+# Converts an element of a field, given whether the element is a reference
+_Convert = Callable[[str, bool], str]
+
+
+def _borrow_cow(e: str, is_ref: bool) -> str:
+    return f"Cow::Borrowed({e}.as_str())"
+
+
+def _own_cow(e: str, is_ref: bool) -> str:
+    return f"{e}.into_owned()"
+
+
+def _borrow_str(e: str, is_ref: bool) -> str:
+    return f"{e}.as_str()"
+
+
+def _own_str(e: str, is_ref: bool) -> str:
+    return f"{e}.to_owned()"
+
+
+def _borrow_nested(nested: str, e: str, is_ref: bool) -> str:
+    return f"{nested}Ref::from({e if is_ref else '&' + e})"
+
+
+def _own_nested(nested: str, e: str, is_ref: bool) -> str:
+    return f"{nested}::from({e})"
+
+
+# Element type and conversions of borrowed string fields
+_BORROWED_STRINGS: Dict[Borrowed, Tuple[str, _Convert, _Convert]] = {
+    Borrowed.COW: ("Cow<'a, str>", _borrow_cow, _own_cow),
+    Borrowed.STR: ("&'a str", _borrow_str, _own_str),
+}
+
+
+def _convert_field(
+    field: ParsedField, value: str, convert: _Convert, owned: bool
+) -> str:
+    """Converts a field between the owned and the borrowed struct element by
+    element, through the Option and Vec wrapping the elements. convert is
+    given an element and whether it is a reference, which elements are when
+    borrowing from the owned struct."""
+    iterate = "into_iter" if owned else "iter"
+
+    def convert_items(items: str, is_ref: bool) -> str:
+        if not field.many:
+            return convert(items, is_ref)
+
+        return f"{items}.{iterate}().map(|e| {convert('e', not owned)}).collect()"
+
+    if field.allow_none or not field.required:
+        option = value if owned else f"{value}.as_ref()"
+        return f"{option}.map(|v| {convert_items('v', not owned)})"
+
+    return convert_items(value, False)
+
+
+def _has_string_values(e: Type[Enum]) -> bool:
+    return all([isinstance(m.value, str) for m in e._member_map_.values()])
+
+
+def _has_int_values(e: Type[Enum]) -> bool:
+    return all(
+        [
+            isinstance(m.value, int) and not isinstance(m.value, bool)
+            for m in e._member_map_.values()
+        ]
+    )
+
+
+def _get_enum_repr(e: Type[Enum]) -> Union[str, None]:
+    """Integer type of the discriminants of an enum with integer values, or
+    of the indices of an enum with string values"""
+    if _has_int_values(e):
+        values = [m.value for m in e._member_map_.values()]
+        return _get_compact_int(min(values), max(values))
+
+    if _has_string_values(e):
+        return _get_compact_int(0, len(e) - 1)
+
+    return None
+
+
+# serde_repr derives, (de)serializing enums as their integer discriminants
+_REPR_DERIVES = {
+    "Serialize": Mapping(
+        mapping="Serialize_repr", imports={"serde_repr": ["Serialize_repr"]}
+    ),
+    "Deserialize": Mapping(
+        mapping="Deserialize_repr", imports={"serde_repr": ["Deserialize_repr"]}
+    ),
+}
+
+
+def _to_repr_derives(derives: List[Mapping]) -> List[Mapping]:
+    return [_REPR_DERIVES.get(derive.mapping, derive) for derive in derives]
+
+
+def _format_use_names(names: Iterable[str]) -> str:
+    names_sorted = sorted(names, key=lambda e: e.lower())
+    if len(names_sorted) > 1:
+        return "{" + ", ".join(names_sorted) + "}"
+
+    return names_sorted[0]
 
 
 class Rust(BaseLanguage):
+    def __init__(
+        self,
+        schemas: List[ParsedSchema],
+        enums: List[Tuple[Type[Enum], EnumInfo]],
+        options: Union[Dict[str, Any], None] = None,
+    ) -> None:
+        super().__init__(schemas, enums, options)
+        self._borrowing_schemas: Dict[Tuple[bool, bool], Set[str]] = dict()
+
+        self.borrowed: Union[Borrowed, None] = _get_enum_option(
+            self.options, "rust_borrowed", Borrowed
+        )
+        self.compact_ints = bool(self.options.get("rust_compact_ints"))
+        self.inline_strings: Union[InlineStrings, None] = _get_enum_option(
+            self.options, "rust_inline_strings", InlineStrings
+        )
+        self.inline_vecs = bool(self.options.get("rust_inline_vecs"))
+        inline_max = self.options.get("rust_inline_max")
+        self.inline_max = DEFAULT_INLINE_MAX if inline_max is None else inline_max
+        self.bitflags = bool(self.options.get("rust_bitflags"))
+        self.lean_serde = bool(self.options.get("rust_lean_serde"))
+        map_type = _get_enum_option(self.options, "rust_map_type", MapType)
+        self.map_type, self.map_is_empty = _MAP_TYPES[map_type or MapType.HASHMAP]
+        self._flag_enums: Union[Set[str], None] = None
+        # Set for shards, from the schemas of the whole export
+        self._shard_borrowing: Union[Set[str], None] = None
+
+        # Derive lists are shared by every type using the same kwargs, so the
+        # formatted attribute and the imports are memoized per list for the
+        # export. The list is kept so that its id cannot be reused.
+        self._derive_cache: Dict[
+            int, Tuple[List[Mapping], str, Dict[str, Set[str]]]
+        ] = dict()
+        # Kept per derive list, so that the derives formatted from the result
+        # are memoized as well
+        self._repr_derive_cache: Dict[int, Tuple[List[Mapping], List[Mapping]]] = dict()
+
     @property
     def type_mappings(self) -> Dict[PythonDatatypes, Mapping]:
+        if self._mappings_override is not None:
+            return self._mappings_override
+
         return type_mappings
 
+    @property
+    def file_extension(self) -> str:
+        return "rs"
+
     @staticmethod
     def get_default_kwargs() -> Dict[str, Any]:
         return {
             "rust_enum_derives": DEFAULT_ENUM_DERIVES,
             "rust_schema_derives": DEFAULT_SCHEMA_DERIVES,
+            "enum_table_threshold": None,
+            "rust_enum_repr": None,
+            # Names of JSON fields exported as a parsed Value instead of RawValue
+            "rust_json_value_fields": None,
+            "type_mapping_profile": None,
         }
 
     @staticmethod
-    def _format_enum_field(field_name: str, value: Enum) -> str:
-        return f"    {field_name},"
+    def get_mapping_profiles() -> Dict[str, Dict[PythonDatatypes, Mapping]]:
+        return mapping_profiles
 
     @staticmethod
-    def _format_enum(e: Type[Enum], enum_fields: List[str], enum_info: EnumInfo) -> str:
-        enum_fields_formatted = "\n".join(enum_fields)
-        derives = ""
+    def get_export_options() -> Dict[str, Any]:
+        # Lifetimes propagate through nested schemas, so borrowed structs are
+        # generated for the whole export
+        return {
+            "rust_borrowed": None,
+            "rust_compact_ints": None,
+            "rust_inline_strings": None,
+            "rust_inline_vecs": None,
+            "rust_inline_max": None,
+            "rust_bitflags": None,
+            "rust_lean_serde": None,
+            "rust_map_type": None,
+        }
+
+    @staticmethod
+    def get_field_shape(field: ParsedField) -> Tuple[Any, ...]:
+        return BaseLanguage.get_field_shape(field) + tuple(
+            (f.min_value, f.max_value, f.max_length, f.max_items) for f in field.walk()
+        )
+
+    def map_schema_field(self, field: ParsedField) -> Union[str, Mapping]:
+        if self.compact_ints and field.python_datatype == PythonDatatypes.INT:
+            compact_int = _get_compact_int(field.min_value, field.max_value)
+            if compact_int is not None:
+                return compact_int
+
+        inline_string = self._get_inline_string(field)
+        if inline_string is not None:
+            return inline_string
+
+        return super().map_schema_field(field)
+
+    def _get_inline_string(self, field: ParsedField) -> Union[Mapping, None]:
         if (
-            "rust_enum_derives" in enum_info.kwargs
-            and len(enum_info.kwargs["rust_enum_derives"]) > 0
+            self.inline_strings is None
+            or field.export_name is not None
+            or field.python_datatype is None
+            or self.type_mappings.get(field.python_datatype) is not Types.STRING.value
+            or field.max_length is None
+            or field.max_length > self.inline_max
         ):
-            derive_str = sorted(
-                [m.mapping for m in enum_info.kwargs["rust_enum_derives"]],
-                key=lambda e: e.lower(),
+            return None
+
+        return _get_inline_string(self.inline_strings, field.max_length)
+
+    def _get_inline_items(self, field: ParsedField) -> Union[int, None]:
+        """Capacity of lists stored inline in a SmallVec, which moves to the
+        heap only when it overflows"""
+        if (
+            not self.inline_vecs
+            or not field.many
+            or field.max_items is None
+            or field.max_items < 1
+            or field.max_items > self.inline_max
+        ):
+            return None
+
+        return field.max_items
+
+    def use_enum_table(self, e: Type[Enum], enum_info: EnumInfo) -> bool:
+        if not super().use_enum_table(e, enum_info):
+            return False
+
+        if not _has_string_values(e):
+            print(
+                f"Warning: {e.__name__} has values which are not strings, exporting it as an enum instead of a table"
             )
-            derives = f'#[derive({", ".join([m for m in derive_str])})]\n'
+            return False
+
+        return True
+
+    def _format_enum_table(self, e: Type[Enum], enum_info: EnumInfo) -> str:
+        # Values are sorted, so that lookups are binary searches in a static
+        # slice which needs no initialization
+        values = sorted([m.value for m in e._member_map_.values()])
+        index_type = "u16" if len(values) <= 2**16 else "u32"
+        values_formatted = "\n".join([f"        {json.dumps(v)}," for v in values])
+        name = e.__name__
+
+        return f"""#[derive(Clone, Copy, Debug, PartialEq, Eq, PartialOrd, Ord, Hash)]
+pub struct {name}({index_type});
+
+impl {name} {{
+    pub const VALUES: &'static [&'static str] = &[
+{values_formatted}
+    ];
+
+    pub fn from_value(value: &str) -> Option<Self> {{
+        Self::VALUES.binary_search(&value).ok().map(|i| Self(i as {index_type}))
+    }}
+
+    pub fn value(self) -> &'static str {{
+        Self::VALUES[self.0 as usize]
+    }}
+}}
+
+impl serde::Serialize for {name} {{
+    fn serialize<S: serde::Serializer>(&self, serializer: S) -> Result<S::Ok, S::Error> {{
+        serializer.serialize_str(self.value())
+    }}
+}}
+
+impl<'de> serde::Deserialize<'de> for {name} {{
+    fn deserialize<D: serde::Deserializer<'de>>(deserializer: D) -> Result<Self, D::Error> {{
+        let value = <std::borrow::Cow<'de, str> as serde::Deserialize>::deserialize(deserializer)?;
+        Self::from_value(&value)
+            .ok_or_else(|| serde::de::Error::unknown_variant(&value, Self::VALUES))
+    }}
+}}
+"""
+
+    def _get_derives(self, derives: List[Mapping]) -> Tuple[str, Dict[str, Set[str]]]:
+        cached = self._derive_cache.get(id(derives))
+        if cached is not None and cached[0] is derives:
+            return cached[1], cached[2]
+
+        derives_formatted, imports = _format_derives(derives)
+        self._derive_cache[id(derives)] = (derives, derives_formatted, imports)
+        return derives_formatted, imports
+
+    def _get_repr_derives(self, derives: List[Mapping]) -> List[Mapping]:
+        cached = self._repr_derive_cache.get(id(derives))
+        if cached is not None and cached[0] is derives:
+            return cached[1]
+
+        repr_derives = _to_repr_derives(derives)
+        self._repr_derive_cache[id(derives)] = (derives, repr_derives)
+        return repr_derives
+
+    @staticmethod
+    def _format_enum_field(field_name: str, value: Enum) -> str:
+        return f"    {field_name},"
+
+    # Formatted with the derives cached on the exporter
+    def _format_enum(  # type: ignore[override]
+        self, e: Type[Enum], enum_fields: List[str], enum_info: EnumInfo
+    ) -> str:
+        enum_fields_formatted = "\n".join(enum_fields)
+        derives = ""
+        if "rust_enum_derives" in enum_info.kwargs:
+            derives, _ = self._get_derives(enum_info.kwargs["rust_enum_derives"])
 
         return f"{derives}pub enum {e.__name__} {{\n{enum_fields_formatted}\n}}\n"
 
-    def format_header(self, include_dump_only: bool, include_load_only: bool) -> str:
+    def collect_imports(
+        self,
+        enums: List[Tuple[Type[Enum], EnumInfo]],
+        schemas: List[ParsedSchema],
+        include_dump_only: bool,
+        include_load_only: bool,
+    ) -> Dict[str, Set[str]]:
         imports: Dict[str, Set[str]] = dict()
-        for _, enum_info in self.enums:
+        seen_derives: Set[int] = set()
+        # Mappings used by the schemas, by id as profiles map differently
+        mappings: Dict[int, Mapping] = dict()
+
+        def add_derives(derives: List[Mapping]) -> None:
+            if id(derives) in seen_derives:
+                return
+
+            seen_derives.add(id(derives))
+            update_imports(imports, self._get_derives(derives)[1])
+
+        for en, enum_info in enums:
+            # Tables implement serde themselves and need no derive imports
+            is_table = BaseLanguage.use_enum_table(self, en, enum_info)
+            if is_table and _has_string_values(en):
+                continue
+
             if "rust_enum_derives" in enum_info.kwargs:
-                for rust_derive in enum_info.kwargs["rust_enum_derives"]:
-                    if isinstance(rust_derive.imports, dict):
-                        for lib, imp in rust_derive.imports.items():
-                            if lib not in imports:
-                                imports[lib] = set()
+                add_derives(enum_info.kwargs["rust_enum_derives"])
 
-                            imports[lib].update(imp)
+                if self._use_enum_repr(en, enum_info) and _has_int_values(en):
+                    repr_derives = self._get_repr_derives(
+                        enum_info.kwargs["rust_enum_derives"]
+                    )
+                    for derive in repr_derives:
+                        if derive in _REPR_DERIVES.values():
+                            assert isinstance(derive.imports, dict)
+                            update_imports(imports, derive.imports)
+
+        for schema in schemas:
+            if schema.opaque or schema.alias_of is not None:
+                continue
 
-        for schema in self.schemas:
             if "rust_schema_derives" in schema.kwargs:
-                for rust_derive in schema.kwargs["rust_schema_derives"]:
-                    if isinstance(rust_derive.imports, dict):
-                        for lib, imp in rust_derive.imports.items():
-                            if lib not in imports:
-                                imports[lib] = set()
+                add_derives(schema.kwargs["rust_schema_derives"])
 
-                            imports[lib].update(imp)
+            # The mapping profile of the schema decides the imports
+            exporter = self.with_profile(schema.kwargs)
+            assert isinstance(exporter, Rust)
+            schema_datatypes = schema.get_field_datatypes(
+                include_dump_only, include_load_only
+            )
+            if exporter.get_kwarg(schema.kwargs, "rust_json_value_fields"):
+                # JSON fields may be exported as Values, their imports depend
+                # on the field and not only on the datatype
+                for field in exporter.get_included_fields(
+                    schema, include_dump_only, include_load_only
+                ):
+                    if exporter._is_json(field):
+                        json_type = exporter._map_json_field(schema, field)
+                        assert isinstance(json_type.imports, dict)
+                        update_imports(imports, json_type.imports)
 
-            for field in schema.fields:
-                if not include_dump_only and field.dump_only:
-                    continue
+                schema_datatypes = {
+                    datatype
+                    for datatype in schema_datatypes
+                    if exporter.type_mappings.get(datatype) is not Types.RAW_VALUE.value
+                }
 
-                if not include_load_only and field.load_only:
-                    continue
+            for datatype in schema_datatypes:
+                if datatype in exporter.type_mappings:
+                    export_type = exporter.type_mappings[datatype]
+                    mappings[id(export_type)] = export_type
 
-                if field.python_datatype not in self.type_mappings:
-                    continue
+            if exporter.inline_strings is not None or exporter.inline_vecs:
+                for field in exporter.get_included_fields(
+                    schema, include_dump_only, include_load_only
+                ):
+                    for f in field.walk():
+                        inline_string = exporter._get_inline_string(f)
+                        if inline_string is not None:
+                            assert isinstance(inline_string.imports, dict)
+                            update_imports(imports, inline_string.imports)
 
-                export_type = self.type_mappings[field.python_datatype]
-                if not isinstance(export_type.imports, dict):
-                    continue
+                    if exporter._get_inline_items(field) is not None:
+                        update_imports(imports, {"smallvec": ["SmallVec"]})
+
+            if any(
+                [
+                    f.value_field is not None
+                    for field in exporter.get_included_fields(
+                        schema, include_dump_only, include_load_only
+                    )
+                    for f in field.walk()
+                ]
+            ):
+                assert isinstance(exporter.map_type.imports, dict)
+                update_imports(imports, exporter.map_type.imports)
+
+            if exporter.borrowed == Borrowed.COW:
+                borrowed_strings = [
+                    field
+                    for field in exporter.get_included_fields(
+                        schema, include_dump_only, include_load_only
+                    )
+                    if exporter._is_borrowed_string(field)
+                ]
+                if len(borrowed_strings):
+                    update_imports(imports, {"std::borrow": ["Cow"]})
+
+                if any([_get_borrow_cow_helper(f) for f in borrowed_strings]):
+                    update_imports(imports, {_BORROW_COW_KEY: []})
 
-                for lib, imp in export_type.imports.items():
-                    if lib not in imports:
-                        imports[lib] = set()
+        for export_type in mappings.values():
+            if isinstance(export_type.imports, dict):
+                update_imports(imports, export_type.imports)
 
-                    imports[lib].update(imp)
+            if export_type.serde_with in _SERDE_ADAPTERS:
+                update_imports(imports, {_ADAPTERS_KEY: [export_type.serde_with]})
+
+        return imports
+
+    def format_imports(self, imports: Dict[str, Set[str]]) -> str:
+        adapters = imports.get(_ADAPTERS_KEY)
+        borrow_cow = _BORROW_COW_KEY in imports
+        imports = {
+            lib: imp
+            for lib, imp in imports.items()
+            if lib not in (_ADAPTERS_KEY, _BORROW_COW_KEY)
+        }
+        features = [
+            f"// Requires {feature}"
+            for (lib, name), feature in _IMPORT_FEATURES.items()
+            if name in imports.get(lib, set())
+        ]
 
         imports_sorted = sorted(list(imports.items()), key=lambda e: e[0].lower())
-        formatted = list()
-        for lib, imp in imports_sorted:
-            imp = sorted(imp, key=lambda e: e.lower())
-            formatted_imp = ""
-            if len(imp) > 1:
-                formatted_imp = "{"
+        formatted = [
+            f"use {lib}::{_format_use_names(imp)};" for lib, imp in imports_sorted
+        ]
+
+        header = "\n".join(features + formatted) + "\n"
+        if adapters:
+            header += "\n" + _format_serde_adapters(adapters)
+
+        if borrow_cow:
+            header += "\n" + _BORROW_COW_MODULE
+
+        return header
+
+    def _is_json(self, field: ParsedField) -> bool:
+        return (
+            field.export_name is None
+            and field.value_field is None
+            and field.python_datatype is not None
+            and self.type_mappings.get(field.python_datatype) is Types.RAW_VALUE.value
+        )
+
+    def _map_json_field(self, schema: ParsedSchema, field: ParsedField) -> Mapping:
+        value_fields = self.get_kwarg(schema.kwargs, "rust_json_value_fields")
+        if value_fields is not None and field.field_name in value_fields:
+            return Types.VALUE.value
+
+        return Types.RAW_VALUE.value
+
+    def _format_struct_field(self, schema: ParsedSchema, field: ParsedField) -> str:
+        # Whether a JSON field is a Value depends on the schema, so these
+        # fields bypass the formatters shared by fields of the same shape
+        if self._is_json(field) and self.get_kwarg(
+            schema.kwargs, "rust_json_value_fields"
+        ):
+            export_type = self._map_json_field(schema, field).mapping
+            prefix, suffix = self._format_field_type(field, export_type)
+            return prefix + field.field_name + suffix
+
+        return self._format_schema_field(field)
+
+    def _get_flag_enums(self) -> Set[str]:
+        """Names of the enums which sets of choices are exported as bitflags
+        of. In sharded exports these are found from the whole export."""
+        if self._flag_enums is not None:
+            return self._flag_enums
+
+        self._flag_enums = set()
+        if not self.bitflags:
+            return self._flag_enums
+
+        set_enums = {
+            field.export_name
+            for schema in self.schemas
+            for field in schema.fields
+            if field.unique and field.export_name is not None
+        }
+        for en, enum_info in self.enums:
+            if (
+                en.__name__ in set_enums
+                and len(en._member_map_) <= 64
+                and not self.use_enum_table(en, enum_info)
+            ):
+                self._flag_enums.add(en.__name__)
+
+        return self._flag_enums
+
+    def _use_enum_repr(self, e: Type[Enum], enum_info: EnumInfo) -> bool:
+        return bool(
+            self.get_kwarg(enum_info.kwargs, "rust_enum_repr")
+        ) and not BaseLanguage.use_enum_table(self, e, enum_info)
+
+    def _format_repr_enum(self, e: Type[Enum], enum_info: EnumInfo) -> Union[str, None]:
+        repr_type = _get_enum_repr(e)
+        if repr_type is None:
+            print(
+                f"Warning: {e.__name__} has values which are neither all integers nor all strings, exporting it without a repr"
+            )
+            return None
+
+        derives: List[Mapping] = enum_info.kwargs.get("rust_enum_derives", [])
+        # Aliases would repeat the discriminant or the rename of their member
+        members = list(e)
+        if _has_int_values(e):
+            # Discriminants are the values, which serde_repr uses on the wire
+            derives = self._get_repr_derives(derives)
+            variants = [f"    {member.name} = {member.value}," for member in members]
+        else:
+            variants = [
+                f"    #[serde(rename = {json.dumps(member.value)})]\n    {member.name},"
+                for member in members
+            ]
+
+        derives_formatted, _ = self._get_derives(derives)
+        variants_formatted = "\n".join(variants)
+        return (
+            f"{derives_formatted}#[repr({repr_type})]\n"
+            f"pub enum {e.__name__} {{\n{variants_formatted}\n}}\n"
+        )
+
+    def format_enum(self, e: Type[Enum], enum_info: EnumInfo) -> str:
+        formatted = None
+        if self._use_enum_repr(e, enum_info):
+            formatted = self._format_repr_enum(e, enum_info)
+
+        if formatted is None:
+            formatted = super().format_enum(e, enum_info)
+
+        if e.__name__ not in self._get_flag_enums():
+            return formatted
+
+        return formatted + "\n" + self._format_enum_flags(e)
+
+    def _format_enum_flags(self, e: Type[Enum]) -> str:
+        # Serialized as the list of the variants, through the serde of the
+        # enum, so the wire format is the same as of a list of the enum
+        name = e.__name__
+        flags = f"{name}Flags"
+        members = list(e._member_map_.keys())
+        bits = min([b for b in [8, 16, 32, 64] if len(members) <= b])
+        consts = "\n".join(
+            [f"        const {member} = 1 << {i};" for i, member in enumerate(members)]
+        )
+        from_variants = "\n".join(
+            [f"            {name}::{member} => Self::{member}," for member in members]
+        )
+        serialize_variants = "\n".join(
+            [
+                f"        if self.contains(Self::{member}) {{\n"
+                f"            seq.serialize_element(&{name}::{member})?;\n"
+                f"        }}"
+                for member in members
+            ]
+        )
+
+        return f"""bitflags::bitflags! {{
+    #[derive(Clone, Copy, Debug, Default, PartialEq, Eq, Hash)]
+    pub struct {flags}: u{bits} {{
+{consts}
+    }}
+}}
+
+impl From<{name}> for {flags} {{
+    fn from(value: {name}) -> Self {{
+        match value {{
+{from_variants}
+        }}
+    }}
+}}
+
+impl serde::Serialize for {flags} {{
+    fn serialize<S: serde::Serializer>(&self, serializer: S) -> Result<S::Ok, S::Error> {{
+        use serde::ser::SerializeSeq;
+        let mut seq = serializer.serialize_seq(Some(self.bits().count_ones() as usize))?;
+{serialize_variants}
+        seq.end()
+    }}
+}}
+
+impl<'de> serde::Deserialize<'de> for {flags} {{
+    fn deserialize<D: serde::Deserializer<'de>>(deserializer: D) -> Result<Self, D::Error> {{
+        struct Visitor;
 
-            formatted_imp += ", ".join(imp)
-            if len(imp) > 1:
-                formatted_imp += "}"
+        impl<'de> serde::de::Visitor<'de> for Visitor {{
+            type Value = {flags};
 
-            formatted.append(f"use {lib}::{formatted_imp};")
+            fn expecting(&self, formatter: &mut std::fmt::Formatter) -> std::fmt::Result {{
+                formatter.write_str("a list of {name}")
+            }}
 
-        return "\n".join(formatted) + "\n"
+            fn visit_seq<A: serde::de::SeqAccess<'de>>(self, mut seq: A) -> Result<Self::Value, A::Error> {{
+                let mut flags = {flags}::empty();
+                while let Some(variant) = seq.next_element::<{name}>()? {{
+                    flags |= {flags}::from(variant);
+                }}
+                Ok(flags)
+            }}
+        }}
 
-    def _format_schema_field(
+        deserializer.deserialize_seq(Visitor)
+    }}
+}}
+"""
+
+    def _get_lean_field(
+        self, field: ParsedField, is_empty: Union[str, None]
+    ) -> Tuple[ParsedField, List[str]]:
+        """Field as wrapped in the struct and its serde attributes. In the lean
+        profile fields which may be left out are not serialized when empty.
+        Collections which cannot be null are not wrapped in an Option, a
+        missing collection is empty. is_empty is the path of the function
+        checking if the collection is empty, None for other types."""
+        if not self.lean_serde or field.required:
+            return field, []
+
+        if is_empty is not None and not field.allow_none:
+            return dataclasses.replace(field, required=True), [
+                "default",
+                f'skip_serializing_if = "{is_empty}"',
+            ]
+
+        return field, ["default", 'skip_serializing_if = "Option::is_none"']
+
+    def _format_field_type(
+        self, field: ParsedField, element: str, serde_with: Union[str, None] = None
+    ) -> Tuple[str, str]:
+        """Returns the formatted field before and after the field name.
+        serde_with is the adapter module the element is serialized with."""
+        # Adapters convert Vecs, not SmallVecs
+        inline_items = self._get_inline_items(field) if serde_with is None else None
+        if field.unique and field.export_name in self._get_flag_enums():
+            # The set replaces the list
+            field = dataclasses.replace(field, many=False)
+            element = f"{field.export_name}Flags"
+            is_empty: Union[str, None] = f"{element}::is_empty"
+        elif field.many:
+            is_empty = "Vec::is_empty" if inline_items is None else "SmallVec::is_empty"
+        elif field.value_field is not None:
+            is_empty = self.map_is_empty
+        else:
+            is_empty = None
+
+        field, attributes = self._get_lean_field(field, is_empty)
+        if serde_with is not None:
+            is_option = field.allow_none or not field.required
+            wrapper = {
+                (False, False): "",
+                (True, False): "::option",
+                (False, True): "::vec",
+                (True, True): "::option_vec",
+            }[(is_option, field.many)]
+            attributes = attributes + [f'with = "{serde_with}{wrapper}"']
+            # Unlike plain Options, adapted ones are required unless defaulted
+            if is_option and "default" not in attributes:
+                attributes = ["default"] + attributes
+
+        export_type = _wrap_field_type(field, element, inline_items)
+        return _format_field_prefix(attributes), f": {export_type},"
+
+    def _get_map_key(self, key_field: Union[ParsedField, None]) -> str:
+        # serde_json parses integer and UUID keys from the strings of JSON
+        # objects. Enums are not hashable with the default derives.
+        if key_field is None or key_field.python_datatype not in [
+            PythonDatatypes.INT,
+            PythonDatatypes.UUID,
+        ]:
+            return Types.STRING.value.mapping
+
+        key_type = self.map_schema_field(key_field)
+        if isinstance(key_type, str) or key_type.serde_with is not None:
+            return Types.STRING.value.mapping
+
+        return key_type.mapping
+
+    def _format_map_type(self, field: ParsedField) -> str:
+        """Type of a dict with typed values, without the Vec or Option"""
+        assert field.value_field is not None
+        value_field = dataclasses.replace(field.value_field, required=True)
+        if value_field.value_field is not None:
+            element = self._format_map_type(value_field)
+        else:
+            value_type = self.map_schema_field(value_field)
+            if isinstance(value_type, Mapping):
+                if value_type.serde_with is not None:
+                    print(
+                        f"Warning: the {value_type.serde_with} adapter does not apply to the values of {field.field_name}, they are serialized as {value_type.mapping}"
+                    )
+
+                value_type = value_type.mapping
+
+            element = value_type
+
+        key = self._get_map_key(field.key_field)
+        return (
+            f"{self.map_type.mapping}<{key}, {_wrap_field_type(value_field, element)}>"
+        )
+
+    def _compile_schema_field(
         self,
         field: ParsedField,
-    ) -> str:
+    ) -> Tuple[str, str]:
+        if field.value_field is not None:
+            return self._format_field_type(field, self._format_map_type(field))
+
         export_type = self.map_schema_field(field)
-        field_name = field.field_name
 
         if isinstance(export_type, Mapping):
-            export_type = export_type.mapping
-
-        if field.many:
-            export_type = f"Vec<{export_type}>"
-
-        if field.allow_none or not field.required:
-            export_type = f"Option<{export_type}>"
+            return self._format_field_type(
+                field, export_type.mapping, export_type.serde_with
+            )
 
-        return f"    pub {field_name}: {export_type},"
+        return self._format_field_type(field, export_type)
 
     def _format_schema(
         self, schema: ParsedSchema, schema_fields: List[ParsedField]
     ) -> str:
-        schema_fields_formatted = "\n".join(
-            [self._format_schema_field(fld) for fld in schema_fields]
+        formatted_fields = [
+            self._format_struct_field(schema, fld) for fld in schema_fields
+        ]
+        if schema.base is not None:
+            # The base is embedded, serde flattens its fields into the struct
+            base_field = _get_base_field_name(schema_fields)
+            formatted_fields.insert(
+                0, f"    #[serde(flatten)]\n    pub {base_field}: {schema.base},"
+            )
+
+        schema_fields_formatted = "\n".join(formatted_fields)
+        derives = ""
+        if "rust_schema_derives" in schema.kwargs:
+            derives, _ = self._get_derives(schema.kwargs["rust_schema_derives"])
+
+        return f"{derives}pub struct {schema.name} {{\n{schema_fields_formatted}\n}}\n"
+
+    def format_schema(
+        self, schema: ParsedSchema, include_dump_only: bool, include_load_only: bool
+    ) -> str:
+        formatted = super().format_schema(schema, include_dump_only, include_load_only)
+        if self.borrowed is None:
+            return formatted
+
+        borrowing = self._get_borrowing_schemas(include_dump_only, include_load_only)
+        if schema.name not in borrowing:
+            return formatted
+
+        borrowed = self._format_borrowed_schema(
+            schema, include_dump_only, include_load_only, borrowing
+        )
+        return formatted + "\n" + borrowed
+
+    def _is_borrowed_string(self, field: ParsedField) -> bool:
+        return (
+            field.export_name is None
+            and field.python_datatype is not None
+            and self.type_mappings.get(field.python_datatype) is Types.STRING.value
+            # Inline strings are not allocated, there is nothing to save
+            and self._get_inline_string(field) is None
+        )
+
+    def _get_borrowing_schemas(
+        self, include_dump_only: bool, include_load_only: bool
+    ) -> Set[str]:
+        """Names of the schemas which have string fields or nest such schemas,
+        and so get a borrowed variant with a lifetime"""
+        if self._shard_borrowing is not None:
+            return self._shard_borrowing
+
+        variant = (include_dump_only, include_load_only)
+        if variant in self._borrowing_schemas:
+            return self._borrowing_schemas[variant]
+
+        borrowing: Set[str] = set()
+        changed = True
+        while changed:
+            changed = False
+            for schema in self.schemas:
+                if schema.name in borrowing or schema.opaque:
+                    continue
+
+                if schema.alias_of is not None:
+                    borrows = schema.alias_of in borrowing
+                else:
+                    exporter = self.with_profile(schema.kwargs)
+                    assert isinstance(exporter, Rust)
+                    borrows = schema.base in borrowing or any(
+                        [
+                            exporter._is_borrowed_string(field)
+                            or field.export_name in borrowing
+                            for field in self.get_included_fields(
+                                schema, include_dump_only, include_load_only
+                            )
+                        ]
+                    )
+
+                if borrows:
+                    borrowing.add(schema.name)
+                    changed = True
+
+        self._borrowing_schemas[variant] = borrowing
+        return borrowing
+
+    def _format_borrowed_schema(
+        self,
+        schema: ParsedSchema,
+        include_dump_only: bool,
+        include_load_only: bool,
+        borrowing: Set[str],
+    ) -> str:
+        name = f"{schema.name}Ref"
+        if schema.alias_of is not None:
+            return f"pub type {name}<'a> = {schema.alias_of}Ref<'a>;\n"
+
+        schema_fields = self.get_included_fields(
+            schema, include_dump_only, include_load_only
         )
+        formatted_fields = list()
+        to_borrowed = list()
+        to_owned = list()
+
+        if schema.base is not None:
+            base_field = _get_base_field_name(schema_fields)
+            if schema.base in borrowing:
+                formatted_fields.append(
+                    f"    #[serde(flatten, borrow)]\n    pub {base_field}: {schema.base}Ref<'a>,"
+                )
+                to_borrowed.append(
+                    f"{base_field}: {schema.base}Ref::from(&value.{base_field}),"
+                )
+                to_owned.append(
+                    f"{base_field}: {schema.base}::from(value.{base_field}),"
+                )
+            else:
+                formatted_fields.append(
+                    f"    #[serde(flatten)]\n    pub {base_field}: {schema.base},"
+                )
+                to_borrowed.append(f"{base_field}: value.{base_field}.clone(),")
+                to_owned.append(f"{base_field}: value.{base_field},")
+
+        for field in schema_fields:
+            field_name = field.field_name
+            value = f"value.{field_name}"
+            borrow: _Convert
+            own: _Convert
+
+            is_string = self._is_borrowed_string(field)
+            if is_string:
+                assert self.borrowed is not None
+                element, borrow, own = _BORROWED_STRINGS[self.borrowed]
+            elif field.export_name in borrowing:
+                element = f"{field.export_name}Ref<'a>"
+                borrow = partial(_borrow_nested, field.export_name)
+                own = partial(_own_nested, field.export_name)
+            else:
+                formatted_fields.append(self._format_struct_field(schema, field))
+                to_borrowed.append(f"{field_name}: {value}.clone(),")
+                to_owned.append(f"{field_name}: {value},")
+                continue
+
+            field, attributes = self._get_lean_field(
+                field, "Vec::is_empty" if field.many else None
+            )
+            export_type = _wrap_field_type(field, element)
+            # Only a plain &str is borrowed by serde without the attribute
+            if export_type != "&'a str":
+                attributes = ["borrow"] + attributes
+
+            helper = _get_borrow_cow_helper(field)
+            if self.borrowed == Borrowed.COW and is_string and helper is not None:
+                # serde only defaults a missing Option to None without
+                # deserialize_with
+                if helper != "vec" and "default" not in attributes:
+                    attributes.append("default")
+
+                attributes.append(f'deserialize_with = "borrow_cow::{helper}"')
+
+            formatted_fields.append(
+                f"{_format_field_prefix(attributes)}{field_name}: {export_type},"
+            )
+            to_borrowed.append(
+                f"{field_name}: {_convert_field(field, value, borrow, owned=False)},"
+            )
+            to_owned.append(
+                f"{field_name}: {_convert_field(field, value, own, owned=True)},"
+            )
+
         derives = ""
+        if "rust_schema_derives" in schema.kwargs:
+            derives, _ = self._get_derives(schema.kwargs["rust_schema_derives"])
+
+        schema_fields_formatted = "\n".join(formatted_fields)
+        to_borrowed_formatted = "\n".join([f"            {f}" for f in to_borrowed])
+        to_owned_formatted = "\n".join([f"            {f}" for f in to_owned])
+        return f"""{derives}pub struct {name}<'a> {{
+{schema_fields_formatted}
+}}
+
+impl<'a> From<&'a {schema.name}> for {name}<'a> {{
+    fn from(value: &'a {schema.name}) -> Self {{
+        Self {{
+{to_borrowed_formatted}
+        }}
+    }}
+}}
+
+impl From<{name}<'_>> for {schema.name} {{
+    fn from(value: {name}<'_>) -> Self {{
+        Self {{
+{to_owned_formatted}
+        }}
+    }}
+}}
+"""
+
+    def _format_opaque_schema(self, schema: ParsedSchema) -> str:
+        return f"pub type {schema.name} = serde_json::Value;\n"
+
+    def _format_schema_alias(self, schema: ParsedSchema) -> str:
+        return f"pub type {schema.name} = {schema.alias_of};\n"
+
+    def get_shard_helpers(
+        self, include_dump_only: bool, include_load_only: bool
+    ) -> Dict[str, List[str]]:
+        helpers: Dict[str, List[str]] = dict()
+        if self.borrowed is not None:
+            for name in self._get_borrowing_schemas(
+                include_dump_only, include_load_only
+            ):
+                helpers.setdefault(name, []).append(f"{name}Ref")
+
+        for name in self._get_flag_enums():
+            helpers.setdefault(name, []).append(f"{name}Flags")
+
+        return helpers
 
+    def set_shard_helpers(self, helpers: Dict[str, List[str]]) -> None:
+        # Fields of other shards than the enum are flags as well, and structs
+        # nesting borrowed structs of other shards are borrowed
+        self._flag_enums = {
+            name for name, names in helpers.items() if f"{name}Flags" in names
+        }
+        self._shard_borrowing = {
+            name for name, names in helpers.items() if f"{name}Ref" in names
+        }
+
+    def get_field_imports(
+        self, field: ParsedField, include_dump_only: bool, include_load_only: bool
+    ) -> List[str]:
+        if field.unique and field.export_name in self._get_flag_enums():
+            # The flags replace the list of the enum
+            return [f"{field.export_name}Flags"]
+
+        names = super().get_field_imports(field, include_dump_only, include_load_only)
         if (
-            "rust_schema_derives" in schema.kwargs
-            and len(schema.kwargs["rust_schema_derives"]) > 0
+            self.borrowed is not None
+            and field.export_name
+            in self._get_borrowing_schemas(include_dump_only, include_load_only)
         ):
-            derive_str = sorted(
-                [m.mapping for m in schema.kwargs["rust_schema_derives"]],
-                key=lambda e: e.lower(),
-            )
-            derives = f'#[derive({", ".join([m for m in derive_str])})]\n'
+            names.append(f"{field.export_name}Ref")
 
-        return f"{derives}pub struct {schema.name} {{\n{schema_fields_formatted}\n}}\n"
+        return names
+
+    def format_shard_imports(self, shard_imports: Dict[str, Set[str]]) -> str:
+        return self.format_imports(
+            {f"super::{shard}": names for shard, names in shard_imports.items()}
+        )
+
+    def format_shard_index(self, shards: Dict[str, List[str]]) -> Tuple[str, str]:
+        # Helper modules, such as the ones for borrowed strings, are declared
+        # in several shards, so only the types are re-exported
+        modules = [f"pub mod {shard};" for shard in shards]
+        uses = [
+            f"pub use {shard}::{_format_use_names(names)};"
+            for shard, names in shards.items()
+        ]
+        return "mod.rs", "\n".join(modules + [""] + uses) + "\n"
@@ -1,5 +1,7 @@
+import dataclasses
+import json
 from enum import Enum, EnumMeta
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Set, Tuple, Type, Union
 
 from schema_exporter.types import (
     EnumInfo,
@@ -50,56 +52,248 @@ type_mappings: Dict[PythonDatatypes, Mapping] = {
     PythonDatatypes.JSON_FIELD: Types.OBJECT.value,
 }
 
+# Matches the compact Rust profile where JavaScript can represent it, UUIDs
+# stay strings as numbers lose precision beyond 2**53
+mapping_profiles: Dict[str, Dict[PythonDatatypes, Mapping]] = {
+    "compact": {PythonDatatypes.DATETIME: Types.NUMBER.value},
+}
+
+
+class EnumStyle(str, Enum):
+    ENUM = "enum"  # Runtime enum object
+    CONST_ENUM = "const_enum"  # Inlined by the compiler, no runtime object
+    UNION = "union"  # Union of the values, no runtime object
+    CONST_OBJECT = "const_object"  # Tree-shakeable object with a derived type
+
+
+class Validators(str, Enum):
+    GUARD = "guard"  # isFoo(value: unknown): value is Foo
+    DECODER = "decoder"  # decodeFoo(value: unknown): Foo, throws a TypeError
+
+
+# Checks failing for a single value which is not of the mapped type
+_TYPE_CHECKS: Dict[str, str] = {
+    Types.BOOL.value.mapping: 'typeof {0} !== "boolean"',
+    Types.NUMBER.value.mapping: 'typeof {0} !== "number"',
+    Types.STRING.value.mapping: 'typeof {0} !== "string"',
+    Types.OBJECT.value.mapping: 'typeof {0} !== "object" || {0} === null',
+}
+
+# Checks with the expected types of datatypes sent in several
+# representations, replacing the check of their mapped type. DRF sends
+# decimals as strings unless COERCE_DECIMAL_TO_STRING is disabled, and JSON
+# fields hold any JSON value, so they are not checked.
+_DATATYPE_CHECKS: Dict[PythonDatatypes, Union[Tuple[str, str], None]] = {
+    PythonDatatypes.DECIMAL: (
+        'typeof {0} !== "number" && typeof {0} !== "string"',
+        "number or string",
+    ),
+    PythonDatatypes.JSON_FIELD: None,
+}
+
+
+def _indent(lines: List[str]) -> List[str]:
+    return [f"  {line}" for line in lines]
+
 
 class Typescript(BaseLanguage):
+    def __init__(
+        self,
+        schemas: List[ParsedSchema],
+        enums: List[Tuple[Type[Enum], EnumInfo]],
+        options: Union[Dict[str, Any], None] = None,
+    ) -> None:
+        super().__init__(schemas, enums, options)
+
+        self.validators: Union[Validators, None] = None
+        validators = self.options.get("ts_validators")
+        if validators is not None:
+            if validators not in [v.value for v in Validators]:
+                raise ValueError(
+                    f'Unknown ts_validators: {validators}, supported are: {", ".join([v.value for v in Validators])}'
+                )
+
+            self.validators = Validators(validators)
+
     @property
     def type_mappings(self) -> Dict[PythonDatatypes, Mapping]:
+        if self._mappings_override is not None:
+            return self._mappings_override
+
         return type_mappings
 
+    @property
+    def file_extension(self) -> str:
+        return "ts"
+
     @staticmethod
     def get_default_kwargs() -> Dict[str, Any]:
-        return dict()
+        return {
+            "ts_enum_style": None,
+            "enum_table_threshold": None,
+            "type_mapping_profile": None,
+        }
 
     @staticmethod
-    def _format_enum_field(field_name: str, value: Enum) -> str:
+    def get_mapping_profiles() -> Dict[str, Dict[PythonDatatypes, Mapping]]:
+        return mapping_profiles
+
+    @staticmethod
+    def get_export_options() -> Dict[str, Any]:
+        # Validators of nested schemas call each other, so they are either
+        # generated for the whole export or not at all
+        return {"ts_validators": None}
+
+    @staticmethod
+    def _format_enum_value(value: Enum) -> str:
         val = value.value
         if not isinstance(val, int):
             val = f'"{val}"'
 
-        return f"  {field_name} = {val},"
+        return str(val)
+
+    @staticmethod
+    def _format_enum_field(field_name: str, value: Enum) -> str:
+        return f"  {field_name} = {Typescript._format_enum_value(value)},"
 
     @staticmethod
     def _format_enum(e: EnumMeta, enum_fields: List[str], enum_info: EnumInfo) -> str:
         enum_fields_formatted = "\n".join(enum_fields)
         return f"export enum {e.__name__} {{\n{enum_fields_formatted}\n}}\n"
 
-    def format_header(self, include_dump_only: bool, include_load_only: bool) -> str:
-        return ""
+    def format_enum(self, e: Type[Enum], enum_info: EnumInfo) -> str:
+        formatted = self._format_enum_style(e, enum_info)
+        if self.validators is None:
+            return formatted
 
-    def _format_schema_field(
-        self,
-        field: ParsedField,
-    ) -> str:
-        export_type = self.map_schema_field(field)
-        field_name = field.field_name
-        readonly = ""
+        return formatted + "\n" + self._format_enum_validator(e, enum_info)
+
+    def _format_enum_style(self, e: Type[Enum], enum_info: EnumInfo) -> str:
+        if self.use_enum_table(e, enum_info):
+            return self._format_enum_table(e, enum_info)
+
+        style = self.get_kwarg(enum_info.kwargs, "ts_enum_style") or EnumStyle.ENUM
+        members = e._member_map_.items()
+
+        if style == EnumStyle.ENUM:
+            return super().format_enum(e, enum_info)
+
+        if style == EnumStyle.CONST_ENUM:
+            enum_fields = "\n".join(
+                [
+                    self._format_enum_field(field_name, value)
+                    for field_name, value in members
+                ]
+            )
+            return f"export const enum {e.__name__} {{\n{enum_fields}\n}}\n"
+
+        if style == EnumStyle.UNION:
+            values = "\n".join(
+                [f"  | {self._format_enum_value(value)}" for _, value in members]
+            )
+            return f"export type {e.__name__} =\n{values}\n"
+
+        if style == EnumStyle.CONST_OBJECT:
+            enum_fields = "\n".join(
+                [
+                    f"  {field_name}: {self._format_enum_value(value)},"
+                    for field_name, value in members
+                ]
+            )
+            return (
+                f"export const {e.__name__} = {{\n{enum_fields}\n}} as const\n"
+                f"export type {e.__name__} = (typeof {e.__name__})[keyof typeof {e.__name__}]\n"
+            )
+
+        raise ValueError(
+            f'Unknown ts_enum_style: {style}, supported are: {", ".join([s.value for s in EnumStyle])}'
+        )
+
+    @staticmethod
+    def _get_table_value_types(e: Type[Enum]) -> List[str]:
+        value_types = {
+            Types.NUMBER.value.mapping if isinstance(m.value, int) else "string"
+            for m in e._member_map_.values()
+        }
+        return sorted(value_types, reverse=True)
+
+    def _format_table_value_type(self, e: Type[Enum]) -> str:
+        value_types = self._get_table_value_types(e)
+        if len(value_types) > 1:
+            return f'({" | ".join(value_types)})'
 
-        if isinstance(export_type, Mapping):
-            export_type = export_type.mapping
+        return value_types[0]
+
+    def _format_enum_table(self, e: Type[Enum], enum_info: EnumInfo) -> str:
+        # Branded types cost the compiler the same however many values there
+        # are, unlike a union of the values. The values are in a module of
+        # their own, which bundlers split into a lazily loaded chunk.
+        name = e.__name__
+        value_type = self._format_table_value_type(e)
+        return (
+            f'export type {name} = {value_type} & {{ readonly __enum: "{name}" }}\n'
+            f"export const load{name}Values = (): Promise<readonly {name}[]> =>\n"
+            f'  import("./{name}.values").then((m) => m.{name}Values as readonly {name}[])\n'
+        )
+
+    def _format_enum_values_module(self, e: Type[Enum]) -> str:
+        values = "\n".join(
+            [f"  {json.dumps(m.value)}," for m in e._member_map_.values()]
+        )
+        value_type = self._format_table_value_type(e)
+        return f"export const {e.__name__}Values: readonly {value_type}[] = [\n{values}\n]\n"
+
+    def format_extra_files(self) -> Dict[str, str]:
+        return {
+            f"{e.__name__}.values.{self.file_extension}": self._format_enum_values_module(
+                e
+            )
+            for e, enum_info in self.enums
+            if self.use_enum_table(e, enum_info)
+        }
+
+    def _format_type(self, field: ParsedField) -> str:
+        """Type of the field without null, dicts with typed entries are
+        records"""
+        if field.value_field is None:
+            export_type = self.map_schema_field(field)
+            if isinstance(export_type, Mapping):
+                export_type = export_type.mapping
+        else:
+            value_type = self._format_type(field.value_field)
+            if field.value_field.allow_none:
+                value_type += " | null"
+
+            key_field = field.key_field
+            if key_field is not None and key_field.export_name is not None:
+                # Not every enum member needs to have an entry
+                export_type = f"Partial<Record<{key_field.export_name}, {value_type}>>"
+            else:
+                export_type = f"Record<string, {value_type}>"
 
         if field.many:
             export_type += "[]"
 
+        return export_type
+
+    def _compile_schema_field(
+        self,
+        field: ParsedField,
+    ) -> Tuple[str, str]:
+        export_type = self._format_type(field)
+        optional = ""
+        readonly = ""
+
         if field.allow_none:
             export_type += " | null"
 
         if not field.required:
-            field_name += "?"
+            optional = "?"
 
         if field.dump_only:
             readonly = "readonly "
 
-        return f"  {readonly}{field_name}: {export_type}"
+        return f"  {readonly}", f"{optional}: {export_type}"
 
     def _format_schema(
         self, schema: ParsedSchema, schema_fields: List[ParsedField]
@@ -107,4 +301,212 @@ class Typescript(BaseLanguage):
         schema_fields_formatted = "\n".join(
             [self._format_schema_field(fld) for fld in schema_fields]
         )
-        return f"export interface {schema.name} {{\n{schema_fields_formatted}\n}}\n"
+        extends = ""
+        if schema.base is not None:
+            extends = f" extends {schema.base}"
+
+        return f"export interface {schema.name}{extends} {{\n{schema_fields_formatted}\n}}\n"
+
+    def format_schema(
+        self, schema: ParsedSchema, include_dump_only: bool, include_load_only: bool
+    ) -> str:
+        formatted = super().format_schema(schema, include_dump_only, include_load_only)
+        if self.validators is None:
+            return formatted
+
+        validator = self._format_schema_validator(
+            schema, include_dump_only, include_load_only
+        )
+        return formatted + "\n" + validator
+
+    def _get_validator_name(self, name: str) -> str:
+        prefix = "is" if self.validators == Validators.GUARD else "decode"
+        return prefix + name
+
+    def _format_validator(self, name: str, body: List[str]) -> str:
+        if self.validators == Validators.GUARD:
+            header = f"export function is{name}(value: unknown): value is {name} {{"
+            footer = "  return true"
+        else:
+            header = f'export function decode{name}(value: unknown, path: string = "{name}"): {name} {{'
+            footer = f"  return value as {name}"
+
+        return "\n".join([header] + body + [footer, "}"]) + "\n"
+
+    def _format_fail(self, path: str, expected: str) -> str:
+        """Statement failing the validation, path is a template literal"""
+        if self.validators == Validators.GUARD:
+            return "return false"
+
+        return f"throw new TypeError(`{path}: expected {expected}`)"
+
+    def _format_enum_validator(self, e: Type[Enum], enum_info: EnumInfo) -> str:
+        fail = self._format_fail("${path}", e.__name__)
+        if self.use_enum_table(e, enum_info):
+            # The values are loaded lazily, only their type is checked
+            conditions = [
+                f'typeof value !== "{value_type}"'
+                for value_type in self._get_table_value_types(e)
+            ]
+            condition = " && ".join(conditions)
+            return self._format_validator(e.__name__, [f"  if ({condition}) {fail}"])
+
+        conditions = [
+            f"value !== {self._format_enum_value(value)}"
+            for value in e._member_map_.values()
+        ]
+        if len(conditions) <= 3:
+            body = [f'  if ({" && ".join(conditions)}) {fail}']
+        else:
+            body = ["  if ("]
+            body += [f"    {condition} &&" for condition in conditions[:-1]]
+            body += [f"    {conditions[-1]}", f"  ) {fail}"]
+
+        return self._format_validator(e.__name__, body)
+
+    def _format_entries_check(
+        self, value_field: ParsedField, value: str, path: str
+    ) -> List[str]:
+        lines = [
+            f'if (typeof {value} !== "object" || {value} === null) {self._format_fail(path, "object")}'
+        ]
+        # Entries of nested dicts get their own names, as the entries of the
+        # outer dict are still in scope
+        depth = path.count("${key")
+        key, entry = f"key{depth}", f"entry{depth}"
+        # Entries which are present are checked, missing ones are not entries
+        value_field = dataclasses.replace(value_field, required=True)
+        entry_check = self._format_checks(value_field, entry, f"{path}.${{{key}}}")
+        if len(entry_check) == 0:
+            return lines
+
+        entries = f"Object.entries({value} as Record<string, unknown>)"
+        if self.validators == Validators.GUARD:
+            loop = f"for (const {entry} of Object.values({value} as Record<string, unknown>)) {{"
+        else:
+            loop = f"for (const [{key}, {entry}] of {entries}) {{"
+
+        return lines + [loop, *_indent(entry_check), "}"]
+
+    def _format_value_check(
+        self, field: ParsedField, value: str, path: str
+    ) -> List[str]:
+        if field.value_field is not None:
+            return self._format_entries_check(field.value_field, value, path)
+
+        export_type = self.map_schema_field(field)
+
+        # Nested schemas and enums are checked by their own validators
+        if not isinstance(export_type, Mapping):
+            validator = self._get_validator_name(export_type)
+            if self.validators == Validators.GUARD:
+                return [f"if (!{validator}({value})) return false"]
+
+            return [f"{validator}({value}, `{path}`)"]
+
+        check = _TYPE_CHECKS.get(export_type.mapping)
+        expected = export_type.mapping
+        if field.python_datatype in _DATATYPE_CHECKS:
+            datatype_check = _DATATYPE_CHECKS[field.python_datatype]
+            if datatype_check is None:
+                return list()
+
+            check, expected = datatype_check
+
+        if check is None:
+            return list()
+
+        return [f"if ({check.format(value)}) {self._format_fail(path, expected)}"]
+
+    def _format_field_check(self, field: ParsedField) -> List[str]:
+        name = field.field_name
+        value = f"v.{name}" if name.isidentifier() else f"v[{json.dumps(name)}]"
+        return self._format_checks(field, value, f"${{path}}.{name}")
+
+    def _format_checks(self, field: ParsedField, value: str, path: str) -> List[str]:
+        if field.many:
+            item_check = self._format_value_check(field, "items[i]", path + "[${i}]")
+            lines = [f"if (!Array.isArray({value})) {self._format_fail(path, 'array')}"]
+            if len(item_check):
+                lines += [
+                    f"const items = {value} as unknown[]",
+                    "for (let i = 0; i < items.length; i++) {",
+                    *_indent(item_check),
+                    "}",
+                ]
+        else:
+            lines = self._format_value_check(field, value, path)
+
+        if len(lines) == 0:
+            return lines
+
+        present = list()
+        if not field.required:
+            present.append(f"{value} !== undefined")
+
+        if field.allow_none:
+            present.append(f"{value} !== null")
+
+        if len(present):
+            return [f'if ({" && ".join(present)}) {{', *_indent(lines), "}"]
+
+        if len(lines) > 1:
+            # Keeps the items of each list field in their own scope
+            return ["{", *_indent(lines), "}"]
+
+        return lines
+
+    def _format_schema_validator(
+        self, schema: ParsedSchema, include_dump_only: bool, include_load_only: bool
+    ) -> str:
+        if schema.alias_of is not None:
+            validator = self._get_validator_name(schema.name)
+            return f"export const {validator} = {self._get_validator_name(schema.alias_of)}\n"
+
+        if schema.opaque:
+            return self._format_validator(schema.name, [])
+
+        body = [
+            f'if (typeof value !== "object" || value === null) {self._format_fail("${path}", "object")}',
+        ]
+        if schema.base is not None:
+            base_validator = self._get_validator_name(schema.base)
+            if self.validators == Validators.GUARD:
+                body.append(f"if (!{base_validator}(value)) return false")
+            else:
+                body.append(f"{base_validator}(value, path)")
+
+        field_checks = list()
+        for field in self.get_included_fields(
+            schema, include_dump_only, include_load_only
+        ):
+            field_checks += self._format_field_check(field)
+
+        if len(field_checks):
+            body += ["const v = value as Record<string, unknown>"] + field_checks
+
+        return self._format_validator(schema.name, _indent(body))
+
+    def _format_opaque_schema(self, schema: ParsedSchema) -> str:
+        return f"export type {schema.name} = unknown\n"
+
+    def _format_schema_alias(self, schema: ParsedSchema) -> str:
+        return f"export type {schema.name} = {schema.alias_of}\n"
+
+    def format_shard_imports(self, shard_imports: Dict[str, Set[str]]) -> str:
+        formatted = list()
+        for shard, names in sorted(shard_imports.items()):
+            names_formatted = ", ".join(sorted(names))
+            formatted.append(f'import type {{ {names_formatted} }} from "./{shard}";')
+
+            if self.validators is not None:
+                validators = ", ".join(
+                    sorted([self._get_validator_name(name) for name in names])
+                )
+                formatted.append(f'import {{ {validators} }} from "./{shard}";')
+
+        return "\n".join(formatted) + "\n"
+
+    def format_shard_index(self, shards: Dict[str, List[str]]) -> Tuple[str, str]:
+        exports = [f'export * from "./{shard}";' for shard in shards]
+        return "index.ts", "\n".join(exports) + "\n"
@@ -1,3 +1,4 @@
+import sys
 from abc import ABC, abstractmethod
 from enum import Enum
 from typing import Any, Dict, Generic, Set, Tuple, Type, TypeVar, Union
@@ -7,6 +8,26 @@ from schema_exporter.types import EnumInfo, ParsedField, ParsedSchema
 S = TypeVar("S")
 F = TypeVar("F")
 
+EnumKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def get_enum_key(en: Type[Enum]) -> EnumKey:
+    """Key identifying enums which would be exported identically"""
+    return (
+        en.__name__,
+        tuple([(name, str(member.value)) for name, member in en._member_map_.items()]),
+    )
+
+
+def is_importable(en: Type[Enum]) -> bool:
+    """Whether the enum can be found from its module, which is not the case
+    for enums created at parse time, such as the ones from DRF choices"""
+    obj: Any = sys.modules.get(en.__module__)
+    for attr in en.__qualname__.split("."):
+        obj = getattr(obj, attr, None)
+
+    return obj is en
+
 
 class BaseParser(ABC, Generic[S, F]):
     def __init__(
@@ -16,6 +37,7 @@ class BaseParser(ABC, Generic[S, F]):
         self.schemas: Dict[str, ParsedSchema] = dict()
         self.schema_nests: Dict[ParsedSchema, Set[str]] = dict()
         self.enums: Dict[Type[Enum], EnumInfo] = dict()
+        self.enum_keys: Dict[EnumKey, Type[Enum]] = dict()
         self.schemas_to_parse: Set[S] = set()
         self.default_info_kwargs = default_info_kwargs
 
@@ -26,6 +48,17 @@ class BaseParser(ABC, Generic[S, F]):
     ):
         pass
 
+    @abstractmethod
+    def get_class_export_name(self, schema_cls: Type) -> str:
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def get_declared_nested(schema_cls: Type) -> Set[Type]:
+        """Nested schema classes declared on a schema class, found without
+        instantiating or parsing it"""
+        pass
+
     @abstractmethod
     def parse_field(self, field_name: str, field: F) -> Tuple[ParsedField, Set[str]]:
         pass
@@ -36,19 +69,45 @@ class BaseParser(ABC, Generic[S, F]):
     ) -> None:
         pass
 
+    @classmethod
+    def prepare_parallel_parse(cls) -> None:
+        """Called once in the parent process before forking parse workers"""
+        pass
+
     def add_enum(
         self, en: Type[Enum], info_kwargs: Union[Dict[str, Any], None] = None
-    ) -> None:
+    ) -> Type[Enum]:
         if info_kwargs is None:
             info_kwargs = self.default_info_kwargs
 
+        # Identical enums, such as ones created from the same choices, are
+        # exported only once
+        enum_key = get_enum_key(en)
+        if enum_key in self.enum_keys:
+            return self.enum_keys[enum_key]
+
+        self.enum_keys[enum_key] = en
         self.enums[en] = EnumInfo(kwargs=info_kwargs)
+        return en
 
-    def parse_nested(self):
+    def parse_queued(self):
         while len(self.schemas_to_parse):
             schema = self.schemas_to_parse.pop()
             self.parse_and_add_schema(schema)
 
+    def parse_nested(self):
+        self.parse_queued()
+        self.resolve_nests()
+
+    def add_opaque_schema(self, name: str) -> None:
+        """Adds a schema which is exported as an opaque type, without fields"""
+        parsed_schema = ParsedSchema(
+            name=name, fields=[], opaque=True, kwargs=self.default_info_kwargs
+        )
+        self.schema_nests[parsed_schema] = set()
+        self.schemas[name] = parsed_schema
+
+    def resolve_nests(self):
         # Add nests to parsed schema details
         for parsed_schema, nested_schema_names in self.schema_nests.items():
             for nested_schema_name in nested_schema_names:
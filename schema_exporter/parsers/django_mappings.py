@@ -1,6 +1,7 @@
-from typing import Dict, Type
+from typing import Dict, Tuple, Type
 
 from django.db import models
+from django.db.backends.base.operations import BaseDatabaseOperations
 
 from schema_exporter.types import PythonDatatypes
 
@@ -34,3 +35,8 @@ django_mappings: Dict[Type[models.Field], PythonDatatypes] = {
     models.URLField: PythonDatatypes.URL,
     models.UUIDField: PythonDatatypes.UUID,
 }
+
+# Inclusive value ranges of integer fields, keyed by the internal type
+django_integer_ranges: Dict[str, Tuple[int, int]] = (
+    BaseDatabaseOperations.integer_field_ranges
+)
@@ -3,7 +3,6 @@ from enum import Enum
 from typing import (
     Any,
     Dict,
-    List,
     Set,
     Tuple,
     Type,
@@ -13,15 +12,26 @@ from typing import (
     get_type_hints,
 )
 
+from django.core.validators import (
+    BaseValidator,
+    MaxLengthValidator,
+    MaxValueValidator,
+    MinLengthValidator,
+    MinValueValidator,
+)
+from django.db import models
 from rest_framework import serializers
 
 from schema_exporter.parsers.drf_mappings import drf_mappings
 from schema_exporter.types import ParsedField, ParsedSchema, PythonDatatypes
 
 from .base_parser import BaseParser
-from .django_mappings import django_mappings
+from .django_mappings import django_integer_ranges, django_mappings
 from .python_native_mappings import python_native_mappings
 
+# Class of the default child of dict fields, which accepts any value
+_UNTYPED_DICT_CHILD = type(serializers.DictField.child)
+
 is_min_python3_10 = sys.version_info.major == 3 and sys.version_info.minor >= 10
 
 if is_min_python3_10:
@@ -41,67 +51,168 @@ def _create_enum_from_choices(
     if isinstance(field, serializers.MultipleChoiceField):
         many = True
 
+    # DRF reads and writes the keys of the choices, the labels are only
+    # displayed
     if isinstance(field.choices, dict):
-        choices.update(field.choices)
+        choices.update({key: key for key in field.choices})
 
     return Enum(_to_pascal_case(field_name), choices), many  # type: ignore
 
 
+def _get_bounds(
+    drf_field: serializers.Field,
+    min_attr: str,
+    max_attr: str,
+    min_validator: Type[BaseValidator],
+    max_validator: Type[BaseValidator],
+    bounds: Tuple[Union[int, None], Union[int, None]] = (None, None),
+) -> Tuple[Union[int, None], Union[int, None]]:
+    """Tightest inclusive bounds from the given field attributes and
+    validators, narrowing the bounds passed in"""
+    min_bound, max_bound = bounds
+    limits = [
+        (min_validator, getattr(drf_field, min_attr, None)),
+        (max_validator, getattr(drf_field, max_attr, None)),
+    ]
+    # Limits may also be callables, which cannot be resolved at export
+    limits += [
+        (type(validator), getattr(validator, "limit_value", None))
+        for validator in drf_field.validators
+    ]
+    for validator_cls, limit in limits:
+        if not isinstance(limit, int):
+            continue
+
+        if issubclass(validator_cls, min_validator):
+            min_bound = limit if min_bound is None else max(min_bound, limit)
+        elif issubclass(validator_cls, max_validator):
+            max_bound = limit if max_bound is None else min(max_bound, limit)
+
+    return min_bound, max_bound
+
+
+def _get_int_bounds(
+    drf_field: serializers.Field, related_field: Union[models.Field, None]
+) -> Tuple[Union[int, None], Union[int, None]]:
+    """Bounds of an integer field. Model serializers set min_value and
+    max_value from the range of the model field, primary keys use the range
+    of the related field."""
+    bounds: Tuple[Union[int, None], Union[int, None]] = (None, None)
+    if related_field is not None:
+        bounds = django_integer_ranges.get(
+            related_field.get_internal_type(), (None, None)
+        )
+
+    return _get_bounds(
+        drf_field,
+        "min_value",
+        "max_value",
+        MinValueValidator,
+        MaxValueValidator,
+        bounds,
+    )
+
+
+def _get_length_bounds(
+    drf_field: serializers.Field,
+) -> Tuple[Union[int, None], Union[int, None]]:
+    """Bounds of the length of strings, and of lists for list fields"""
+    return _get_bounds(
+        drf_field,
+        "min_length",
+        "max_length",
+        MinLengthValidator,
+        MaxLengthValidator,
+    )
+
+
 class DRFParser(BaseParser[serializers.Serializer, serializers.Field]):
+    @classmethod
+    def prepare_parallel_parse(cls) -> None:
+        # Populate the app registry once, so forked workers inherit it
+        import django
+        from django.apps import apps
+        from django.conf import settings
+
+        if settings.configured and not apps.ready:
+            django.setup()
+
     def _get_schema_export_name(
         self,
         serializer: serializers.Serializer,
     ):
-        name = serializer.__class__.__name__
+        return self.get_class_export_name(serializer.__class__)
+
+    def get_class_export_name(self, schema_cls: Type[serializers.Serializer]) -> str:
+        name = schema_cls.__name__
         if self.strip_schema_from_name:
             name = name.replace("Serializer", "")
 
         return name
 
     @staticmethod
-    def _parse_primary_key_related_field(
+    def get_declared_nested(
+        schema_cls: Type[serializers.Serializer],
+    ) -> Set[Type[serializers.Serializer]]:
+        nested = set()
+        for field in schema_cls._declared_fields.values():
+            if isinstance(field, serializers.DictField):
+                field = field.child
+
+            if isinstance(field, (serializers.ListSerializer, serializers.ListField)):
+                field = field.child
+
+            if isinstance(field, serializers.Serializer):
+                nested.add(field.__class__)
+
+        return nested
+
+    @staticmethod
+    def _get_related_django_field(
         drf_field: serializers.PrimaryKeyRelatedField,
-    ) -> PythonDatatypes:
+    ) -> Union[models.Field, None]:
         serializer = drf_field.parent
         django_model = None
         if hasattr(serializer, "Meta") and hasattr(serializer.Meta, "model"):
             django_model = serializer.Meta.model
 
-        if django_model is None:
-            # Fallback python datatype
-            return PythonDatatypes.INT
-
-        if drf_field.field_name is None:
-            return PythonDatatypes.INT
+        if django_model is None or drf_field.field_name is None:
+            return None
 
         forward_django_field = getattr(django_model, drf_field.field_name, None)
         if forward_django_field is None:
-            return PythonDatatypes.INT
+            return None
 
         django_field = getattr(forward_django_field, "field", None)
         if django_field is None:
-            return PythonDatatypes.INT
+            return None
 
         related_model = getattr(django_field, "model", None)
         related_field_names = getattr(django_field, "to_fields", [])
         if related_model is None or len(related_field_names) == 0:
-            return PythonDatatypes.INT
+            return None
 
         related_field_name = related_field_names[0]
         remote_field = getattr(django_field, "remote_field", None)
         if remote_field is None or related_field_name is None:
-            return PythonDatatypes.INT
+            return None
 
         remote_model = getattr(remote_field, "model", None)
         if remote_model is None:
-            return PythonDatatypes.INT
+            return None
 
         deferred_related_field = getattr(remote_model, related_field_name, None)
         if deferred_related_field is None:
-            return PythonDatatypes.INT
+            return None
 
-        related_field = getattr(deferred_related_field, "field")
-        if related_field.__class__ not in django_mappings:
+        return getattr(deferred_related_field, "field")
+
+    @staticmethod
+    def _parse_primary_key_related_field(
+        related_field: Union[models.Field, None],
+    ) -> PythonDatatypes:
+        if related_field is None or related_field.__class__ not in django_mappings:
+            # Fallback python datatype
             return PythonDatatypes.INT
 
         return django_mappings[related_field.__class__]
@@ -162,10 +273,14 @@ class DRFParser(BaseParser[serializers.Serializer, serializers.Field]):
         python_datatype = None
         export_name = None
         nested_serializers = set()
+        related_field = None
+        unique = False
+        min_items, max_items = None, None
 
         if issubclass(drf_field.__class__, serializers.ListSerializer) or isinstance(
             drf_field, serializers.ListField
         ):
+            min_items, max_items = _get_length_bounds(drf_field)
             drf_field = drf_field.child  # type: ignore[attr-defined]
             many = True
 
@@ -181,11 +296,13 @@ class DRFParser(BaseParser[serializers.Serializer, serializers.Field]):
 
         elif isinstance(drf_field, serializers.ChoiceField):
             en, many = _create_enum_from_choices(field_name, drf_field)
+            unique = isinstance(drf_field, serializers.MultipleChoiceField)
             export_name = en.__name__
             self.add_enum(en)
 
         elif isinstance(drf_field, serializers.PrimaryKeyRelatedField):
-            python_datatype = self._parse_primary_key_related_field(drf_field)
+            related_field = self._get_related_django_field(drf_field)
+            python_datatype = self._parse_primary_key_related_field(related_field)
 
         elif isinstance(drf_field, serializers.ReadOnlyField):
             allow_none, python_datatype = self._parse_readonly_field(drf_field)
@@ -200,6 +317,25 @@ class DRFParser(BaseParser[serializers.Serializer, serializers.Field]):
             else:
                 python_datatype = drf_mappings[drf_field.__class__]
 
+        min_value, max_value = None, None
+        if python_datatype == PythonDatatypes.INT:
+            min_value, max_value = _get_int_bounds(drf_field, related_field)
+
+        min_length, max_length = None, None
+        if python_datatype is not None and python_datatype != PythonDatatypes.INT:
+            min_length, max_length = _get_length_bounds(drf_field)
+
+        # Keys of dict fields are always strings, values are untyped unless
+        # a child is given
+        value_field = None
+        if isinstance(drf_field, serializers.DictField) and not isinstance(
+            drf_field.child, _UNTYPED_DICT_CHILD
+        ):
+            value_field, _nested_serializers = self.parse_field(
+                field_name, drf_field.child
+            )
+            nested_serializers.update(_nested_serializers)
+
         return (
             ParsedField(
                 python_datatype=python_datatype,
@@ -208,8 +344,16 @@ class DRFParser(BaseParser[serializers.Serializer, serializers.Field]):
                 required=drf_field.required,
                 allow_none=allow_none,
                 many=many,
+                unique=unique,
                 dump_only=drf_field.read_only,
                 load_only=drf_field.write_only,
+                min_value=min_value,
+                max_value=max_value,
+                min_length=min_length,
+                max_length=max_length,
+                min_items=min_items,
+                max_items=max_items,
+                value_field=value_field,
             ),
             nested_serializers,
         )
@@ -227,12 +371,16 @@ class DRFParser(BaseParser[serializers.Serializer, serializers.Field]):
             return
 
         nested_schemas = set()
-        fields: List[ParsedField] = []
+        parsed_schema = ParsedSchema(
+            name=name,
+            fields=[],
+            kwargs=schema_kwargs,
+            module=serializer.__class__.__module__,
+        )
         for field_name, field in serializer.fields.items():
             parsed_field, _nested_serializers = self.parse_field(field_name, field)
             nested_schemas.update(_nested_serializers)
-            fields.append(parsed_field)
+            parsed_schema.add_field(parsed_field)
 
-        parsed_schema = ParsedSchema(name=name, fields=fields, kwargs=schema_kwargs)
         self.schema_nests[parsed_schema] = nested_schemas
         self.schemas[name] = parsed_schema
@@ -1,10 +1,10 @@
 from inspect import isclass
-from typing import Any, Dict, List, Set, Tuple, Type, Union
+from typing import Any, Dict, Set, Tuple, Type, Union
 
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate
 
 from schema_exporter.parsers.marshmallow_mappings import marshmallow_mappings
-from schema_exporter.types import ParsedField, ParsedSchema
+from schema_exporter.types import ParsedField, ParsedSchema, PythonDatatypes
 
 from .base_parser import BaseParser
 
@@ -24,6 +24,49 @@ except ImportError:
     pass
 
 
+def _get_int_bounds(
+    ma_field: fields.Field,
+) -> Tuple[Union[int, None], Union[int, None]]:
+    """Tightest inclusive bounds of an integer field from its Range validators"""
+    min_value: Union[int, None] = None
+    max_value: Union[int, None] = None
+    for validator in ma_field.validators:
+        if not isinstance(validator, validate.Range):
+            continue
+
+        if isinstance(validator.min, int):
+            low = validator.min + (0 if validator.min_inclusive else 1)
+            min_value = low if min_value is None else max(min_value, low)
+
+        if isinstance(validator.max, int):
+            high = validator.max - (0 if validator.max_inclusive else 1)
+            max_value = high if max_value is None else min(max_value, high)
+
+    return min_value, max_value
+
+
+def _get_length_bounds(
+    ma_field: fields.Field,
+) -> Tuple[Union[int, None], Union[int, None]]:
+    """Tightest inclusive bounds of the length of a string or list from its
+    Length validators"""
+    min_length: Union[int, None] = None
+    max_length: Union[int, None] = None
+    for validator in ma_field.validators:
+        if not isinstance(validator, validate.Length):
+            continue
+
+        low = validator.min if validator.equal is None else validator.equal
+        high = validator.max if validator.equal is None else validator.equal
+        if low is not None:
+            min_length = low if min_length is None else max(min_length, low)
+
+        if high is not None:
+            max_length = high if max_length is None else min(max_length, high)
+
+    return min_length, max_length
+
+
 class MarshmallowParser(BaseParser[Type[Schema], fields.Field]):
     def _get_schema_export_name(
         self,
@@ -35,6 +78,28 @@ class MarshmallowParser(BaseParser[Type[Schema], fields.Field]):
 
         return name
 
+    def get_class_export_name(self, schema_cls: Type[Schema]) -> str:
+        return self._get_schema_export_name(schema_cls)
+
+    @staticmethod
+    def get_declared_nested(schema_cls: Type[Schema]) -> Set[Type[Schema]]:
+        nested = set()
+        for field in schema_cls._declared_fields.values():
+            if isinstance(field, fields.Mapping) and field.value_field is not None:
+                field = field.value_field
+
+            if isinstance(field, fields.List):
+                field = field.inner
+
+            if (
+                isinstance(field, fields.Nested)
+                and isclass(field.nested)
+                and issubclass(field.nested, Schema)
+            ):
+                nested.add(field.nested)
+
+        return nested
+
     def parse_field(
         self, field_name: str, field: fields.Field
     ) -> Tuple[ParsedField, Set[str]]:
@@ -43,8 +108,10 @@ class MarshmallowParser(BaseParser[Type[Schema], fields.Field]):
         python_datatype = None
         export_name = None
         nested_schemas: Set[str] = set()
+        min_items, max_items = None, None
 
         if isinstance(ma_field, fields.List):
+            min_items, max_items = _get_length_bounds(ma_field)
             ma_field = ma_field.inner
             many = True
 
@@ -74,6 +141,23 @@ class MarshmallowParser(BaseParser[Type[Schema], fields.Field]):
                 )
             python_datatype = marshmallow_mappings[ma_field.__class__]
 
+        min_value, max_value = None, None
+        if python_datatype == PythonDatatypes.INT:
+            min_value, max_value = _get_int_bounds(ma_field)
+
+        min_length, max_length = None, None
+        if python_datatype is not None and python_datatype != PythonDatatypes.INT:
+            min_length, max_length = _get_length_bounds(ma_field)
+
+        key_field, value_field = None, None
+        if isinstance(ma_field, fields.Mapping) and ma_field.value_field is not None:
+            value_field, _nested_schemas = self.parse_field(
+                field_name, ma_field.value_field
+            )
+            nested_schemas.update(_nested_schemas)
+            if ma_field.key_field is not None:
+                key_field, _ = self.parse_field(field_name, ma_field.key_field)
+
         return (
             ParsedField(
                 python_datatype=python_datatype,
@@ -84,6 +168,14 @@ class MarshmallowParser(BaseParser[Type[Schema], fields.Field]):
                 many=many,
                 dump_only=ma_field.dump_only,
                 load_only=ma_field.load_only,
+                min_value=min_value,
+                max_value=max_value,
+                min_length=min_length,
+                max_length=max_length,
+                min_items=min_items,
+                max_items=max_items,
+                key_field=key_field,
+                value_field=value_field,
             ),
             nested_schemas,
         )
@@ -99,12 +191,13 @@ class MarshmallowParser(BaseParser[Type[Schema], fields.Field]):
             return
 
         nested_schemas = set()
-        fields: List[ParsedField] = []
+        parsed_schema = ParsedSchema(
+            name=name, fields=[], kwargs=schema_kwargs, module=schema.__module__
+        )
         for field_name, field in schema._declared_fields.items():
             parsed_field, _nested_schemas = self.parse_field(field_name, field)
             nested_schemas.update(_nested_schemas)
-            fields.append(parsed_field)
+            parsed_schema.add_field(parsed_field)
 
-        parsed_schema = ParsedSchema(name=name, fields=fields, kwargs=schema_kwargs)
         self.schema_nests[parsed_schema] = nested_schemas
         self.schemas[name] = parsed_schema
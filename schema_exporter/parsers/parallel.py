@@ -0,0 +1,165 @@
+import multiprocessing
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, List, Set, Tuple, Type, Union
+
+from schema_exporter.types import EnumInfo, ParsedSchema, SchemaInfo
+
+from .base_parser import BaseParser, EnumKey, get_enum_key, is_importable
+
+# Enums created at parse time, such as the ones created from DRF choices,
+# cannot be pickled by reference. They are passed back as name and members.
+_EnumDescription = Union[Type[Enum], Tuple[str, Dict[str, Any]]]
+
+
+@dataclass
+class _ParsedPartition:
+    roots: List[Tuple[int, str]]
+    schemas: Dict[str, ParsedSchema]
+    schema_nests: Dict[str, Set[str]]
+    enums: List[Tuple[_EnumDescription, EnumInfo]]
+
+
+_ForkState = Tuple[
+    Type[BaseParser], List[Tuple[Any, SchemaInfo]], Dict[str, Any], bool, bool, bool
+]
+
+# Set in the parent right before forking, so that workers inherit the
+# registered schemas instead of receiving them pickled
+_fork_state: Union[_ForkState, None] = None
+
+
+def _parse_partition(indices: List[int]) -> _ParsedPartition:
+    assert _fork_state is not None
+    (
+        parser_cls,
+        schemas,
+        default_info_kwargs,
+        strip_schema_keyword,
+        expand_nested,
+        instantiate_schema,
+    ) = _fork_state
+
+    parser = parser_cls(
+        default_info_kwargs=default_info_kwargs,
+        strip_schema_from_name=strip_schema_keyword,
+    )
+
+    roots = list()
+    for i in indices:
+        schema, schema_info = schemas[i]
+        if instantiate_schema:
+            schema = schema()
+
+        parser.parse_and_add_schema(schema, schema_info.kwargs)
+        roots.append((i, parser._get_schema_export_name(schema)))
+
+    # Nests are resolved in the parent, once all partitions are merged
+    if expand_nested:
+        parser.parse_queued()
+
+    enums: List[Tuple[_EnumDescription, EnumInfo]] = list()
+    for en, enum_info in parser.enums.items():
+        if is_importable(en):
+            enums.append((en, enum_info))
+        else:
+            members = {name: m.value for name, m in en._member_map_.items()}
+            enums.append(((en.__name__, members), enum_info))
+
+    return _ParsedPartition(
+        roots=roots,
+        schemas=parser.schemas,
+        schema_nests={s.name: nests for s, nests in parser.schema_nests.items()},
+        enums=enums,
+    )
+
+
+def _merge_partitions(
+    partitions: List[_ParsedPartition], expand_nested: bool
+) -> Tuple[Dict[str, ParsedSchema], Dict[Type[Enum], EnumInfo]]:
+    schemas: Dict[str, ParsedSchema] = dict()
+    schema_nests: Dict[str, Set[str]] = dict()
+
+    def add(partition: _ParsedPartition, name: str) -> None:
+        if name in schemas:
+            return
+
+        schemas[name] = partition.schemas[name]
+        schema_nests[name] = partition.schema_nests[name]
+
+    # Registered schemas first in registration order, as in a serial parse
+    # they are all parsed before any nested schema
+    roots = [(i, name, p) for p in partitions for i, name in p.roots]
+    for _, name, partition in sorted(roots, key=lambda e: e[0]):
+        add(partition, name)
+
+    for partition in partitions:
+        for name in partition.schemas.keys():
+            add(partition, name)
+
+    if expand_nested:
+        for name, nested_schema_names in schema_nests.items():
+            for nested_schema_name in nested_schema_names:
+                schemas[name].nests.add(schemas[nested_schema_name])
+
+    enums: Dict[Type[Enum], EnumInfo] = dict()
+    enum_keys: Dict[EnumKey, Type[Enum]] = dict()
+    for partition in partitions:
+        for description, enum_info in partition.enums:
+            en: Type[Enum]
+            if isinstance(description, tuple):
+                en = Enum(*description)  # type: ignore
+            else:
+                en = description
+
+            enum_key = get_enum_key(en)
+            if enum_key in enum_keys:
+                continue
+
+            enum_keys[enum_key] = en
+            enums[en] = enum_info
+
+    return schemas, enums
+
+
+def parallel_parse(
+    parser_cls: Type[BaseParser],
+    schemas: Dict[Any, SchemaInfo],
+    default_info_kwargs: Dict[str, Any],
+    strip_schema_keyword: bool,
+    expand_nested: bool,
+    instantiate_schema: bool,
+    workers: int,
+) -> Union[Tuple[Dict[str, ParsedSchema], Dict[Type[Enum], EnumInfo]], None]:
+    """Parses registered schemas in forked worker processes. The registered
+    schemas are partitioned between the workers, and the parsed fragments
+    are merged to the same result a serial parse gives.
+
+    Returns None if fork is not available on the platform.
+    """
+    global _fork_state
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return None
+
+    parser_cls.prepare_parallel_parse()
+
+    schema_items = list(schemas.items())
+    workers = min(workers, len(schema_items))
+    partitions = [list(range(len(schema_items)))[i::workers] for i in range(workers)]
+
+    _fork_state = (
+        parser_cls,
+        schema_items,
+        default_info_kwargs,
+        strip_schema_keyword,
+        expand_nested,
+        instantiate_schema,
+    )
+    try:
+        with multiprocessing.get_context("fork").Pool(workers) as pool:
+            parsed_partitions = pool.map(_parse_partition, partitions)
+    finally:
+        _fork_state = None
+
+    return _merge_partitions(parsed_partitions, expand_nested)
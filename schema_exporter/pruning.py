@@ -0,0 +1,105 @@
+from collections import deque
+from fnmatch import fnmatchcase
+from typing import Any, Dict, List, Set, Type, Union
+
+from .parsers.base_parser import BaseParser
+from .types import SchemaInfo
+
+
+def build_nesting_index(
+    parser: BaseParser, schema_classes: List[Type]
+) -> Dict[Type, Set[Type]]:
+    """Adjacency index of the nesting graph reachable from schema_classes,
+    built from declared fields without instantiating any schema"""
+    index: Dict[Type, Set[Type]] = dict()
+    queue = list(schema_classes)
+    while len(queue):
+        schema_cls = queue.pop()
+        if schema_cls in index:
+            continue
+
+        index[schema_cls] = parser.get_declared_nested(schema_cls)
+        queue.extend([cls for cls in index[schema_cls] if cls not in index])
+
+    return index
+
+
+def matches_roots(name: str, roots: List[str]) -> bool:
+    return any([fnmatchcase(name, root) for root in roots])
+
+
+def find_reachable(
+    parser: BaseParser,
+    index: Dict[Type, Set[Type]],
+    roots: List[str],
+    root_classes: Set[Type],
+    max_depth: Union[int, None],
+) -> Dict[Type, int]:
+    """Returns the schema classes reachable from the roots with their depth.
+    Roots may be given as classes, or as names or patterns matched against
+    the class and export names."""
+    depths: Dict[Type, int] = dict()
+    queue: deque = deque()
+    for schema_cls in index.keys():
+        if (
+            schema_cls in root_classes
+            or matches_roots(schema_cls.__name__, roots)
+            or matches_roots(parser.get_class_export_name(schema_cls), roots)
+        ):
+            depths[schema_cls] = 0
+            queue.append(schema_cls)
+
+    while len(queue):
+        schema_cls = queue.popleft()
+        if max_depth is not None and depths[schema_cls] >= max_depth:
+            continue
+
+        for nested_cls in index[schema_cls]:
+            if nested_cls not in depths:
+                depths[nested_cls] = depths[schema_cls] + 1
+                queue.append(nested_cls)
+
+    return depths
+
+
+def parse_reachable(
+    parser: BaseParser,
+    schemas: Dict[Any, SchemaInfo],
+    roots: List[str],
+    root_classes: Set[Type],
+    max_depth: Union[int, None],
+    expand_nested: bool,
+    instantiate_schema: bool,
+) -> None:
+    """Parses only the schemas reachable from the roots. Schemas nested
+    deeper than max_depth are added as opaque types."""
+    registered = list(schemas.keys())
+    index = build_nesting_index(parser, registered)
+    depths = find_reachable(parser, index, roots, root_classes, max_depth)
+
+    # Registered schemas first, so that they are parsed with their own kwargs
+    reachable = [cls for cls in registered if cls in depths]
+    if expand_nested:
+        reachable += sorted(
+            [cls for cls in depths.keys() if cls not in schemas],
+            key=lambda e: (depths[e], e.__name__),
+        )
+
+    for schema_cls in reachable:
+        schema_kwargs = None
+        if schema_cls in schemas:
+            schema_kwargs = schemas[schema_cls].kwargs
+
+        schema = schema_cls() if instantiate_schema else schema_cls
+        parser.parse_and_add_schema(schema, schema_kwargs)
+
+    parser.schemas_to_parse.clear()
+    if not expand_nested:
+        return
+
+    for nested_schema_names in list(parser.schema_nests.values()):
+        for nested_schema_name in nested_schema_names:
+            if nested_schema_name not in parser.schemas:
+                parser.add_opaque_schema(nested_schema_name)
+
+    parser.resolve_nests()
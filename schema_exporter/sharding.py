@@ -0,0 +1,174 @@
+from enum import Enum
+from typing import Any, Callable, Dict, List, Set, Tuple, Type, Union
+
+from .languages.base_language import BaseLanguage
+from .parsers.base_parser import is_importable
+from .types import EnumInfo, ParsedSchema
+
+# Shard for types which have no module of their own and are not used by any
+# schema
+DEFAULT_SHARD = "common"
+
+# Lists the files of the last export, so that files no longer generated are
+# removed
+SHARD_MANIFEST = ".schema_exporter_shards"
+
+ShardBy = Union[str, Callable[[str], str]]
+
+
+def _get_app_label(module: str) -> str:
+    try:
+        from django.apps import apps
+
+        if apps.ready:
+            app_config = apps.get_containing_app_config(module)
+            if app_config is not None:
+                return app_config.label
+    except ImportError:
+        pass
+
+    return module.split(".")[0]
+
+
+def get_shard_name(module: str, shard_by: ShardBy) -> str:
+    if callable(shard_by):
+        name = shard_by(module)
+    elif shard_by == "module":
+        name = module
+    elif shard_by == "app":
+        name = _get_app_label(module)
+    else:
+        raise ValueError(
+            f'shard_by should be "module", "app" or a callable, was: {shard_by}'
+        )
+
+    return name.replace(".", "_").replace("-", "_")
+
+
+def get_type_shards(
+    schemas: List[ParsedSchema],
+    enums_list: List[Tuple[Type[Enum], EnumInfo]],
+    shard_by: ShardBy,
+) -> Dict[str, str]:
+    """Maps names of exported types to the shard they are written in"""
+    type_shards: Dict[str, str] = dict()
+    for schema in schemas:
+        if schema.module is not None:
+            type_shards[schema.name] = get_shard_name(schema.module, shard_by)
+
+    for en, _ in enums_list:
+        if is_importable(en):
+            type_shards[en.__name__] = get_shard_name(en.__module__, shard_by)
+
+    # Types without a module, such as enums created from choices, are
+    # written next to the first schema using them
+    for schema in schemas:
+        shard = type_shards.get(schema.name, DEFAULT_SHARD)
+        for field in schema.fields:
+            for name in field.get_references():
+                if name not in type_shards:
+                    type_shards[name] = shard
+
+    for schema in schemas:
+        if schema.name not in type_shards:
+            type_shards[schema.name] = DEFAULT_SHARD
+
+    for en, _ in enums_list:
+        if en.__name__ not in type_shards:
+            type_shards[en.__name__] = DEFAULT_SHARD
+
+    return type_shards
+
+
+def export_shards(
+    lng_class: Type[BaseLanguage],
+    schemas: List[ParsedSchema],
+    enums_list: List[Tuple[Type[Enum], EnumInfo]],
+    shard_by: ShardBy,
+    include_dump_only: bool,
+    include_load_only: bool,
+    language_options: Union[Dict[str, Any], None] = None,
+) -> Dict[str, str]:
+    """Exports each shard into its own file, importing the types it uses
+    from other shards. Returns the contents by file name, including the
+    index file tying the shards together."""
+    type_shards = get_type_shards(schemas, enums_list, shard_by)
+
+    shard_schemas: Dict[str, List[ParsedSchema]] = dict()
+    shard_enums: Dict[str, List[Tuple[Type[Enum], EnumInfo]]] = dict()
+    for schema in schemas:
+        shard = type_shards[schema.name]
+        shard_schemas.setdefault(shard, []).append(schema)
+        shard_enums.setdefault(shard, [])
+
+    for en, enum_info in enums_list:
+        shard = type_shards[en.__name__]
+        shard_enums.setdefault(shard, []).append((en, enum_info))
+        shard_schemas.setdefault(shard, [])
+
+    # Helper types depend on the types of other shards, such as structs
+    # nesting borrowed structs, so they are found from the whole export
+    helpers = lng_class(
+        schemas=schemas, enums=enums_list, options=language_options
+    ).get_shard_helpers(include_dump_only, include_load_only)
+    symbols: Dict[str, str] = dict()
+    for name, shard in type_shards.items():
+        symbols[name] = shard
+        for helper in helpers.get(name, []):
+            symbols[helper] = shard
+
+    files: Dict[str, str] = dict()
+    for shard in sorted(shard_schemas.keys()):
+        exporter = lng_class(
+            schemas=shard_schemas[shard],
+            enums=shard_enums[shard],
+            options=language_options,
+        )
+        exporter.set_shard_helpers(helpers)
+
+        # Types referenced from other shards, by shard
+        shard_imports: Dict[str, Set[str]] = dict()
+        for schema in shard_schemas[shard]:
+            for field in schema.fields:
+                if not include_dump_only and field.dump_only:
+                    continue
+
+                if not include_load_only and field.load_only:
+                    continue
+
+                for name in exporter.get_field_imports(
+                    field, include_dump_only, include_load_only
+                ):
+                    other_shard = symbols.get(name)
+                    if other_shard is not None and other_shard != shard:
+                        shard_imports.setdefault(other_shard, set()).add(name)
+
+        output = list()
+        if len(shard_imports):
+            output.append(exporter.format_shard_imports(shard_imports))
+
+        output.append(
+            exporter.export(
+                include_dump_only=include_dump_only,
+                include_load_only=include_load_only,
+            )
+        )
+        files[f"{shard}.{exporter.file_extension}"] = "\n".join(output)
+        files.update(exporter.format_extra_files())
+
+    # Types declared in each shard with their helpers, for the index
+    shard_names: Dict[str, List[str]] = dict()
+    for shard in sorted(shard_schemas.keys()):
+        names = [en.__name__ for en, _ in shard_enums[shard]]
+        names += [schema.name for schema in shard_schemas[shard]]
+        shard_names[shard] = [
+            symbol for name in names for symbol in [name] + helpers.get(name, [])
+        ]
+
+    # Options such as the package apply to the index as well
+    index_name, index_content = lng_class(
+        schemas=[], enums=[], options=language_options
+    ).format_shard_index(shard_names)
+    files[index_name] = index_content
+
+    return files
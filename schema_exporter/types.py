@@ -2,7 +2,7 @@ import dataclasses
 import uuid
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 
 class PythonDatatypes(Enum):
@@ -40,6 +40,9 @@ class PythonDatatypes(Enum):
 class Mapping:
     mapping: str
     imports: Optional[Union[List[str], Dict[str, List[str]]]] = None
+    # Module converting the type to its wire representation, for languages
+    # which serialize through such adapters
+    serde_with: Union[str, None] = None
 
 
 @dataclass
@@ -50,8 +53,36 @@ class ParsedField:
     required: bool = False
     allow_none: bool = False
     many: bool = False
+    unique: bool = False  # Items of a many field form a set, such as choices
     dump_only: bool = False
     load_only: bool = False
+    # Inclusive bounds of integer fields, when known from the field class or
+    # its validators
+    min_value: Union[int, None] = None
+    max_value: Union[int, None] = None
+    # Inclusive bounds of the length of strings and of the number of items in
+    # lists, when known from the field or its validators
+    min_length: Union[int, None] = None
+    max_length: Union[int, None] = None
+    min_items: Union[int, None] = None
+    max_items: Union[int, None] = None
+    # Keys and values of dicts with typed entries. Keys are strings when only
+    # the values are typed.
+    key_field: Union["ParsedField", None] = None
+    value_field: Union["ParsedField", None] = None
+
+    def walk(self) -> Iterator["ParsedField"]:
+        """The field followed by the keys and values of its entries, and of
+        theirs"""
+        yield self
+        for entry_field in (self.key_field, self.value_field):
+            if entry_field is not None:
+                yield from entry_field.walk()
+
+    def get_references(self) -> List[str]:
+        """Names of the schemas and enums referenced by the field or by its
+        entries"""
+        return [f.export_name for f in self.walk() if f.export_name is not None]
 
 
 @dataclass
@@ -62,11 +93,56 @@ class ParsedSchema:
     nested_by: Set["ParsedSchema"] = dataclasses.field(default_factory=set)
     ordering: int = 0
     kwargs: Dict[str, Any] = dataclasses.field(default_factory=dict)
+    opaque: bool = False  # Exported as an opaque type without fields
+    module: Union[str, None] = None  # Python module the schema is defined in
+    alias_of: Union[str, None] = None  # Exported as an alias of the named schema
+    base: Union[str, None] = None  # Schema whose fields this schema extends
+    # Datatypes of fields, keyed by the (dump_only, load_only) flags of the
+    # fields, so that languages need not rescan the fields of each variant
+    field_datatypes: Dict[Tuple[bool, bool], Set[PythonDatatypes]] = dataclasses.field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
     _uuid = uuid.uuid4()
 
+    def __post_init__(self):
+        for field in self.fields:
+            self._record_field(field)
+
     def __hash__(self):
         return hash(self._uuid)
 
+    def _record_field(self, field: ParsedField) -> None:
+        variant = (field.dump_only, field.load_only)
+        for f in field.walk():
+            # Dicts with typed entries are exported from the types of their
+            # keys and values
+            if f.python_datatype is None or f.value_field is not None:
+                continue
+
+            if variant not in self.field_datatypes:
+                self.field_datatypes[variant] = set()
+
+            self.field_datatypes[variant].add(f.python_datatype)
+
+    def add_field(self, field: ParsedField) -> None:
+        self.fields.append(field)
+        self._record_field(field)
+
+    def get_field_datatypes(
+        self, include_dump_only: bool, include_load_only: bool
+    ) -> Set[PythonDatatypes]:
+        datatypes: Set[PythonDatatypes] = set()
+        for (dump_only, load_only), variant_datatypes in self.field_datatypes.items():
+            if not include_dump_only and dump_only:
+                continue
+
+            if not include_load_only and load_only:
+                continue
+
+            datatypes.update(variant_datatypes)
+
+        return datatypes
+
 
 @dataclass
 class SchemaInfo:
@@ -13,7 +13,7 @@ def pytest_configure():
             }
         },
         MIDDLEWARE=("django.middleware.common.CommonMiddleware",),
-        INSTALLED_APPS=("rest_framework",),
+        INSTALLED_APPS=("rest_framework", "schema_exporter.contrib.django"),
     )
 
     django.setup()
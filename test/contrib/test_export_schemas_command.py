@@ -0,0 +1,105 @@
+import tempfile
+import unittest
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+from rest_framework import serializers
+
+from schema_exporter import _get_export, export_drf_serializer
+
+NAMESPACE = "command_test"
+
+
+class CommandLeafSerializer(serializers.Serializer):
+    int_1 = serializers.IntegerField()
+
+
+@export_drf_serializer(namespace=NAMESPACE)
+class CommandRootSerializer(serializers.Serializer):
+    leaf = CommandLeafSerializer()
+    choice = serializers.ChoiceField(choices=[("A", "a"), ("B", "b")])
+
+
+class ExportSchemasCommandTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.targets = [
+            {
+                "export_to": Path(self.tmp_dir.name) / "out.ts",
+                "language": "typescript",
+                "namespace": NAMESPACE,
+            },
+            {
+                "export_to": Path(self.tmp_dir.name) / "out.rs",
+                "language": "rust",
+                "namespace": NAMESPACE,
+            },
+        ]
+
+    def expected(self, language: str) -> str:
+        return _get_export(
+            language=language,
+            namespace=NAMESPACE,
+            include_dump_only=True,
+            include_load_only=True,
+            strip_schema_keyword=True,
+            expand_nested=True,
+            ordered_output=True,
+        )
+
+    def call(self, *args) -> str:
+        out = StringIO()
+        with override_settings(SCHEMA_EXPORTER_TARGETS=self.targets):
+            call_command("export_schemas", *args, stdout=out)
+
+        return out.getvalue()
+
+    def assert_exported(self) -> None:
+        with open(self.targets[0]["export_to"]) as f:
+            self.assertEqual(f.read(), self.expected("typescript"))
+
+        with open(self.targets[1]["export_to"]) as f:
+            self.assertEqual(f.read(), self.expected("rust"))
+
+    def test_export(self):
+        out = self.call()
+        self.assert_exported()
+        self.assertIn("parse cache hits: 1/2", out)
+
+    def test_export_parallel(self):
+        self.targets.append(
+            {
+                "export_to": Path(self.tmp_dir.name) / "out_no_nested.ts",
+                "language": "typescript",
+                "namespace": NAMESPACE,
+                "expand_nested": False,
+            }
+        )
+        self.call("--parallel", "2")
+        self.assert_exported()
+        self.assertTrue(self.targets[2]["export_to"].exists())
+
+    def test_check(self):
+        with self.assertRaises(CommandError):
+            self.call("--check")
+
+        self.assertFalse(self.targets[0]["export_to"].exists())
+
+        self.call()
+        out = self.call("--check")
+        self.assertIn("up to date", out)
+
+        with open(self.targets[1]["export_to"], "w") as f:
+            f.write("")
+
+        with self.assertRaises(CommandError):
+            self.call("--check")
+
+    def test_no_targets(self):
+        self.targets = []
+        with self.assertRaises(CommandError):
+            self.call()
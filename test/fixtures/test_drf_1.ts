@@ -1,7 +1,7 @@
 export enum TestEnum1 {
-  A = "a",
-  B = "b",
-  C = "c",
+  A = "A",
+  B = "B",
+  C = "C",
 }
 
 export interface Leaf {
@@ -12,8 +12,17 @@ class BaseParserTests(unittest.TestCase):
             "required": False,
             "allow_none": False,
             "many": False,
+            "unique": False,
             "dump_only": False,
             "load_only": False,
+            "min_value": None,
+            "max_value": None,
+            "min_length": None,
+            "max_length": None,
+            "min_items": None,
+            "max_items": None,
+            "key_field": None,
+            "value_field": None,
         }
         args.update(expected)
         for key, value in args.items():
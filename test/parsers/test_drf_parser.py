@@ -1,3 +1,4 @@
+from django.core.validators import MaxValueValidator
 from rest_framework import serializers
 
 from schema_exporter.parsers.drf_parser import DRFParser, _create_enum_from_choices
@@ -27,7 +28,7 @@ class DRFParserTests(BaseParserTests):
         self.assertEqual(en.__name__, "TestField")
         self.assertDictEqual(
             {key: val.value for key, val in en._member_map_.items()},
-            {"A": "a", "B": "b", "C": "c"},
+            {"A": "A", "B": "B", "C": "C"},
         )
 
     def test_parse_enum_multiple(self):
@@ -40,7 +41,7 @@ class DRFParserTests(BaseParserTests):
         self.assertEqual(en.__name__, "TestField")
         self.assertDictEqual(
             {key: val.value for key, val in en._member_map_.items()},
-            {"A": "a", "B": "b", "C": "c"},
+            {"A": "A", "B": "B", "C": "C"},
         )
 
     def test_parse_enum_list(self):
@@ -78,6 +79,7 @@ class DRFParserTests(BaseParserTests):
                 "field_name": "field",
                 "required": True,
                 "many": True,
+                "unique": True,
             },
         )
 
@@ -155,5 +157,54 @@ class DRFParserTests(BaseParserTests):
             },
         )
 
+    def test_parse_dict_field(self):
+        field = serializers.DictField(child=FooSerializer())
+        parsed, nested = self.parser_default.parse_field("field", field)
+        self.assertEqual(parsed.python_datatype, PythonDatatypes.DICT)
+        self.assertIsNone(parsed.key_field)
+        self.assert_parsed_field(
+            parsed.value_field,
+            {"export_name": "Foo", "field_name": "field", "required": True},
+        )
+        self.assertTrue("Foo" in nested)
+
+        # Without a child the values are untyped
+        parsed = self.parser_default.parse_field("field", serializers.DictField())[0]
+        self.assertIsNone(parsed.value_field)
+
+    def test_parse_int_bounds(self):
+        field = serializers.IntegerField(
+            min_value=0, validators=[MaxValueValidator(1000), MaxValueValidator(100)]
+        )
+        parsed = self.parser_default.parse_field("field", field)[0]
+        self.assert_parsed_field(
+            parsed,
+            {
+                "python_datatype": PythonDatatypes.INT,
+                "field_name": "field",
+                "required": True,
+                "min_value": 0,
+                "max_value": 100,
+            },
+        )
+
+    def test_parse_length_bounds(self):
+        field = serializers.ListField(
+            child=serializers.CharField(min_length=2, max_length=3), max_length=10
+        )
+        parsed = self.parser_default.parse_field("field", field)[0]
+        self.assert_parsed_field(
+            parsed,
+            {
+                "python_datatype": PythonDatatypes.STRING,
+                "field_name": "field",
+                "required": True,
+                "many": True,
+                "min_length": 2,
+                "max_length": 3,
+                "max_items": 10,
+            },
+        )
+
 
 # TODO: Tester for nested fields, slug fields, whole schema
@@ -1,6 +1,6 @@
 from enum import Enum
 
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate
 from marshmallow_enum import EnumField
 
 from schema_exporter.parsers.marshmallow_mappings import marshmallow_mappings
@@ -121,6 +121,43 @@ class MarshmallowParserTests(BaseParserTests):
     def test_get_schema_name_strip_schema(self):
         self.assertEqual(self.parser_default._get_schema_export_name(FooSchema), "Foo")
 
+    def test_parse_int_bounds(self):
+        field = fields.Integer(
+            validate=[
+                validate.Range(min=0, max=256, max_inclusive=False),
+                validate.Range(min=-10),
+            ]
+        )
+        parsed = self.parser_default.parse_field("field", field)[0]
+        self.assert_parsed_field(
+            parsed,
+            {
+                "python_datatype": PythonDatatypes.INT,
+                "field_name": "field",
+                "min_value": 0,
+                "max_value": 255,
+            },
+        )
+
+    def test_parse_length_bounds(self):
+        field = fields.List(
+            fields.String(validate=validate.Length(equal=2)),
+            validate=validate.Length(min=1, max=5),
+        )
+        parsed = self.parser_default.parse_field("field", field)[0]
+        self.assert_parsed_field(
+            parsed,
+            {
+                "python_datatype": PythonDatatypes.STRING,
+                "field_name": "field",
+                "many": True,
+                "min_length": 2,
+                "max_length": 2,
+                "min_items": 1,
+                "max_items": 5,
+            },
+        )
+
     def test_parse_read_only_field(self):
         field = fields.Integer(dump_only=True)
         parsed = self.parser_default.parse_field("field", field)[0]
@@ -206,6 +243,28 @@ class MarshmallowParserTests(BaseParserTests):
             },
         )
 
+    def test_parse_dict_field(self):
+        field = fields.Dict(
+            keys=fields.Integer(), values=fields.List(fields.Nested(FooSchema))
+        )
+        parsed, nested = self.parser_default.parse_field("field", field)
+        self.assertEqual(parsed.python_datatype, PythonDatatypes.DICT)
+        self.assert_parsed_field(
+            parsed.key_field,
+            {"python_datatype": PythonDatatypes.INT, "field_name": "field"},
+        )
+        self.assert_parsed_field(
+            parsed.value_field,
+            {"export_name": "Foo", "field_name": "field", "many": True},
+        )
+        self.assertEqual(parsed.get_references(), ["Foo"])
+        self.assertTrue("Foo" in nested)
+
+        parsed = self.parser_default.parse_field("field", fields.Dict())[0]
+        self.assert_parsed_field(
+            parsed, {"python_datatype": PythonDatatypes.DICT, "field_name": "field"}
+        )
+
     def test_parse_basic_schema(self):
         self.parser_default.parse_and_add_schema(BasicSchema, {})
         parsed_schemas = list(self.parser_default.schemas.values())
@@ -24,6 +24,12 @@ class IntModel(TestModel):
     int_field = models.IntegerField()
 
 
+class SmallIntModel(TestModel):
+    small = models.SmallIntegerField()
+    positive_small = models.PositiveSmallIntegerField()
+    positive = models.PositiveIntegerField()
+
+
 class IntNestedModel(TestModel):
     child = models.ForeignKey(IntModel, on_delete=models.CASCADE, null=False)
 
@@ -87,6 +93,12 @@ class IntSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class SmallIntSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SmallIntModel
+        fields = ("small", "positive_small", "positive")
+
+
 class IntNestedSerializer(serializers.ModelSerializer):
     class Meta:
         model = IntNestedModel
@@ -136,9 +148,19 @@ class ModelSerializerTestCase(BaseParserTests):
                 "field_name": "int_field",
                 "required": True,
                 "python_datatype": PythonDatatypes.INT,
+                "min_value": -(2**31),
+                "max_value": 2**31 - 1,
             },
         )
 
+    def test_parse_small_int_serializer(self):
+        self.parser.parse_and_add_schema(SmallIntSerializer())
+        parsed_schema = self.parser.schemas["SmallInt"]
+        self.assertEqual(
+            [(f.min_value, f.max_value) for f in parsed_schema.fields],
+            [(-(2**15), 2**15 - 1), (0, 2**15 - 1), (0, 2**31 - 1)],
+        )
+
     def test_parse_string_primary_key_serializer(self):
         self.parser.parse_and_add_schema(StringPrimaryKeySerializer())
         parsed_schema = self.parser.schemas["StringPrimaryKey"]
@@ -168,6 +190,8 @@ class ModelSerializerTestCase(BaseParserTests):
                 "required": True,
                 "python_datatype": PythonDatatypes.INT,
                 "dump_only": False,
+                "min_value": -(2**31),
+                "max_value": 2**31 - 1,
             },
         )
 
@@ -0,0 +1,73 @@
+import unittest
+
+from rest_framework import serializers
+
+from schema_exporter import _get_export, export_drf_serializer
+from schema_exporter.parsers.drf_parser import DRFParser
+
+NAMESPACE = "parallel_test"
+
+
+class ParallelLeafSerializer(serializers.Serializer):
+    int_1 = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=[("A", "a"), ("B", "b")])
+
+
+class ParallelMiddleSerializer(serializers.Serializer):
+    leaf = ParallelLeafSerializer()
+    leaves = ParallelLeafSerializer(many=True)
+
+
+@export_drf_serializer(namespace=NAMESPACE)
+class ParallelRoot1Serializer(serializers.Serializer):
+    middle = ParallelMiddleSerializer()
+    status = serializers.ChoiceField(choices=[("A", "a"), ("B", "b")])
+
+
+@export_drf_serializer(namespace=NAMESPACE)
+class ParallelRoot2Serializer(serializers.Serializer):
+    leaf = ParallelLeafSerializer(required=False)
+    kinds = serializers.MultipleChoiceField(choices=[("X", "x"), ("Y", "y")])
+
+
+@export_drf_serializer(namespace=NAMESPACE)
+class ParallelRoot3Serializer(serializers.Serializer):
+    root_1 = ParallelRoot1Serializer()
+    root_2 = ParallelRoot2Serializer(many=True)
+
+
+@export_drf_serializer(namespace=NAMESPACE)
+class ParallelRoot4Serializer(serializers.Serializer):
+    middle = ParallelMiddleSerializer(allow_null=True)
+
+
+def get_export(language: str, parse_workers: int, expand_nested: bool = True) -> str:
+    return _get_export(
+        language=language,
+        namespace=NAMESPACE,
+        include_dump_only=True,
+        include_load_only=True,
+        strip_schema_keyword=True,
+        expand_nested=expand_nested,
+        ordered_output=True,
+        parse_workers=parse_workers,
+    )
+
+
+class ParallelParseTests(unittest.TestCase):
+    def test_parallel_equals_serial(self):
+        for language in ("typescript", "rust"):
+            for expand_nested in (True, False):
+                serial = get_export(language, 1, expand_nested)
+                for workers in (2, 3, 8):
+                    self.assertEqual(
+                        get_export(language, workers, expand_nested), serial
+                    )
+
+    def test_identical_choice_enums_deduped(self):
+        parser = DRFParser(default_info_kwargs=dict())
+        parser.parse_and_add_schema(ParallelRoot1Serializer())
+        parser.parse_nested()
+
+        self.assertEqual(len(parser.enums), 1)
+        self.assertEqual(list(parser.enums.keys())[0].__name__, "Status")
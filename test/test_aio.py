@@ -0,0 +1,122 @@
+import asyncio
+import multiprocessing
+import os
+import stat
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from marshmallow import Schema, fields
+
+from schema_exporter import _get_export, export_marshmallow_schema
+from schema_exporter.aio import AsyncExporter, export_mappings_async
+
+NAMESPACE = "aio_test"
+
+
+class AioLeafSchema(Schema):
+    int_1 = fields.Integer(required=True)
+
+
+@export_marshmallow_schema(namespace=NAMESPACE)
+class AioRootSchema(Schema):
+    leaf = fields.Nested(AioLeafSchema)
+
+
+def sync_export(language: str, **kwargs) -> str:
+    return _get_export(
+        language=language,
+        namespace=NAMESPACE,
+        include_dump_only=True,
+        include_load_only=True,
+        strip_schema_keyword=True,
+        expand_nested=True,
+        ordered_output=True,
+        **kwargs,
+    )
+
+
+class AioTests(unittest.IsolatedAsyncioTestCase):
+    async def test_export_mappings_async(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            export_to = Path(tmp_dir) / "out.rs"
+            await export_mappings_async(export_to, "rust", namespace=NAMESPACE)
+
+            with open(export_to) as f:
+                self.assertEqual(f.read(), sync_export("rust"))
+
+    async def test_file_mode(self):
+        umask = os.umask(0)
+        os.umask(umask)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            export_to = Path(tmp_dir) / "out.rs"
+            await export_mappings_async(export_to, "rust", namespace=NAMESPACE)
+            self.assertEqual(stat.S_IMODE(export_to.stat().st_mode), 0o666 & ~umask)
+
+            # Replaced files keep their mode
+            export_to.chmod(0o640)
+            await export_mappings_async(export_to, "rust", namespace=NAMESPACE)
+            self.assertEqual(stat.S_IMODE(export_to.stat().st_mode), 0o640)
+
+    async def test_export_options(self):
+        options = {"ts_validators": "guard"}
+        exporter = AsyncExporter()
+        with mock.patch("schema_exporter.aio._get_export", wraps=_get_export) as m:
+            results = await asyncio.gather(
+                exporter.get_export(
+                    "typescript", namespace=NAMESPACE, language_options=options
+                ),
+                exporter.get_export(
+                    "typescript", namespace=NAMESPACE, language_options=dict(options)
+                ),
+                exporter.get_export("typescript", namespace=NAMESPACE),
+            )
+
+        # Equal options are coalesced, other options are a different export
+        self.assertEqual(m.call_count, 2)
+        self.assertEqual(
+            results[0], sync_export("typescript", language_options=options)
+        )
+        self.assertEqual(results[1], results[0])
+        self.assertEqual(results[2], sync_export("typescript"))
+        self.assertNotEqual(results[2], results[0])
+
+    async def test_coalesce_same_export(self):
+        exporter = AsyncExporter(max_concurrency=2)
+        with mock.patch("schema_exporter.aio._get_export", wraps=_get_export) as m:
+            results = await asyncio.gather(
+                exporter.get_export("typescript", namespace=NAMESPACE),
+                exporter.get_export("typescript", namespace=NAMESPACE),
+                exporter.get_export("rust", namespace=NAMESPACE),
+            )
+
+        self.assertEqual(m.call_count, 2)
+        self.assertEqual(results[0], sync_export("typescript"))
+        self.assertEqual(results[1], sync_export("typescript"))
+        self.assertEqual(results[2], sync_export("rust"))
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(),
+        "workers must inherit the registered schemas",
+    )
+    async def test_process_pool(self):
+        executor = ProcessPoolExecutor(
+            max_workers=2, mp_context=multiprocessing.get_context("fork")
+        )
+        exporter = AsyncExporter(max_concurrency=2, executor=executor)
+        try:
+            results = await asyncio.gather(
+                exporter.get_export("typescript", namespace=NAMESPACE),
+                exporter.get_export("rust", namespace=NAMESPACE),
+            )
+        finally:
+            executor.shutdown()
+
+        self.assertEqual(results[0], sync_export("typescript"))
+        self.assertEqual(results[1], sync_export("rust"))
+
+    async def test_invalid_max_concurrency(self):
+        with self.assertRaises(ValueError):
+            AsyncExporter(max_concurrency=0)
@@ -0,0 +1,106 @@
+import unittest
+from enum import Enum
+
+from schema_exporter.languages import Arrow
+from schema_exporter.types import EnumInfo, ParsedField, ParsedSchema, PythonDatatypes
+
+from .common import TestEnum, TestEnumAuto, test_schema
+
+TEST_SCHEMA_ARROW = """Test = pa.struct(
+    [
+        pa.field("load_only", pa.int64()),
+        pa.field("dump_only", pa.int64()),
+        pa.field("required", pa.int64(), nullable=False),
+        pa.field("allow_none", pa.int64()),
+        pa.field("required_allow_none", pa.int64()),
+        pa.field("nested", Nested),
+        pa.field("nested_many", pa.list_(Nested)),
+        pa.field("enum_field", TestEnum),
+        pa.field("datetime_field", pa.timestamp("us", tz="UTC")),
+        pa.field("uuid_field", pa.string()),
+    ]
+)
+"""
+
+
+class ArrowTests(unittest.TestCase):
+    def test_basic(self):
+        nested = ParsedSchema(name="Nested", fields=[])
+        exp = Arrow(
+            [nested, test_schema],
+            [(TestEnum, EnumInfo()), (TestEnumAuto, EnumInfo())],
+        ).export(True, True)
+
+        self.assertTrue(exp.startswith("import pyarrow as pa\n"))
+        self.assertIn("TestEnum = pa.dictionary(pa.int8(), pa.string())\n", exp)
+        self.assertIn("TestEnumAuto = pa.dictionary(pa.int8(), pa.int64())\n", exp)
+        self.assertIn("Nested = pa.struct([])\n", exp)
+        self.assertIn(TEST_SCHEMA_ARROW, exp)
+        compile(exp, "arrow_export.py", "exec")
+
+    def test_large_enum(self):
+        LargeEnum = Enum("LargeEnum", {f"V{i}": f"v{i}" for i in range(200)})
+        exporter = Arrow([], [])
+        self.assertEqual(
+            exporter.format_enum(LargeEnum, EnumInfo()),
+            "LargeEnum = pa.dictionary(pa.int16(), pa.string())\n",
+        )
+
+    def test_bases_and_aliases(self):
+        base = ParsedSchema(
+            name="Base",
+            fields=[
+                ParsedField(
+                    python_datatype=PythonDatatypes.INT,
+                    export_name=None,
+                    field_name="id",
+                    required=True,
+                )
+            ],
+        )
+        child = ParsedSchema(
+            name="Child",
+            fields=[
+                ParsedField(
+                    python_datatype=PythonDatatypes.STRING,
+                    export_name=None,
+                    field_name="name",
+                )
+            ],
+            base="Base",
+        )
+        alias = ParsedSchema(name="Alias", fields=[], alias_of="Child")
+        opaque = ParsedSchema(name="Opaque", fields=[], opaque=True)
+        exp = Arrow([base, child, alias, opaque], []).export(True, True)
+
+        self.assertIn(
+            "Child = pa.struct(\n"
+            "    [\n"
+            "        *Base,\n"
+            '        pa.field("name", pa.string()),\n'
+            "    ]\n"
+            ")\n",
+            exp,
+        )
+        self.assertIn("Alias = Child\n", exp)
+        self.assertIn("Opaque = pa.string()  # JSON text\n", exp)
+        compile(exp, "arrow_export.py", "exec")
+
+    def test_typed_dicts(self):
+        typed = ParsedSchema(
+            name="Typed",
+            fields=[
+                ParsedField(
+                    python_datatype=PythonDatatypes.DICT,
+                    export_name=None,
+                    field_name="scores",
+                    value_field=ParsedField(
+                        python_datatype=PythonDatatypes.INT,
+                        export_name=None,
+                        field_name="scores",
+                    ),
+                )
+            ],
+        )
+        exp = Arrow([typed], []).export(True, True)
+        self.assertIn('pa.field("scores", pa.map_(pa.string(), pa.int64())),', exp)
@@ -0,0 +1,212 @@
+import random
+import unittest
+
+from marshmallow import Schema, fields
+
+from schema_exporter import (
+    _get_export,
+    _order_export,
+    _parse_namespace,
+    export_marshmallow_schema,
+    get_dedup_report,
+)
+from schema_exporter.dedup import DedupReport, deduplicate, extract_bases
+from schema_exporter.languages import Typescript
+from schema_exporter.types import ParsedField, ParsedSchema, PythonDatatypes
+
+NAMESPACE = "dedup_test"
+
+
+class DedupAddressSchema(Schema):
+    street = fields.String(required=True)
+
+
+class DedupOtherAddressSchema(Schema):
+    street = fields.String(required=True)
+
+
+@export_marshmallow_schema(namespace=NAMESPACE)
+class DedupUserReadSchema(Schema):
+    id = fields.Integer(required=True)
+    name = fields.String(required=True)
+    address = fields.Nested(DedupAddressSchema)
+
+
+# Only differs by nesting a schema identical to the one above
+@export_marshmallow_schema(namespace=NAMESPACE)
+class DedupUserWriteSchema(Schema):
+    id = fields.Integer(required=True)
+    name = fields.String(required=True)
+    address = fields.Nested(DedupOtherAddressSchema)
+
+
+@export_marshmallow_schema(namespace=NAMESPACE)
+class DedupUserDetailSchema(Schema):
+    id = fields.Integer(required=True)
+    name = fields.String(required=True)
+    email = fields.Email()
+    secret = fields.String(dump_only=True)
+
+
+@export_marshmallow_schema(namespace=NAMESPACE)
+class DedupUserListSchema(Schema):
+    id = fields.Integer(required=True)
+    name = fields.String(required=True)
+    email = fields.Email(required=True)
+
+
+@export_marshmallow_schema(namespace=NAMESPACE)
+class DedupProductSchema(Schema):
+    id = fields.Integer(required=True)
+    name = fields.String(required=True)
+    price = fields.Float()
+
+
+def parse():
+    schemas, enums = _parse_namespace(
+        namespace=NAMESPACE, strip_schema_keyword=True, expand_nested=True
+    )
+    return _order_export(schemas, enums, ordered_output=True)
+
+
+class DedupTests(unittest.TestCase):
+    def test_aliases(self):
+        schemas, _ = parse()
+        deduplicated, report = deduplicate(
+            schemas, Typescript.get_field_shape, True, True
+        )
+
+        self.assertEqual(
+            report.aliases,
+            {"DedupOtherAddress": "DedupAddress", "DedupUserWrite": "DedupUserRead"},
+        )
+        self.assertEqual([s.name for s in deduplicated], [s.name for s in schemas])
+        self.assertTrue(all([s.alias_of is None for s in schemas]))
+
+    def test_variant_aliases(self):
+        schemas, _ = parse()
+        _, report = deduplicate(schemas, Typescript.get_field_shape, False, True)
+        self.assertNotIn("DedupUserDetail", report.aliases)
+
+        schemas[[s.name for s in schemas].index("DedupUserDetail")].fields[
+            2
+        ].required = True
+        _, report = deduplicate(schemas, Typescript.get_field_shape, False, True)
+        self.assertEqual(report.aliases["DedupUserList"], "DedupUserDetail")
+
+    def test_typescript_export(self):
+        exp = _get_export(
+            language="typescript",
+            namespace=NAMESPACE,
+            include_dump_only=True,
+            include_load_only=True,
+            strip_schema_keyword=True,
+            expand_nested=True,
+            ordered_output=True,
+            deduplicate=True,
+        )
+        self.assertIn("export type DedupOtherAddress = DedupAddress\n", exp)
+        self.assertIn("export type DedupUserWrite = DedupUserRead\n", exp)
+        self.assertEqual(exp.count("export interface"), 5)
+
+    def test_extract_bases(self):
+        exp = _get_export(
+            language="typescript",
+            namespace=NAMESPACE,
+            include_dump_only=True,
+            include_load_only=True,
+            strip_schema_keyword=True,
+            expand_nested=True,
+            ordered_output=True,
+            deduplicate=True,
+            extract_bases=2,
+        )
+        self.assertIn(
+            "export interface DedupProductBase {\n"
+            "  id: number\n"
+            "  name: string\n"
+            "}\n",
+            exp,
+        )
+        self.assertIn(
+            "export interface DedupProduct extends DedupProductBase {\n"
+            "  price?: number\n"
+            "}\n",
+            exp,
+        )
+        self.assertIn(
+            "export interface DedupUserRead extends DedupProductBase {\n"
+            "  address?: DedupAddress\n"
+            "}\n",
+            exp,
+        )
+
+    def test_extract_bases_rust(self):
+        exp = _get_export(
+            language="rust",
+            namespace=NAMESPACE,
+            include_dump_only=True,
+            include_load_only=True,
+            strip_schema_keyword=True,
+            expand_nested=True,
+            ordered_output=True,
+            deduplicate=True,
+            extract_bases=2,
+        )
+        self.assertIn(
+            "pub struct DedupProduct {\n"
+            "    #[serde(flatten)]\n"
+            "    pub base: DedupProductBase,\n"
+            "    pub price: Option<f64>,\n"
+            "}\n",
+            exp,
+        )
+        self.assertIn("pub type DedupUserWrite = DedupUserRead;\n", exp)
+
+    def test_report(self):
+        report = get_dedup_report("typescript", namespace=NAMESPACE)
+        self.assertEqual(len(report.aliases), 2)
+        self.assertGreater(report.bytes_saved, 0)
+        self.assertIn("2 schemas aliased", report.format())
+
+        report = get_dedup_report("rust", namespace=NAMESPACE, extract_bases=2)
+        self.assertEqual(len(report.bases), 1)
+        self.assertGreater(report.bytes_saved, 0)
+
+    def test_extract_bases_many_schemas(self):
+        rnd = random.Random(0)
+        field_names = [f"field_{i}" for i in range(60)]
+        schemas = [
+            ParsedSchema(
+                name=f"Schema{i}",
+                fields=[
+                    ParsedField(
+                        python_datatype=PythonDatatypes.INT,
+                        export_name=None,
+                        field_name=name,
+                        required=True,
+                    )
+                    for name in rnd.sample(field_names, rnd.randint(4, 20))
+                ],
+            )
+            for i in range(400)
+        ]
+
+        report = DedupReport()
+        output = extract_bases(
+            schemas, Typescript.get_field_shape, True, True, 3, report
+        )
+        self.assertGreater(len(report.bases), 0)
+
+        # Every schema keeps its fields, through its base if it has one
+        by_name = {schema.name: schema for schema in output}
+        for schema in schemas:
+            extracted = by_name[schema.name]
+            names = [field.field_name for field in extracted.fields]
+            if extracted.base is not None:
+                self.assertIsNone(by_name[extracted.base].base)
+                names += [field.field_name for field in by_name[extracted.base].fields]
+
+            self.assertEqual(
+                sorted(names), sorted([field.field_name for field in schema.fields])
+            )
@@ -0,0 +1,218 @@
+import importlib.util
+import json
+import unittest
+
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from schema_exporter import _get_export, export_drf_serializer
+from schema_exporter.languages import JsonSchema
+from schema_exporter.types import EnumInfo, ParsedField, ParsedSchema, PythonDatatypes
+
+from .common import TestEnum, test_schema
+
+nested_schema = ParsedSchema(name="Nested", fields=[])
+
+NAMESPACE = "json_schema_test"
+
+
+class JsonSchemaItemSerializer(serializers.Serializer):
+    quantity = serializers.IntegerField(min_value=1)
+    price = serializers.DecimalField(max_digits=5, decimal_places=2)
+
+
+@export_drf_serializer(namespace=NAMESPACE)
+class JsonSchemaOrderSerializer(serializers.Serializer):
+    id = serializers.IntegerField(read_only=True)
+    status = serializers.ChoiceField(choices=[("open", "Open"), ("paid", "Paid")])
+    perms = serializers.MultipleChoiceField(
+        choices=[("read", "Read"), ("write", "Write")]
+    )
+    items = JsonSchemaItemSerializer(many=True)
+    note = serializers.CharField(allow_null=True, max_length=10)
+
+
+def get_validator(name: str):
+    import jsonschema
+
+    exp = _get_export(
+        language="jsonschema",
+        namespace=NAMESPACE,
+        include_dump_only=True,
+        include_load_only=True,
+        strip_schema_keyword=True,
+        expand_nested=True,
+        ordered_output=True,
+    )
+    document = json.loads(exp)
+    document["$ref"] = f"#/$defs/{name}"
+    return jsonschema.Draft202012Validator(document)
+
+
+class JsonSchemaTests(unittest.TestCase):
+    def test_basic(self):
+        exporter = JsonSchema(
+            [nested_schema, test_schema],
+            [(TestEnum, EnumInfo())],
+            options={"json_schema_variants": False},
+        )
+        exp = exporter.export(True, True)
+        document = json.loads(exp)
+
+        self.assertEqual(
+            document["$schema"], "https://json-schema.org/draft/2020-12/schema"
+        )
+        defs = document["$defs"]
+        self.assertEqual(defs["TestEnum"], {"enum": ["a", 2, "C"]})
+        self.assertEqual(
+            defs["Nested"], {"type": "object", "additionalProperties": False}
+        )
+        test = defs["Test"]
+        self.assertFalse(test["additionalProperties"])
+        self.assertEqual(test["required"], ["required", "required_allow_none"])
+        self.assertEqual(
+            test["properties"]["allow_none"], {"type": ["integer", "null"]}
+        )
+        self.assertEqual(
+            test["properties"]["nested_many"],
+            {"type": "array", "items": {"$ref": "#/$defs/Nested"}},
+        )
+        self.assertEqual(test["properties"]["enum_field"], {"$ref": "#/$defs/TestEnum"})
+        self.assertIn('        "required": {"type": "integer"},\n', exp)
+
+        self.assertEqual(exporter.export(True, True, workers=2), exp)
+
+    def test_variants(self):
+        alias = ParsedSchema(name="Alias", fields=[], alias_of="Test")
+        exp = JsonSchema(
+            [nested_schema, test_schema, alias],
+            [(TestEnum, EnumInfo())],
+        ).export(True, True)
+        defs = json.loads(exp)["$defs"]
+
+        self.assertNotIn("Test", defs)
+        self.assertIn("load_only", defs["TestInput"]["properties"])
+        self.assertNotIn("dump_only", defs["TestInput"]["properties"])
+        self.assertIn("dump_only", defs["TestOutput"]["properties"])
+        self.assertNotIn("load_only", defs["TestOutput"]["properties"])
+        self.assertEqual(
+            defs["TestOutput"]["properties"]["nested"], {"$ref": "#/$defs/NestedOutput"}
+        )
+        self.assertEqual(
+            defs["TestInput"]["properties"]["enum_field"], {"$ref": "#/$defs/TestEnum"}
+        )
+        self.assertEqual(defs["AliasInput"], {"$ref": "#/$defs/TestInput"})
+
+    def test_constraints(self):
+        base = ParsedSchema(
+            name="Base",
+            fields=[
+                ParsedField(
+                    python_datatype=PythonDatatypes.INT,
+                    export_name=None,
+                    field_name="id",
+                    required=True,
+                    min_value=0,
+                    max_value=100,
+                )
+            ],
+        )
+        schema = ParsedSchema(
+            name="Item",
+            fields=[
+                ParsedField(
+                    python_datatype=PythonDatatypes.STRING,
+                    export_name=None,
+                    field_name="tags",
+                    many=True,
+                    unique=True,
+                    max_length=8,
+                    max_items=4,
+                ),
+                ParsedField(
+                    python_datatype=None,
+                    export_name="TestEnum",
+                    field_name="kind",
+                    allow_none=True,
+                ),
+            ],
+            base="Base",
+        )
+        exp = JsonSchema(
+            [base, schema],
+            [(TestEnum, EnumInfo())],
+            options={"json_schema_variants": False},
+        ).export(True, True)
+        item = json.loads(exp)["$defs"]["Item"]
+
+        # Closed objects cannot extend each other, the base fields are inlined
+        self.assertEqual(list(item["properties"]), ["id", "tags", "kind"])
+        self.assertEqual(item["required"], ["id"])
+        self.assertEqual(
+            item["properties"]["id"], {"type": "integer", "minimum": 0, "maximum": 100}
+        )
+        self.assertEqual(
+            item["properties"]["tags"],
+            {
+                "type": "array",
+                "items": {"type": "string", "maxLength": 8},
+                "maxItems": 4,
+                "uniqueItems": True,
+            },
+        )
+        self.assertEqual(
+            item["properties"]["kind"],
+            {"anyOf": [{"$ref": "#/$defs/TestEnum"}, {"type": "null"}]},
+        )
+
+    def test_typed_dicts(self):
+        typed = ParsedSchema(
+            name="Typed",
+            fields=[
+                ParsedField(
+                    python_datatype=PythonDatatypes.DICT,
+                    export_name=None,
+                    field_name="scores",
+                    required=True,
+                    value_field=ParsedField(
+                        python_datatype=PythonDatatypes.INT,
+                        export_name=None,
+                        field_name="scores",
+                        min_value=0,
+                    ),
+                )
+            ],
+        )
+        document = json.loads(JsonSchema([typed], []).export(True, True))
+
+        self.assertEqual(
+            document["$defs"]["TypedOutput"]["properties"]["scores"],
+            {
+                "type": "object",
+                "additionalProperties": {"type": "integer", "minimum": 0},
+            },
+        )
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("jsonschema"), "jsonschema is not installed"
+    )
+    def test_drf_round_trip(self):
+        order = {
+            "id": 1,
+            "status": "paid",
+            "perms": {"read", "write"},
+            "items": [{"quantity": 2, "price": "1.50"}],
+            "note": None,
+        }
+        # Validated against what DRF actually sends, choices by their keys
+        data = json.loads(JSONRenderer().render(JsonSchemaOrderSerializer(order).data))
+        output_validator = get_validator("JsonSchemaOrderOutput")
+        output_validator.validate(data)
+        self.assertFalse(output_validator.is_valid({**data, "status": "Paid"}))
+
+        payload = {key: value for key, value in data.items() if key != "id"}
+        self.assertTrue(JsonSchemaOrderSerializer(data=payload).is_valid())
+        input_validator = get_validator("JsonSchemaOrderInput")
+        input_validator.validate(payload)
+        self.assertFalse(input_validator.is_valid(data))
+        self.assertFalse(input_validator.is_valid({**payload, "perms": ["Read"]}))
@@ -0,0 +1,185 @@
+import importlib.util
+import sys
+import types
+import unittest
+
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from schema_exporter import _get_export, export_drf_serializer
+from schema_exporter.languages import Msgspec
+from schema_exporter.types import EnumInfo, ParsedField, ParsedSchema, PythonDatatypes
+
+from .common import TestEnum, TestEnumAuto, test_schema
+
+TEST_SCHEMA_MSGSPEC = """class Test(msgspec.Struct, kw_only=True):
+    load_only: Optional[int] = None
+    dump_only: Optional[int] = None
+    required: int
+    allow_none: Optional[int] = None
+    required_allow_none: Optional[int]
+    nested: Optional[Nested] = None
+    nested_many: Optional[List[Nested]] = None
+    enum_field: Optional[TestEnum] = None
+    datetime_field: Optional[datetime] = None
+    uuid_field: Optional[UUID] = None
+"""
+
+NAMESPACE = "msgspec_test"
+
+
+@export_drf_serializer(namespace=NAMESPACE)
+class MsgspecGrantSerializer(serializers.Serializer):
+    perm = serializers.ChoiceField(choices=[("read", "Read"), ("write", "Write")])
+    extra = serializers.MultipleChoiceField(
+        choices=[("read", "Read"), ("write", "Write")], required=False
+    )
+
+
+class MsgspecTests(unittest.TestCase):
+    def test_basic(self):
+        nested = ParsedSchema(name="Nested", fields=[])
+        exp = Msgspec(
+            [nested, test_schema],
+            [(TestEnum, EnumInfo()), (TestEnumAuto, EnumInfo())],
+        ).export(True, True)
+
+        self.assertTrue(exp.startswith("from __future__ import annotations\n"))
+        self.assertIn("from datetime import datetime\n", exp)
+        self.assertIn("from enum import Enum\n", exp)
+        self.assertIn("from typing import List, Optional\n", exp)
+        self.assertIn("from uuid import UUID\n", exp)
+        self.assertIn("import msgspec\n", exp)
+        self.assertIn(
+            "class TestEnum(Enum):\n    A = 'a'\n    B = 2\n    C = 'C'\n", exp
+        )
+        self.assertIn("class Nested(msgspec.Struct, kw_only=True):\n    pass\n", exp)
+        self.assertIn(TEST_SCHEMA_MSGSPEC, exp)
+        compile(exp, "msgspec_export.py", "exec")
+
+    def test_struct_options(self):
+        frozen = ParsedSchema(name="Frozen", fields=[], kwargs={"msgspec_frozen": True})
+        row = ParsedSchema(name="Row", fields=[])
+        exp = Msgspec([frozen, row], [], {"msgspec_array_like": True}).export(
+            True, True
+        )
+
+        self.assertIn(
+            "class Frozen(msgspec.Struct, kw_only=True, frozen=True, array_like=True):",
+            exp,
+        )
+        self.assertIn("class Row(msgspec.Struct, kw_only=True, array_like=True):", exp)
+
+    def test_bases_aliases_and_renames(self):
+        base = ParsedSchema(
+            name="Base",
+            fields=[
+                ParsedField(
+                    python_datatype=PythonDatatypes.INT,
+                    export_name=None,
+                    field_name="id",
+                    required=True,
+                )
+            ],
+        )
+        child = ParsedSchema(
+            name="Child",
+            fields=[
+                ParsedField(
+                    python_datatype=PythonDatatypes.DECIMAL,
+                    export_name=None,
+                    field_name="unit-price",
+                    required=True,
+                ),
+                ParsedField(
+                    python_datatype=PythonDatatypes.STRING,
+                    export_name=None,
+                    field_name="class",
+                ),
+            ],
+            base="Base",
+        )
+        alias = ParsedSchema(name="Alias", fields=[], alias_of="Child")
+        opaque = ParsedSchema(name="Opaque", fields=[], opaque=True)
+        exp = Msgspec([base, child, alias, opaque], []).export(True, True)
+
+        self.assertIn(
+            "class Child(Base, kw_only=True):\n"
+            '    unit_price: Decimal = msgspec.field(name="unit-price")\n'
+            '    class_: Optional[str] = msgspec.field(default=None, name="class")\n',
+            exp,
+        )
+        self.assertIn("Alias = Child\n", exp)
+        self.assertIn("Opaque = Dict[str, Any]\n", exp)
+        self.assertIn("from typing import Any, Dict, Optional\n", exp)
+        compile(exp, "msgspec_export.py", "exec")
+
+    def test_shard_imports(self):
+        exporter = Msgspec([test_schema], [])
+        shard_imports = exporter.format_shard_imports({"other": {"Nested", "TestEnum"}})
+        self.assertEqual(
+            shard_imports,
+            "from __future__ import annotations\n\n"
+            "from .other import Nested, TestEnum\n",
+        )
+        exp = exporter.export(True, True)
+        self.assertNotIn("__future__", exp)
+        compile(shard_imports + "\n" + exp, "msgspec_export.py", "exec")
+
+    def test_typed_dicts(self):
+        typed = ParsedSchema(
+            name="Typed",
+            fields=[
+                ParsedField(
+                    python_datatype=PythonDatatypes.DICT,
+                    export_name=None,
+                    field_name="by_status",
+                    required=True,
+                    key_field=ParsedField(
+                        python_datatype=None,
+                        export_name="TestEnum",
+                        field_name="by_status",
+                    ),
+                    value_field=ParsedField(
+                        python_datatype=PythonDatatypes.INT,
+                        export_name=None,
+                        field_name="by_status",
+                        many=True,
+                    ),
+                )
+            ],
+        )
+        exp = Msgspec([typed], [(TestEnum, EnumInfo())]).export(True, True)
+
+        self.assertIn("from typing import Dict, List\n", exp)
+        self.assertIn("    by_status: Dict[TestEnum, List[int]]\n", exp)
+        compile(exp, "msgspec_export.py", "exec")
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("msgspec"), "msgspec is not installed"
+    )
+    def test_drf_round_trip(self):
+        import msgspec
+
+        exp = _get_export(
+            language="msgspec",
+            namespace=NAMESPACE,
+            include_dump_only=True,
+            include_load_only=True,
+            strip_schema_keyword=True,
+            expand_nested=True,
+            ordered_output=True,
+        )
+        # Annotations are resolved from the module of the structs
+        module = types.ModuleType("msgspec_round_trip")
+        sys.modules[module.__name__] = module
+        try:
+            exec(compile(exp, "msgspec_round_trip.py", "exec"), module.__dict__)
+            grant = {"perm": "write", "extra": {"read"}}
+            data = JSONRenderer().render(MsgspecGrantSerializer(grant).data)
+            decoded = msgspec.json.decode(data, type=module.MsgspecGrant)
+        finally:
+            del sys.modules[module.__name__]
+
+        self.assertEqual(decoded.perm, module.Perm.write)
+        self.assertEqual(decoded.extra, [module.Extra.read])
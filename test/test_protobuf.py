@@ -0,0 +1,181 @@
+import json
+import os
+import tempfile
+import unittest
+from dataclasses import replace
+from enum import Enum
+
+from schema_exporter.languages import Protobuf
+from schema_exporter.types import (
+    EnumInfo,
+    ParsedField,
+    ParsedSchema,
+    PythonDatatypes,
+)
+
+from .common import TestEnum, test_schema
+
+TEST_SCHEMA_PROTO = """message Test {
+  optional int64 load_only = 1;
+  optional int64 dump_only = 2;
+  int64 required = 3;
+  optional int64 allow_none = 4;
+  optional int64 required_allow_none = 5;
+  optional Nested nested = 6;
+  repeated Nested nested_many = 7;
+  optional TestEnum enum_field = 8;
+  optional google.protobuf.Timestamp datetime_field = 9;
+  optional string uuid_field = 10;
+}
+"""
+
+TEST_ENUM_PROTO = """enum TestEnum {
+  TEST_ENUM_UNSPECIFIED = 0;
+  TEST_ENUM_A = 1;
+  TEST_ENUM_B = 2;
+  TEST_ENUM_C = 3;
+}
+"""
+
+
+class ProtobufTests(unittest.TestCase):
+    def test_basic(self):
+        nested = ParsedSchema(name="Nested", fields=[])
+        exporter = Protobuf(
+            [nested, test_schema],
+            [(TestEnum, EnumInfo())],
+            options={"proto_package": "shop.v1"},
+        )
+        exp = exporter.export(True, True)
+
+        self.assertTrue(
+            exp.startswith(
+                'syntax = "proto3";\n\n'
+                "package shop.v1;\n\n"
+                'import "google/protobuf/timestamp.proto";\n'
+            )
+        )
+        self.assertIn(TEST_ENUM_PROTO, exp)
+        self.assertIn("message Nested {}\n", exp)
+        self.assertIn(TEST_SCHEMA_PROTO, exp)
+
+    def test_references(self):
+        schema = ParsedSchema(
+            name="Item",
+            fields=[
+                ParsedField(
+                    python_datatype=None, export_name="Alias", field_name="alias"
+                ),
+                ParsedField(
+                    python_datatype=None, export_name="Opaque", field_name="opaque"
+                ),
+                ParsedField(
+                    python_datatype=PythonDatatypes.STRING,
+                    export_name=None,
+                    field_name="data-key",
+                    required=True,
+                ),
+            ],
+        )
+        alias = ParsedSchema(name="Alias", fields=[], alias_of="Item")
+        opaque = ParsedSchema(name="Opaque", fields=[], opaque=True)
+        exp = Protobuf([schema, alias, opaque], []).export(True, True)
+
+        self.assertIn('import "google/protobuf/struct.proto";\n', exp)
+        self.assertIn(
+            "message Item {\n"
+            "  optional Item alias = 1;\n"
+            "  optional google.protobuf.Struct opaque = 2;\n"
+            '  string data_key = 3 [json_name = "data-key"];\n'
+            "}\n",
+            exp,
+        )
+        self.assertIn("// Alias is exported as Item\n", exp)
+
+    def test_lock_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            lock_file = os.path.join(tmp_dir, "fields.lock.json")
+            options = {"proto_lock_file": lock_file}
+            Protobuf([test_schema], [(TestEnum, EnumInfo())], options).export(
+                True, True
+            )
+
+            with open(lock_file) as f:
+                lock = json.load(f)
+            self.assertEqual(lock["messages"]["Test"]["uuid_field"], 10)
+            self.assertEqual(lock["enums"]["TestEnum"], {"A": 1, "B": 2, "C": 3})
+
+            # Removed fields keep their numbers reserved, new fields are
+            # numbered after every number used so far
+            fields = [f for f in test_schema.fields if f.field_name != "required"]
+            fields.insert(
+                0,
+                ParsedField(
+                    python_datatype=PythonDatatypes.BOOL,
+                    export_name=None,
+                    field_name="flag",
+                ),
+            )
+            schema = replace(test_schema, fields=fields)
+            exp = Protobuf([schema], [], options).export(True, True)
+            self.assertIn(
+                "message Test {\n"
+                "  optional bool flag = 11;\n"
+                "  optional int64 load_only = 1;\n",
+                exp,
+            )
+            self.assertIn(
+                '  reserved 3;\n  reserved "required";\n}\n',
+                exp,
+            )
+
+            with open(lock_file) as f:
+                lock = json.load(f)
+            self.assertEqual(lock["messages"]["Test"]["flag"], 11)
+            self.assertEqual(lock["messages"]["Test"]["required"], 3)
+            # Enums left out of an export keep their numbers
+            self.assertIn("TestEnum", lock["enums"])
+
+            # Removed values reserve the prefixed names they were exported as
+            reduced = Enum("TestEnum", {"A": "a", "C": "C"})
+            exp = Protobuf([], [(reduced, EnumInfo())], options).export(True, True)
+            self.assertIn(
+                "  TEST_ENUM_C = 3;\n" "  reserved 2;\n" '  reserved "TEST_ENUM_B";\n',
+                exp,
+            )
+
+    def test_typed_dicts(self):
+        value_field = ParsedField(
+            python_datatype=PythonDatatypes.DATETIME,
+            export_name=None,
+            field_name="seen",
+        )
+        typed = ParsedSchema(
+            name="Typed",
+            fields=[
+                ParsedField(
+                    python_datatype=PythonDatatypes.DICT,
+                    export_name=None,
+                    field_name="seen",
+                    key_field=ParsedField(
+                        python_datatype=PythonDatatypes.INT,
+                        export_name=None,
+                        field_name="seen",
+                    ),
+                    value_field=value_field,
+                ),
+                # Map values cannot be null
+                ParsedField(
+                    python_datatype=PythonDatatypes.DICT,
+                    export_name=None,
+                    field_name="maybe_seen",
+                    value_field=replace(value_field, allow_none=True),
+                ),
+            ],
+        )
+        exp = Protobuf([typed], []).export(True, True)
+
+        self.assertIn("  map<int64, google.protobuf.Timestamp> seen = 1;\n", exp)
+        self.assertIn("  optional google.protobuf.Struct maybe_seen = 2;\n", exp)
+        self.assertIn('import "google/protobuf/struct.proto";\n', exp)
+        self.assertIn('import "google/protobuf/timestamp.proto";\n', exp)
@@ -0,0 +1,95 @@
+import unittest
+from enum import Enum
+
+from marshmallow import Schema, fields
+from marshmallow_enum import EnumField
+from rest_framework import serializers
+
+from schema_exporter import (
+    _parse_namespace,
+    export_drf_serializer,
+    export_enum,
+    export_marshmallow_schema,
+)
+
+NAMESPACE = "pruning_test"
+
+
+class PruningEnum(Enum):
+    A = "a"
+
+
+@export_enum(namespace=NAMESPACE)
+class PruningUnusedEnum(Enum):
+    B = "b"
+
+
+class PruningLeafSchema(Schema):
+    int_1 = fields.Integer()
+    enum_1 = EnumField(PruningEnum)
+
+
+class PruningMiddleSchema(Schema):
+    leaves = fields.List(fields.Nested(PruningLeafSchema))
+
+
+@export_marshmallow_schema(namespace=NAMESPACE + ",pruning_mobile")
+class PruningRootSchema(Schema):
+    middle = fields.Nested(PruningMiddleSchema)
+
+
+@export_marshmallow_schema(namespace=NAMESPACE)
+class PruningOtherSchema(Schema):
+    leaf = fields.Nested(PruningLeafSchema)
+
+
+@export_drf_serializer(namespace=NAMESPACE)
+class PruningUnreachableSerializer(serializers.Serializer):
+    def __init__(self, *args, **kwargs):
+        raise AssertionError("Unreachable serializer instantiated")
+
+
+def parse(namespace=NAMESPACE, **kwargs):
+    schemas, enums = _parse_namespace(
+        namespace=namespace,
+        strip_schema_keyword=True,
+        expand_nested=True,
+        **kwargs,
+    )
+    return {s.name: s for s in schemas}, [e.__name__ for e, _ in enums]
+
+
+class PruningTests(unittest.TestCase):
+    def test_roots_by_name(self):
+        schemas, enums = parse(roots=["PruningRoot"])
+        self.assertEqual(
+            set(schemas.keys()), {"PruningRoot", "PruningMiddle", "PruningLeaf"}
+        )
+        self.assertEqual(enums, ["PruningEnum"])
+
+    def test_roots_by_pattern(self):
+        schemas, _ = parse(roots=["PruningOther*"])
+        self.assertEqual(set(schemas.keys()), {"PruningOther", "PruningLeaf"})
+
+    def test_roots_by_namespace(self):
+        schemas, _ = parse(root_namespace="pruning_mobile")
+        self.assertEqual(
+            set(schemas.keys()), {"PruningRoot", "PruningMiddle", "PruningLeaf"}
+        )
+
+    def test_max_depth(self):
+        schemas, enums = parse(roots=["PruningRoot"], max_depth=1)
+        self.assertEqual(
+            set(schemas.keys()), {"PruningRoot", "PruningMiddle", "PruningLeaf"}
+        )
+        self.assertFalse(schemas["PruningMiddle"].opaque)
+        self.assertTrue(schemas["PruningLeaf"].opaque)
+        self.assertEqual(len(schemas["PruningLeaf"].fields), 0)
+        self.assertIn(schemas["PruningLeaf"], schemas["PruningMiddle"].nests)
+        self.assertEqual(enums, [])
+
+    def test_max_depth_without_roots(self):
+        schemas, _ = parse(namespace="pruning_mobile", max_depth=0)
+        self.assertEqual(set(schemas.keys()), {"PruningRoot", "PruningMiddle"})
+        self.assertFalse(schemas["PruningRoot"].opaque)
+        self.assertTrue(schemas["PruningMiddle"].opaque)
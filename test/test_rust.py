@@ -1,8 +1,21 @@
 import unittest
+from enum import Enum
 from copy import copy
+from dataclasses import replace
+from unittest import mock
 
-from schema_exporter.languages import Rust
-from schema_exporter.types import EnumInfo, Mapping, SchemaInfo
+from rest_framework import serializers
+
+from schema_exporter.languages import Rust, rust
+from schema_exporter.parsers.drf_parser import _create_enum_from_choices
+from schema_exporter.types import (
+    EnumInfo,
+    Mapping,
+    ParsedField,
+    ParsedSchema,
+    PythonDatatypes,
+    SchemaInfo,
+)
 
 from .common import TestEnum, TestEnumAuto
 from .common import test_schema as base_test_schema
@@ -128,3 +141,658 @@ class RustTests(unittest.TestCase):
 
         exp = ts.format_enum(TestEnumAuto, test_enum_info)
         self.assertEqual(exp, TEST_ENUM_AUTO_RUST)
+
+    def test_parallel_export(self):
+        uuid_schema = replace(
+            test_schema,
+            name="UuidOnly",
+            fields=test_schema.fields[-1:],
+            kwargs={},
+        )
+        schemas = [replace(test_schema, name=f"Test{i}") for i in range(20)]
+        schemas.append(uuid_schema)
+        enums = [(TestEnum, test_enum_info), (TestEnumAuto, test_enum_info)]
+        exporter = Rust(schemas, enums)
+
+        serial = exporter.export(True, True)
+        for workers in (2, 3):
+            self.assertEqual(exporter.export(True, True, workers=workers), serial)
+
+        # Imports are collected only from exported fields
+        exporter = Rust([uuid_schema], [])
+        self.assertEqual(
+            exporter.export(True, True, workers=2), exporter.export(True, True)
+        )
+
+    def test_opaque_schema(self):
+        opaque = ParsedSchema(
+            name="Opaque", fields=[], opaque=True, kwargs=test_schema.kwargs
+        )
+        exporter = Rust([opaque], [])
+
+        self.assertEqual(exporter.format_header(True, True), "\n")
+        self.assertEqual(
+            exporter.format_schema(opaque, True, True),
+            "pub type Opaque = serde_json::Value;\n",
+        )
+
+    def test_header_variants(self):
+        schema = ParsedSchema(
+            name="Variants",
+            fields=[
+                ParsedField(
+                    python_datatype=PythonDatatypes.UUID,
+                    export_name=None,
+                    field_name="load_only",
+                    load_only=True,
+                ),
+            ],
+        )
+        schema.add_field(
+            ParsedField(
+                python_datatype=PythonDatatypes.DATETIME,
+                export_name=None,
+                field_name="dump_only",
+                dump_only=True,
+            )
+        )
+        exporter = Rust([schema], [])
+
+        self.assertEqual(
+            exporter.format_header(True, True),
+            "use chrono::{DateTime, Utc};\nuse uuid::Uuid;\n",
+        )
+        self.assertEqual(
+            exporter.format_header(True, False), "use chrono::{DateTime, Utc};\n"
+        )
+        self.assertEqual(exporter.format_header(False, True), "use uuid::Uuid;\n")
+
+    def test_enum_table(self):
+        large_enum = Enum("Currency", {"USD": "USD", "EUR": "EUR", "AED": "AED"})
+        enum_info = EnumInfo(
+            kwargs={**test_enum_info.kwargs, "enum_table_threshold": 2}
+        )
+        exporter = Rust([], [(large_enum, enum_info)])
+
+        exp = exporter.format_enum(large_enum, enum_info)
+        self.assertIn("pub struct Currency(u16);\n", exp)
+        self.assertIn(
+            "    pub const VALUES: &'static [&'static str] = &[\n"
+            '        "AED",\n'
+            '        "EUR",\n'
+            '        "USD",\n'
+            "    ];\n",
+            exp,
+        )
+        self.assertIn("impl<'de> serde::Deserialize<'de> for Currency {\n", exp)
+        # Derive imports are not needed by tables
+        self.assertEqual(exporter.format_header(True, True), "\n")
+
+        # Below the threshold and enums with other than string values are
+        # exported as enums
+        self.assertEqual(exporter.format_enum(TestEnum, enum_info), TEST_ENUM_RUST)
+        exporter = Rust([], [], options={"enum_table_threshold": 3})
+        self.assertIn(
+            "pub enum Currency", exporter.format_enum(large_enum, test_enum_info)
+        )
+
+    def test_borrowed(self):
+        named = ParsedSchema(
+            name="Named",
+            fields=[
+                ParsedField(
+                    python_datatype=PythonDatatypes.STRING,
+                    export_name=None,
+                    field_name="name",
+                    required=True,
+                ),
+            ],
+            kwargs=test_schema.kwargs,
+        )
+        outer = ParsedSchema(
+            name="Outer",
+            fields=[
+                ParsedField(
+                    python_datatype=None,
+                    export_name="Named",
+                    field_name="named",
+                    required=True,
+                ),
+                ParsedField(
+                    python_datatype=PythonDatatypes.STRING,
+                    export_name=None,
+                    field_name="tags",
+                    many=True,
+                ),
+            ],
+            kwargs=test_schema.kwargs,
+        )
+        exporter = Rust([named, outer], [], options={"rust_borrowed": "cow"})
+
+        header = exporter.format_header(True, True)
+        self.assertIn("use std::borrow::Cow;\n", header)
+        self.assertIn("pub mod borrow_cow {\n", header)
+        exp = exporter.format_schema(outer, True, True)
+        self.assertIn(
+            "pub struct OuterRef<'a> {\n"
+            "    #[serde(borrow)]\n"
+            "    pub named: NamedRef<'a>,\n"
+            '    #[serde(borrow, default, deserialize_with = "borrow_cow::option_vec")]\n'
+            "    pub tags: Option<Vec<Cow<'a, str>>>,\n"
+            "}\n",
+            exp,
+        )
+        self.assertIn("impl<'a> From<&'a Outer> for OuterRef<'a> {\n", exp)
+        self.assertIn("impl From<OuterRef<'_>> for Outer {\n", exp)
+        self.assertIn("            named: NamedRef::from(&value.named),\n", exp)
+
+        exporter = Rust([named, outer], [], options={"rust_borrowed": "str"})
+        self.assertNotIn("Cow", exporter.format_header(True, True))
+        self.assertNotIn("borrow_cow", exporter.format_schema(outer, True, True))
+        self.assertIn(
+            "pub struct NamedRef<'a> {\n    pub name: &'a str,\n}\n",
+            exporter.format_schema(named, True, True),
+        )
+
+        # Schemas without strings have no borrowed variant
+        self.assertNotIn(
+            "Ref",
+            Rust([test_schema], [], options={"rust_borrowed": "cow"}).format_schema(
+                test_schema, True, True
+            ),
+        )
+        self.assertRaises(
+            ValueError, lambda: Rust([], [], options={"rust_borrowed": "ref"})
+        )
+
+    def test_json_fields(self):
+        schema = ParsedSchema(
+            name="Payload",
+            fields=[
+                ParsedField(
+                    python_datatype=PythonDatatypes.JSON_FIELD,
+                    export_name=None,
+                    field_name="data",
+                    required=True,
+                ),
+                ParsedField(
+                    python_datatype=PythonDatatypes.DICT,
+                    export_name=None,
+                    field_name="meta",
+                ),
+            ],
+            kwargs=test_schema.kwargs,
+        )
+        exporter = Rust([schema], [])
+
+        self.assertEqual(
+            exporter.format_header(True, True),
+            "// Requires the raw_value feature of serde_json\n"
+            "use serde::{Deserialize, Serialize};\n"
+            "use serde_json::value::RawValue;\n",
+        )
+        self.assertIn(
+            "    pub data: Box<RawValue>,\n    pub meta: Option<Box<RawValue>>,\n",
+            exporter.format_schema(schema, True, True),
+        )
+
+        schema = replace(
+            schema,
+            kwargs={**schema.kwargs, "rust_json_value_fields": ["meta"]},
+        )
+        exporter = Rust([schema], [])
+        self.assertIn("use serde_json::Value;\n", exporter.format_header(True, True))
+        self.assertIn(
+            "    pub data: Box<RawValue>,\n    pub meta: Option<Value>,\n",
+            exporter.format_schema(schema, True, True),
+        )
+
+        schema = replace(
+            schema,
+            kwargs={**schema.kwargs, "rust_json_value_fields": ["data", "meta"]},
+        )
+        self.assertNotIn("RawValue", Rust([schema], []).format_header(True, True))
+
+    def test_compact_ints(self):
+        def int_field(field_name, min_value, max_value):
+            return ParsedField(
+                python_datatype=PythonDatatypes.INT,
+                export_name=None,
+                field_name=field_name,
+                required=True,
+                min_value=min_value,
+                max_value=max_value,
+            )
+
+        schema = ParsedSchema(
+            name="Ints",
+            fields=[
+                int_field("small", -(2**15), 2**15 - 1),
+                int_field("positive_small", 0, 2**15 - 1),
+                int_field("positive", 0, 2**31 - 1),
+                int_field("unsigned", 0, None),
+                int_field("unbounded", None, None),
+            ],
+        )
+
+        self.assertEqual(
+            Rust([schema], [], options={"rust_compact_ints": True}).format_schema(
+                schema, True, True
+            ),
+            "pub struct Ints {\n"
+            "    pub small: i16,\n"
+            "    pub positive_small: u16,\n"
+            "    pub positive: u32,\n"
+            "    pub unsigned: u64,\n"
+            "    pub unbounded: i64,\n"
+            "}\n",
+        )
+        self.assertNotIn("i16", Rust([schema], []).format_schema(schema, True, True))
+
+    def test_inline_strings(self):
+        schema = ParsedSchema(
+            name="Address",
+            fields=[
+                ParsedField(
+                    python_datatype=PythonDatatypes.STRING,
+                    export_name=None,
+                    field_name="country",
+                    required=True,
+                    max_length=2,
+                ),
+                ParsedField(
+                    python_datatype=PythonDatatypes.STRING,
+                    export_name=None,
+                    field_name="street",
+                    required=True,
+                    max_length=200,
+                ),
+                ParsedField(
+                    python_datatype=PythonDatatypes.INT,
+                    export_name=None,
+                    field_name="codes",
+                    required=True,
+                    many=True,
+                    max_items=4,
+                ),
+            ],
+        )
+        exporter = Rust(
+            [schema],
+            [],
+            options={"rust_inline_strings": "arrayvec", "rust_inline_vecs": True},
+        )
+
+        self.assertEqual(
+            exporter.format_header(True, True),
+            "// Requires the serde feature of arrayvec\n"
+            "// Requires the serde feature of smallvec\n"
+            "use arrayvec::ArrayString;\n"
+            "use smallvec::SmallVec;\n",
+        )
+        # Capacities are in bytes, lengths in characters
+        self.assertEqual(
+            exporter.format_schema(schema, True, True),
+            "pub struct Address {\n"
+            "    pub country: ArrayString<8>,\n"
+            "    pub street: String,\n"
+            "    pub codes: SmallVec<[i64; 4]>,\n"
+            "}\n",
+        )
+
+        exporter = Rust(
+            [schema],
+            [],
+            options={"rust_inline_strings": "compact_str", "rust_inline_max": 500},
+        )
+        self.assertIn(
+            "    pub street: CompactString,\n    pub codes: Vec<i64>,\n",
+            exporter.format_schema(schema, True, True),
+        )
+        self.assertRaises(
+            ValueError,
+            lambda: Rust([], [], options={"rust_inline_strings": "smartstring"}),
+        )
+
+    def test_bitflags(self):
+        permission = Enum("Permission", {"Read": "read", "Write": "write"})
+        schema = ParsedSchema(
+            name="User",
+            fields=[
+                ParsedField(
+                    python_datatype=None,
+                    export_name="Permission",
+                    field_name="permissions",
+                    required=True,
+                    many=True,
+                    unique=True,
+                ),
+                ParsedField(
+                    python_datatype=None,
+                    export_name="Permission",
+                    field_name="history",
+                    required=True,
+                    many=True,
+                ),
+            ],
+        )
+        exporter = Rust(
+            [schema], [(permission, test_enum_info)], options={"rust_bitflags": True}
+        )
+
+        exp = exporter.format_enum(permission, test_enum_info)
+        self.assertIn(
+            "    pub struct PermissionFlags: u8 {\n"
+            "        const Read = 1 << 0;\n"
+            "        const Write = 1 << 1;\n"
+            "    }\n",
+            exp,
+        )
+        self.assertIn("impl serde::Serialize for PermissionFlags {\n", exp)
+        self.assertIn("impl<'de> serde::Deserialize<'de> for PermissionFlags {\n", exp)
+        # Only sets of choices are flags, other lists of the enum stay lists
+        self.assertEqual(
+            exporter.format_schema(schema, True, True),
+            "pub struct User {\n"
+            "    pub permissions: PermissionFlags,\n"
+            "    pub history: Vec<Permission>,\n"
+            "}\n",
+        )
+
+        exporter = Rust([schema], [(permission, test_enum_info)])
+        self.assertNotIn("Flags", exporter.export(True, True))
+
+    def test_enum_derives_cached(self):
+        exporter = Rust(
+            [], [(TestEnum, test_enum_info), (TestEnumAuto, test_enum_info)]
+        )
+        with mock.patch(
+            "schema_exporter.languages.rust._format_derives",
+            wraps=rust._format_derives,
+        ) as format_derives:
+            exporter.export(True, True)
+            exporter.export(True, True)
+
+        # Enums sharing the derive list format it once per exporter
+        format_derives.assert_called_once_with(mappings)
+
+    def test_enum_repr(self):
+        status = Enum("Status", {"Active": 1, "Deleted": 300})
+        color = Enum("Color", {"Red": "red", "Green": "green"})
+        enum_info = EnumInfo(kwargs={**test_enum_info.kwargs, "rust_enum_repr": True})
+        exporter = Rust([], [(status, enum_info), (color, enum_info)])
+
+        self.assertEqual(
+            exporter.format_enum(status, enum_info),
+            "#[derive(Clone, Copy, Debug, Deserialize_repr, Serialize_repr)]\n"
+            "#[repr(u16)]\n"
+            "pub enum Status {\n"
+            "    Active = 1,\n"
+            "    Deleted = 300,\n"
+            "}\n",
+        )
+        self.assertEqual(
+            exporter.format_enum(color, enum_info),
+            "#[derive(Clone, Copy, Debug, Deserialize, Serialize)]\n"
+            "#[repr(u8)]\n"
+            "pub enum Color {\n"
+            '    #[serde(rename = "red")]\n'
+            "    Red,\n"
+            '    #[serde(rename = "green")]\n'
+            "    Green,\n"
+            "}\n",
+        )
+        self.assertIn(
+            "use serde_repr::{Deserialize_repr, Serialize_repr};\n",
+            exporter.format_header(True, True),
+        )
+
+        # Aliases are left out, they would repeat the discriminant
+        aliased = Enum("Aliased", {"Active": 1, "Enabled": 1, "Deleted": 2})
+        self.assertEqual(
+            exporter.format_enum(aliased, enum_info),
+            "#[derive(Clone, Copy, Debug, Deserialize_repr, Serialize_repr)]\n"
+            "#[repr(u8)]\n"
+            "pub enum Aliased {\n"
+            "    Active = 1,\n"
+            "    Deleted = 2,\n"
+            "}\n",
+        )
+
+        # DRF sends and accepts the keys of choices, not their labels
+        perms, _ = _create_enum_from_choices(
+            "perms", serializers.ChoiceField([("read", "Read"), ("write", "Write")])
+        )
+        self.assertIn(
+            '    #[serde(rename = "read")]\n    read,\n'
+            '    #[serde(rename = "write")]\n    write,\n',
+            exporter.format_enum(perms, enum_info),
+        )
+
+        # Enums with other values are exported without a repr
+        mixed = Enum("Mixed", {"A": 1, "B": "b"})
+        self.assertNotIn("repr", exporter.format_enum(mixed, enum_info))
+        self.assertEqual(exporter.format_enum(TestEnum, test_enum_info), TEST_ENUM_RUST)
+
+    def test_lean_serde(self):
+        schema = ParsedSchema(
+            name="Item",
+            fields=[
+                ParsedField(
+                    python_datatype=PythonDatatypes.STRING,
+                    export_name=None,
+                    field_name="name",
+                    required=True,
+                ),
+                ParsedField(
+                    python_datatype=PythonDatatypes.STRING,
+                    export_name=None,
+                    field_name="note",
+                ),
+                ParsedField(
+                    python_datatype=PythonDatatypes.INT,
+                    export_name=None,
+                    field_name="count",
+                    required=True,
+                    allow_none=True,
+                ),
+                ParsedField(
+                    python_datatype=PythonDatatypes.STRING,
+                    export_name=None,
+                    field_name="tags",
+                    many=True,
+                ),
+                ParsedField(
+                    python_datatype=PythonDatatypes.INT,
+                    export_name=None,
+                    field_name="codes",
+                    many=True,
+                    allow_none=True,
+                ),
+            ],
+        )
+        exporter = Rust([schema], [], options={"rust_lean_serde": True})
+
+        self.assertEqual(
+            exporter.format_schema(schema, True, True),
+            "pub struct Item {\n"
+            "    pub name: String,\n"
+            '    #[serde(default, skip_serializing_if = "Option::is_none")]\n'
+            "    pub note: Option<String>,\n"
+            "    pub count: Option<i64>,\n"
+            '    #[serde(default, skip_serializing_if = "Vec::is_empty")]\n'
+            "    pub tags: Vec<String>,\n"
+            '    #[serde(default, skip_serializing_if = "Option::is_none")]\n'
+            "    pub codes: Option<Vec<i64>>,\n"
+            "}\n",
+        )
+
+        exporter = Rust(
+            [schema], [], options={"rust_lean_serde": True, "rust_borrowed": "cow"}
+        )
+        exp = exporter.format_schema(schema, True, True)
+        self.assertIn(
+            '    #[serde(borrow, default, skip_serializing_if = "Vec::is_empty", deserialize_with = "borrow_cow::vec")]\n'
+            "    pub tags: Vec<Cow<'a, str>>,\n",
+            exp,
+        )
+        self.assertIn(
+            "            tags: value.tags.iter().map(|e| Cow::Borrowed(e.as_str())).collect(),\n",
+            exp,
+        )
+
+    def test_mapping_profiles(self):
+        fields = [
+            ParsedField(
+                python_datatype=PythonDatatypes.DATETIME,
+                export_name=None,
+                field_name="created",
+                required=True,
+            ),
+            ParsedField(
+                python_datatype=PythonDatatypes.UUID,
+                export_name=None,
+                field_name="ids",
+                many=True,
+            ),
+            ParsedField(
+                python_datatype=PythonDatatypes.DECIMAL,
+                export_name=None,
+                field_name="price",
+            ),
+        ]
+        compact = ParsedSchema(
+            name="Compact",
+            fields=fields,
+            kwargs={"type_mapping_profile": "compact"},
+        )
+        default = ParsedSchema(name="Default", fields=fields)
+        exp = Rust([compact, default], []).export(True, True)
+
+        self.assertIn(
+            "pub struct Compact {\n"
+            '    #[serde(with = "epoch_millis")]\n'
+            "    pub created: DateTime<Utc>,\n"
+            '    #[serde(default, with = "uuid_u128::option_vec")]\n'
+            "    pub ids: Option<Vec<Uuid>>,\n"
+            '    #[serde(default, with = "decimal_micros::option")]\n'
+            "    pub price: Option<Decimal>,\n"
+            "}\n",
+            exp,
+        )
+        self.assertIn(
+            "pub struct Default {\n"
+            "    pub created: DateTime<Utc>,\n"
+            "    pub ids: Option<Vec<Uuid>>,\n"
+            "    pub price: Option<Decimal>,\n"
+            "}\n",
+            exp,
+        )
+        self.assertIn("macro_rules! serde_adapter {\n", exp)
+        self.assertIn("serde_adapter!(\n    decimal_micros,\n", exp)
+        self.assertIn("serde_adapter!(\n    epoch_millis,\n", exp)
+        self.assertIn("serde_adapter!(\n    uuid_u128,\n", exp)
+        self.assertIn("use chrono::{DateTime, Utc};\n", exp)
+
+        # Export wide profile, a schema opting out with the default profile
+        default.kwargs = {"type_mapping_profile": "default"}
+        exporter = Rust(
+            [compact, default],
+            [],
+            options={"type_mapping_profile": "compact", "rust_lean_serde": True},
+        )
+        exp = exporter.export(True, True)
+        self.assertIn(
+            '    #[serde(default, skip_serializing_if = "Option::is_none", with = "decimal_micros::option")]\n'
+            "    pub price: Option<Decimal>,\n",
+            exp,
+        )
+        self.assertIn(
+            '    #[serde(default, skip_serializing_if = "Option::is_none")]\n'
+            "    pub price: Option<Decimal>,\n",
+            exp,
+        )
+
+        # Custom profiles map to the adapters of other crates
+        custom = ParsedSchema(
+            name="Custom",
+            fields=fields[:1],
+            kwargs={
+                "type_mapping_profile": {
+                    PythonDatatypes.DATETIME: Mapping(
+                        mapping="DateTime<Utc>",
+                        imports={"chrono": ["DateTime", "Utc"]},
+                        serde_with="chrono::serde::ts_seconds",
+                    )
+                }
+            },
+        )
+        exp = Rust([custom], []).export(True, True)
+        self.assertIn('    #[serde(with = "chrono::serde::ts_seconds")]\n', exp)
+        self.assertNotIn("serde_adapter", exp)
+
+        with self.assertRaises(ValueError):
+            Rust([], [], options={"type_mapping_profile": "unknown"}).with_profile({})
+
+    def test_typed_dicts(self):
+        fields = [
+            ParsedField(
+                python_datatype=PythonDatatypes.DICT,
+                export_name=None,
+                field_name="by_id",
+                required=True,
+                key_field=ParsedField(
+                    python_datatype=PythonDatatypes.INT,
+                    export_name=None,
+                    field_name="by_id",
+                ),
+                value_field=ParsedField(
+                    python_datatype=None, export_name="Nested", field_name="by_id"
+                ),
+            ),
+            ParsedField(
+                python_datatype=PythonDatatypes.DICT,
+                export_name=None,
+                field_name="tags",
+                value_field=ParsedField(
+                    python_datatype=PythonDatatypes.STRING,
+                    export_name=None,
+                    field_name="tags",
+                    many=True,
+                    allow_none=True,
+                ),
+            ),
+        ]
+        schema = ParsedSchema(name="Typed", fields=fields)
+        nested = ParsedSchema(name="Nested", fields=[])
+
+        exp = Rust([nested, schema], []).export(True, True)
+        self.assertIn("use std::collections::HashMap;\n", exp)
+        self.assertIn(
+            "pub struct Typed {\n"
+            "    pub by_id: HashMap<i64, Nested>,\n"
+            "    pub tags: Option<HashMap<String, Option<Vec<String>>>>,\n"
+            "}\n",
+            exp,
+        )
+
+        exp = Rust(
+            [nested, schema],
+            [],
+            options={"rust_map_type": "btreemap", "rust_lean_serde": True},
+        ).export(True, True)
+        self.assertIn("use std::collections::BTreeMap;\n", exp)
+        self.assertIn(
+            '    #[serde(default, skip_serializing_if = "std::collections::BTreeMap::is_empty")]\n'
+            "    pub tags: BTreeMap<String, Option<Vec<String>>>,\n",
+            exp,
+        )
+
+        exp = Rust([nested, schema], [], options={"rust_map_type": "fxhashmap"}).export(
+            True, True
+        )
+        self.assertIn("use rustc_hash::FxHashMap;\n", exp)
+        self.assertIn("    pub by_id: FxHashMap<i64, Nested>,\n", exp)
+
+        with self.assertRaises(ValueError):
+            Rust([], [], options={"rust_map_type": "indexmap"})
@@ -0,0 +1,323 @@
+import tempfile
+import unittest
+from enum import Enum
+from pathlib import Path
+from unittest import mock
+
+from marshmallow import Schema, fields
+from marshmallow_enum import EnumField
+
+from schema_exporter import (
+    export_enum,
+    export_marshmallow_schema,
+    export_sharded,
+)
+from schema_exporter.languages import Rust
+from schema_exporter.sharding import SHARD_MANIFEST, export_shards, get_shard_name
+from schema_exporter.types import EnumInfo, ParsedField, ParsedSchema
+
+NAMESPACE = "sharding_test"
+
+
+# Enums stay in this module, schemas are moved to simulate an app layout
+class ShardingStatus(Enum):
+    ACTIVE = "active"
+
+
+@export_enum(namespace=NAMESPACE)
+class ShardingUnusedEnum(Enum):
+    A = "a"
+
+
+class ShardingAddressSchema(Schema):
+    street = fields.String(required=True)
+
+
+ShardingAddressSchema.__module__ = "shop.users.schemas"
+
+
+# Only referenced by the values of a dict
+class ShardingPickupSchema(Schema):
+    point = fields.String(required=True)
+
+
+ShardingPickupSchema.__module__ = "shop.users.schemas"
+
+
+@export_marshmallow_schema(namespace=NAMESPACE)
+class ShardingUserSchema(Schema):
+    address = fields.Nested(ShardingAddressSchema, required=True)
+    status = EnumField(ShardingStatus, required=True)
+
+
+ShardingUserSchema.__module__ = "shop.users.schemas"
+
+
+@export_marshmallow_schema(namespace=NAMESPACE)
+class ShardingOrderSchema(Schema):
+    buyer = fields.Nested(ShardingUserSchema, required=True)
+    delivery = fields.Nested(ShardingAddressSchema, dump_only=True)
+    pickups = fields.Dict(
+        keys=fields.String(), values=fields.Nested(ShardingPickupSchema), required=True
+    )
+
+
+ShardingOrderSchema.__module__ = "shop.orders.schemas"
+
+
+def read_dir(export_dir):
+    return {
+        p.name: p.read_text() for p in export_dir.iterdir() if p.name != SHARD_MANIFEST
+    }
+
+
+class ShardingTests(unittest.TestCase):
+    def test_shard_name(self):
+        self.assertEqual(
+            get_shard_name("shop.users.schemas", "module"), "shop_users_schemas"
+        )
+        self.assertEqual(get_shard_name("shop.users.schemas", "app"), "shop")
+        self.assertEqual(
+            get_shard_name("shop.users.schemas", lambda m: m.split(".")[1]), "users"
+        )
+        with self.assertRaises(ValueError):
+            get_shard_name("shop.users.schemas", "namespace")
+
+    def test_typescript(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            export_dir = Path(tmp)
+            written = export_sharded(export_dir, "typescript", namespace=NAMESPACE)
+            files = read_dir(export_dir)
+
+        self.assertEqual(
+            set(files.keys()),
+            {
+                "index.ts",
+                "test_test_sharding.ts",
+                "shop_orders_schemas.ts",
+                "shop_users_schemas.ts",
+            },
+        )
+        self.assertEqual(len(written), 4)
+        self.assertEqual(
+            files["index.ts"],
+            'export * from "./shop_orders_schemas";\n'
+            'export * from "./shop_users_schemas";\n'
+            'export * from "./test_test_sharding";\n',
+        )
+        self.assertEqual(
+            files["shop_orders_schemas.ts"],
+            'import type { ShardingAddress, ShardingPickup, ShardingUser } from "./shop_users_schemas";\n'
+            "\n"
+            "export interface ShardingOrder {\n"
+            "  buyer: ShardingUser\n"
+            "  readonly delivery?: ShardingAddress\n"
+            "  pickups: Record<string, ShardingPickup>\n"
+            "}\n",
+        )
+        self.assertTrue(
+            files["shop_users_schemas.ts"].startswith(
+                'import type { ShardingStatus } from "./test_test_sharding";\n'
+            )
+        )
+        self.assertIn("export enum ShardingUnusedEnum", files["test_test_sharding.ts"])
+
+    def test_excluded_variant_not_imported(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            export_dir = Path(tmp)
+            export_sharded(
+                export_dir,
+                "typescript",
+                namespace=NAMESPACE,
+                include_dump_only=False,
+            )
+            files = read_dir(export_dir)
+
+        self.assertTrue(
+            files["shop_orders_schemas.ts"].startswith(
+                'import type { ShardingPickup, ShardingUser } from "./shop_users_schemas";\n'
+            )
+        )
+
+    def test_rust(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            export_dir = Path(tmp)
+            export_sharded(export_dir, "rust", namespace=NAMESPACE, shard_by="app")
+            files = read_dir(export_dir)
+
+        self.assertEqual(set(files.keys()), {"mod.rs", "shop.rs", "test.rs"})
+        self.assertEqual(
+            files["mod.rs"],
+            "pub mod shop;\n"
+            "pub mod test;\n"
+            "\n"
+            "pub use shop::{ShardingAddress, ShardingOrder, ShardingPickup, ShardingUser};\n"
+            "pub use test::{ShardingStatus, ShardingUnusedEnum};\n",
+        )
+        self.assertIn("use super::test::ShardingStatus;\n", files["shop.rs"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            export_dir = Path(tmp)
+            export_sharded(export_dir, "rust", namespace=NAMESPACE)
+            files = read_dir(export_dir)
+
+        self.assertIn(
+            "use super::shop_users_schemas::{ShardingAddress, ShardingPickup, ShardingUser};\n",
+            files["shop_orders_schemas.rs"],
+        )
+        self.assertIn("pub mod test_test_sharding;\n", files["mod.rs"])
+        self.assertIn(
+            "pub use test_test_sharding::{ShardingStatus, ShardingUnusedEnum};\n",
+            files["mod.rs"],
+        )
+
+    def test_rust_helpers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            export_dir = Path(tmp)
+            export_sharded(
+                export_dir,
+                "rust",
+                namespace=NAMESPACE,
+                language_options={"rust_borrowed": "cow"},
+            )
+            files = read_dir(export_dir)
+
+        # Borrowed structs nest the borrowed structs of other shards
+        orders = files["shop_orders_schemas.rs"]
+        self.assertTrue(
+            orders.startswith(
+                "use super::shop_users_schemas::{ShardingAddress, ShardingAddressRef, "
+                "ShardingPickup, ShardingUser, ShardingUserRef};\n"
+            )
+        )
+        self.assertIn("    pub buyer: ShardingUserRef<'a>,\n", orders)
+        self.assertIn(
+            "pub use shop_users_schemas::{ShardingAddress, ShardingAddressRef, "
+            "ShardingPickup, ShardingPickupRef, ShardingUser, ShardingUserRef};\n",
+            files["mod.rs"],
+        )
+
+        # Sets of an enum of another shard are its flags
+        perms = ParsedSchema(
+            name="Grant",
+            fields=[
+                ParsedField(
+                    python_datatype=None,
+                    export_name="ShardingStatus",
+                    field_name="statuses",
+                    required=True,
+                    many=True,
+                    unique=True,
+                )
+            ],
+            module="shop.grants",
+        )
+        files = export_shards(
+            Rust,
+            [perms],
+            [(ShardingStatus, EnumInfo())],
+            "module",
+            True,
+            True,
+            language_options={"rust_bitflags": True},
+        )
+        self.assertTrue(
+            files["shop_grants.rs"].startswith(
+                "use super::test_test_sharding::ShardingStatusFlags;\n"
+            )
+        )
+        self.assertIn(
+            "    pub statuses: ShardingStatusFlags,\n", files["shop_grants.rs"]
+        )
+        self.assertIn(
+            "pub use test_test_sharding::{ShardingStatus, ShardingStatusFlags};\n",
+            files["mod.rs"],
+        )
+
+    def test_protobuf_index_options(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            export_dir = Path(tmp)
+            export_sharded(
+                export_dir,
+                "protobuf",
+                namespace=NAMESPACE,
+                shard_by="app",
+                language_options={"proto_package": "shop.v1"},
+            )
+            files = read_dir(export_dir)
+
+        self.assertEqual(
+            files["index.proto"],
+            'syntax = "proto3";\n\n'
+            "package shop.v1;\n\n"
+            'import public "shop.proto";\n'
+            'import public "test.proto";\n',
+        )
+
+    def test_unsupported_language(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            export_dir = Path(tmp) / "schemas"
+            with mock.patch("schema_exporter._parse_namespace") as parse:
+                with self.assertRaises(NotImplementedError):
+                    export_sharded(export_dir, "jsonschema", namespace=NAMESPACE)
+
+            parse.assert_not_called()
+            self.assertFalse(export_dir.exists())
+
+    def test_only_changed_shards_written(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            export_dir = Path(tmp)
+            export_sharded(export_dir, "typescript", namespace=NAMESPACE)
+            self.assertEqual(
+                export_sharded(export_dir, "typescript", namespace=NAMESPACE), []
+            )
+
+            (export_dir / "test_test_sharding.ts").write_text("")
+            self.assertEqual(
+                export_sharded(export_dir, "typescript", namespace=NAMESPACE),
+                [export_dir / "test_test_sharding.ts"],
+            )
+
+    def test_stale_shards_removed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            export_dir = Path(tmp)
+            (export_dir / "handwritten.ts").write_text("")
+            export_sharded(export_dir, "typescript", namespace=NAMESPACE)
+            export_sharded(
+                export_dir, "typescript", namespace=NAMESPACE, shard_by="app"
+            )
+            files = read_dir(export_dir)
+
+        self.assertEqual(
+            set(files.keys()), {"handwritten.ts", "index.ts", "shop.ts", "test.ts"}
+        )
+
+    def test_manifest_outside_files_kept(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            export_dir = Path(tmp) / "schemas"
+            outside = Path(tmp) / "outside.ts"
+            outside.write_text("")
+            export_sharded(export_dir, "typescript", namespace=NAMESPACE)
+            with open(export_dir / SHARD_MANIFEST, "a") as f:
+                f.write("../outside.ts\n")
+
+            export_sharded(export_dir, "typescript", namespace=NAMESPACE)
+            self.assertTrue(outside.exists())
+
+    def test_validator_imports(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            export_dir = Path(tmp)
+            export_sharded(
+                export_dir,
+                "typescript",
+                namespace=NAMESPACE,
+                language_options={"ts_validators": "guard"},
+            )
+            files = read_dir(export_dir)
+
+        self.assertTrue(
+            files["shop_orders_schemas.ts"].startswith(
+                'import type { ShardingAddress, ShardingPickup, ShardingUser } from "./shop_users_schemas";\n'
+                'import { isShardingAddress, isShardingPickup, isShardingUser } from "./shop_users_schemas";\n'
+            )
+        )
@@ -1,7 +1,14 @@
+import tempfile
 import unittest
+from dataclasses import replace
+from pathlib import Path
 
+from rest_framework import serializers
+
+from schema_exporter import _get_export, export_enum, export_mappings
 from schema_exporter.languages import Typescript
-from schema_exporter.types import EnumInfo
+from schema_exporter.parsers.drf_parser import _create_enum_from_choices
+from schema_exporter.types import EnumInfo, ParsedField, ParsedSchema, PythonDatatypes
 
 from .common import TestEnum, TestEnumAuto, test_schema
 
@@ -19,6 +26,20 @@ TEST_ENUM_AUTO_TS = """export enum TestEnumAuto {
 }
 """
 
+TEST_ENUM_UNION_TS = """export type TestEnum =
+  | "a"
+  | 2
+  | "C"
+"""
+
+TEST_ENUM_CONST_OBJECT_TS = """export const TestEnum = {
+  A: "a",
+  B: 2,
+  C: "C",
+} as const
+export type TestEnum = (typeof TestEnum)[keyof typeof TestEnum]
+"""
+
 TEST_SCHEMA_TS = """export interface Test {
   load_only?: number
   readonly dump_only?: number
@@ -88,8 +109,307 @@ class TsTests(unittest.TestCase):
     def test_enum(self):
         ts = Typescript([], [])
 
-        exp = ts.format_enum(TestEnum, EnumInfo)
+        exp = ts.format_enum(TestEnum, EnumInfo())
         self.assertEqual(exp, TEST_ENUM_TS)
 
-        exp = ts.format_enum(TestEnumAuto, EnumInfo)
+        exp = ts.format_enum(TestEnumAuto, EnumInfo())
         self.assertEqual(exp, TEST_ENUM_AUTO_TS)
+
+    def test_enum_styles(self):
+        ts = Typescript([], [])
+
+        exp = ts.format_enum(TestEnum, EnumInfo(kwargs={"ts_enum_style": "const_enum"}))
+        self.assertEqual(exp, "export const " + TEST_ENUM_TS[len("export ") :])
+
+        exp = ts.format_enum(TestEnum, EnumInfo(kwargs={"ts_enum_style": "union"}))
+        self.assertEqual(exp, TEST_ENUM_UNION_TS)
+
+        exp = ts.format_enum(
+            TestEnum, EnumInfo(kwargs={"ts_enum_style": "const_object"})
+        )
+        self.assertEqual(exp, TEST_ENUM_CONST_OBJECT_TS)
+
+        with self.assertRaises(ValueError):
+            ts.format_enum(TestEnum, EnumInfo(kwargs={"ts_enum_style": "object"}))
+
+    def test_enum_style_option(self):
+        ts = Typescript([], [], options={"ts_enum_style": "union"})
+        self.assertEqual(ts.format_enum(TestEnum, EnumInfo()), TEST_ENUM_UNION_TS)
+
+        # Set per enum, overrides the export option
+        exp = ts.format_enum(TestEnum, EnumInfo(kwargs={"ts_enum_style": "enum"}))
+        self.assertEqual(exp, TEST_ENUM_TS)
+
+        with self.assertRaises(ValueError):
+            Typescript([], [], options={"rust_enum_derives": []})
+
+    def test_enum_style_decorator(self):
+        namespace = "ts_enum_style_test"
+        export_enum(namespace=namespace, ts_enum_style="const_enum")(TestEnum)
+        export_enum(namespace=namespace)(TestEnumAuto)
+
+        exp = _get_export(
+            language="typescript",
+            namespace=namespace,
+            include_dump_only=True,
+            include_load_only=True,
+            strip_schema_keyword=True,
+            expand_nested=True,
+            ordered_output=True,
+            language_options={"ts_enum_style": "union"},
+        )
+        self.assertIn("export const enum TestEnum {", exp)
+        self.assertIn("export type TestEnumAuto =\n", exp)
+
+        with self.assertRaises(ValueError):
+            export_enum(namespace=namespace, ts_enum_styles="union")
+
+    def test_parallel_export(self):
+        schemas = [replace(test_schema, name=f"Test{i}") for i in range(20)]
+        enums = [(TestEnum, EnumInfo()), (TestEnumAuto, EnumInfo())]
+        exporter = Typescript(schemas, enums)
+
+        serial = exporter.export(True, False)
+        self.assertEqual(exporter.export(True, False, workers=3), serial)
+
+    def test_opaque_schema(self):
+        opaque = ParsedSchema(name="Opaque", fields=[], opaque=True)
+        exporter = Typescript([opaque], [])
+
+        self.assertEqual(
+            exporter.format_schema(opaque, True, True),
+            "export type Opaque = unknown\n",
+        )
+
+    def test_enum_table(self):
+        ts = Typescript(
+            [],
+            [(TestEnum, EnumInfo(kwargs={"ts_enum_style": "union"}))],
+            options={"enum_table_threshold": 2, "ts_validators": "guard"},
+        )
+
+        exp = ts.export(True, True)
+        self.assertIn(
+            'export type TestEnum = (string | number) & { readonly __enum: "TestEnum" }\n'
+            "export const loadTestEnumValues = (): Promise<readonly TestEnum[]> =>\n"
+            '  import("./TestEnum.values").then((m) => m.TestEnumValues as readonly TestEnum[])\n',
+            exp,
+        )
+        self.assertIn(
+            '  if (typeof value !== "string" && typeof value !== "number") return false\n',
+            exp,
+        )
+        self.assertNotIn('"C"', exp)
+        self.assertEqual(
+            ts.format_extra_files(),
+            {
+                "TestEnum.values.ts": "export const TestEnumValues: readonly (string | number)[] = [\n"
+                '  "a",\n'
+                "  2,\n"
+                '  "C",\n'
+                "]\n"
+            },
+        )
+
+        ts = Typescript([], [], options={"enum_table_threshold": 3})
+        self.assertEqual(ts.format_enum(TestEnum, EnumInfo()), TEST_ENUM_TS)
+
+    def test_enum_table_files(self):
+        namespace = "ts_enum_table_test"
+        export_enum(namespace=namespace, enum_table_threshold=2)(TestEnumAuto)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            export_to = Path(tmp_dir) / "api.ts"
+            export_mappings(export_to, "typescript", namespace=namespace)
+
+            with open(export_to) as f:
+                self.assertIn('import("./TestEnumAuto.values")', f.read())
+
+            with open(Path(tmp_dir) / "TestEnumAuto.values.ts") as f:
+                self.assertEqual(
+                    f.read(),
+                    "export const TestEnumAutoValues: readonly number[] = [\n"
+                    "  1,\n"
+                    "  2,\n"
+                    "  3,\n"
+                    "]\n",
+                )
+
+    def test_type_guards(self):
+        nested = ParsedSchema(name="Nested", fields=[])
+        ts = Typescript(
+            [nested, test_schema],
+            [(TestEnum, EnumInfo())],
+            options={"ts_validators": "guard"},
+        )
+        exp = ts.export(True, False)
+
+        self.assertIn(
+            "export function isTestEnum(value: unknown): value is TestEnum {\n"
+            '  if (value !== "a" && value !== 2 && value !== "C") return false\n'
+            "  return true\n"
+            "}\n",
+            exp,
+        )
+        self.assertIn("export function isTest(value: unknown): value is Test {\n", exp)
+        self.assertIn('  if (typeof v.required !== "number") return false\n', exp)
+        self.assertIn(
+            "  if (v.allow_none !== undefined && v.allow_none !== null) {\n"
+            '    if (typeof v.allow_none !== "number") return false\n'
+            "  }\n",
+            exp,
+        )
+        self.assertIn(
+            "  if (v.nested_many !== undefined) {\n"
+            "    if (!Array.isArray(v.nested_many)) return false\n"
+            "    const items = v.nested_many as unknown[]\n"
+            "    for (let i = 0; i < items.length; i++) {\n"
+            "      if (!isNested(items[i])) return false\n"
+            "    }\n"
+            "  }\n",
+            exp,
+        )
+        self.assertIn("    if (!isTestEnum(v.enum_field)) return false\n", exp)
+        # Excluded variants are not validated
+        self.assertNotIn("v.load_only", exp)
+
+    def test_validators_drf_choices(self):
+        # DRF sends and accepts the keys of choices, not their labels
+        perms, _ = _create_enum_from_choices(
+            "perms", serializers.ChoiceField([("read", "Read"), ("write", "Write")])
+        )
+        exp = Typescript(
+            [], [(perms, EnumInfo())], options={"ts_validators": "decoder"}
+        ).export(True, True)
+
+        self.assertIn(
+            'export enum Perms {\n  read = "read",\n  write = "write",\n}\n', exp
+        )
+        self.assertIn(
+            '  if (value !== "read" && value !== "write") '
+            "throw new TypeError(`${path}: expected Perms`)\n",
+            exp,
+        )
+
+    def test_decoders(self):
+        alias = ParsedSchema(name="Alias", fields=[], alias_of="Test")
+        ts = Typescript([test_schema, alias], [], options={"ts_validators": "decoder"})
+        exp = ts.export(True, True)
+
+        self.assertIn(
+            'export function decodeTest(value: unknown, path: string = "Test"): Test {\n'
+            '  if (typeof value !== "object" || value === null) '
+            "throw new TypeError(`${path}: expected object`)\n",
+            exp,
+        )
+        self.assertIn(
+            "      decodeNested(items[i], `${path}.nested_many[${i}]`)\n", exp
+        )
+        self.assertIn("  return value as Test\n}\n", exp)
+        self.assertIn("export const decodeAlias = decodeTest\n", exp)
+
+        with self.assertRaises(ValueError):
+            Typescript([], [], options={"ts_validators": "schema"})
+
+    def test_validators_loose_datatypes(self):
+        schema = ParsedSchema(
+            name="Loose",
+            fields=[
+                ParsedField(
+                    python_datatype=PythonDatatypes.DECIMAL,
+                    export_name=None,
+                    field_name="price",
+                    required=True,
+                ),
+                ParsedField(
+                    python_datatype=PythonDatatypes.JSON_FIELD,
+                    export_name=None,
+                    field_name="extra",
+                    required=True,
+                ),
+            ],
+        )
+        exp = Typescript([schema], [], options={"ts_validators": "decoder"}).export(
+            True, True
+        )
+
+        # DRF sends decimals as strings by default
+        self.assertIn(
+            '  if (typeof v.price !== "number" && typeof v.price !== "string") '
+            "throw new TypeError(`${path}.price: expected number or string`)\n",
+            exp,
+        )
+        # JSON fields may hold any JSON value
+        self.assertNotIn("v.extra", exp)
+
+    def test_mapping_profiles(self):
+        fields = [
+            ParsedField(
+                python_datatype=PythonDatatypes.DATETIME,
+                export_name=None,
+                field_name="created",
+                required=True,
+            )
+        ]
+        compact = ParsedSchema(
+            name="Compact", fields=fields, kwargs={"type_mapping_profile": "compact"}
+        )
+        default = ParsedSchema(name="Default", fields=fields)
+        exp = Typescript(
+            [compact, default], [], options={"ts_validators": "guard"}
+        ).export(True, True)
+
+        self.assertIn("export interface Compact {\n  created: number\n}\n", exp)
+        self.assertIn("export interface Default {\n  created: string\n}\n", exp)
+        self.assertIn('  if (typeof v.created !== "number") return false\n', exp)
+
+    def test_typed_dicts(self):
+        fields = [
+            ParsedField(
+                python_datatype=PythonDatatypes.DICT,
+                export_name=None,
+                field_name="by_status",
+                required=True,
+                key_field=ParsedField(
+                    python_datatype=None, export_name="TestEnum", field_name="by_status"
+                ),
+                value_field=ParsedField(
+                    python_datatype=None,
+                    export_name="Nested",
+                    field_name="by_status",
+                    many=True,
+                ),
+            ),
+            ParsedField(
+                python_datatype=PythonDatatypes.DICT,
+                export_name=None,
+                field_name="counts",
+                value_field=ParsedField(
+                    python_datatype=PythonDatatypes.INT,
+                    export_name=None,
+                    field_name="counts",
+                    allow_none=True,
+                ),
+            ),
+        ]
+        schema = ParsedSchema(name="Typed", fields=fields)
+        nested = ParsedSchema(name="Nested", fields=[])
+        exp = Typescript(
+            [nested, schema],
+            [(TestEnum, EnumInfo())],
+            options={"ts_validators": "decoder"},
+        ).export(True, True)
+
+        self.assertIn(
+            "export interface Typed {\n"
+            "  by_status: Partial<Record<TestEnum, Nested[]>>\n"
+            "  counts?: Record<string, number | null>\n"
+            "}\n",
+            exp,
+        )
+        self.assertIn(
+            "    for (const [key0, entry0] of Object.entries(v.counts as Record<string, unknown>)) {\n"
+            "      if (entry0 !== null) {\n"
+            '        if (typeof entry0 !== "number") throw new TypeError(`${path}.counts.${key0}: expected number`)\n',
+            exp,
+        )